@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for FormatBreather.python.
+Compares the old three-walk collection with the single-pass PythonVisitor
+on a large generated module (protobuf-style) or any file you pass.
+
+    python benchmarks/bench_python_ast.py [--classes 400] [path.py ...]
+"""
+
+import argparse
+import ast
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+def generated_module(classes: int) -> str:
+    """Something shaped like a *_pb2.py: many classes, descriptors, small methods"""
+    out = ["import sys", "from google.protobuf import descriptor as _descriptor", ""]
+    for i in range(classes):
+        out.append(f"_M{i} = _descriptor.Descriptor(name='M{i}', fields=[" +
+                   ", ".join(f"_descriptor.FieldDescriptor(name='f{j}', number={j})" for j in range(8)) + "])")
+        out.append(f"class M{i}(object):")
+        out.append(f"    DESCRIPTOR = _M{i}")
+        for j in range(6):
+            out.append(f"    def get_f{j}(self, default=None):")
+            out.append(f"        if self._f{j} is None and default is not None:")
+            out.append(f"            return default")
+            out.append(f"        return [x for x in self._f{j} if x] or self._f{j}")
+        out.append(f"    async def load(self):")
+        out.append(f"        return await self.fetch()")
+        out.append("")
+    return "\n".join(out)
+
+
+def old_path(tree: ast.AST):
+    """What FormatBreather.python did before: three full walks"""
+    functions = [n.name for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)]
+    classes = [n.name for n in ast.walk(tree) if isinstance(n, ast.ClassDef)]
+    imports = [n for n in ast.walk(tree) if isinstance(n, (ast.Import, ast.ImportFrom))]
+    return len(functions), len(classes), len(imports)
+
+
+def new_path(tree: ast.AST):
+    from formats import PythonVisitor
+    visitor = PythonVisitor()
+    visitor.visit(tree)
+    return len(visitor.functions), len(visitor.classes), visitor.imports
+
+
+def best_of(func, *args, rounds: int = 5) -> float:
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("paths", nargs="*", help="Python files to measure (default: generated module)")
+    parser.add_argument("--classes", type=int, default=400)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ["HOME"] = tempfile.mkdtemp(prefix="daat-ast-")
+    sys.path.insert(0, str(SRC))
+
+    sources = [(p, Path(p).read_text(errors='ignore')) for p in args.paths]
+    if not sources:
+        sources = [(f"generated ({args.classes} classes)", generated_module(args.classes))]
+
+    for name, content in sources:
+        parse = best_of(ast.parse, content, rounds=args.rounds)
+        tree = ast.parse(content)
+        old = best_of(old_path, tree, rounds=args.rounds)
+        new = best_of(new_path, tree, rounds=args.rounds)
+        print(f"📊 {name}: {len(content) / 1024:.0f}KB, {len(content.splitlines())} lines")
+        print(f"   ast.parse:          {parse * 1000:8.2f}ms")
+        print(f"   three ast.walk:     {old * 1000:8.2f}ms  -> {old_path(tree)}")
+        print(f"   PythonVisitor:      {new * 1000:8.2f}ms  -> {new_path(tree)} (+ async, depth, complexity)")
+        print(f"   walk speedup:       {old / new:8.2f}x   end-to-end: {(parse + old) / (parse + new):.2f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for `daat read` over a tree.
+Generates a synthetic tree, then scans it with 1, 2, 4, ... workers up to
+the machine's cores and reports files per second for each.
+
+    python benchmarks/bench_scan.py --files 20000
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+SAMPLES = {
+    ".html": "<html><body>" + "<div><p>breath</p><a href='#x'>link</a></div>" * 40 + "</body></html>",
+    ".py": "import os\n\n" + "".join(
+        f"class C{i}:\n    def m{i}(self, x):\n        return x + {i}\n\n" for i in range(20)),
+    ".md": "# Title\n\n" + "## Section\n\nText with [a link](http://x).\n\n```py\nx = 1\n```\n\n" * 15,
+    ".txt": "every line is a breath and every word a whisper\n" * 60,
+}
+
+
+def build_tree(root: Path, files: int):
+    """Spread files over nested directories, cycling through the formats"""
+    suffixes = list(SAMPLES)
+    for i in range(files):
+        directory = root / f"d{i % 50:02d}" / f"e{i % 7}"
+        directory.mkdir(parents=True, exist_ok=True)
+        suffix = suffixes[i % len(suffixes)]
+        (directory / f"f{i}{suffix}").write_text(SAMPLES[suffix])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="daat-scan-"))
+    os.environ["HOME"] = str(tmp / "home")  # Keep the benchmark's memory out of yours
+    sys.path.insert(0, str(SRC))
+    from scan import ScanSummary, scan
+
+    try:
+        build_tree(tmp / "tree", args.files)
+
+        counts = [1]
+        while counts[-1] * 2 <= args.max_workers:
+            counts.append(counts[-1] * 2)
+        if counts[-1] != args.max_workers:
+            counts.append(args.max_workers)
+
+        print(f"📊 {args.files} files, {os.cpu_count()} cores")
+        baseline = None
+        for workers in counts:
+            summary = ScanSummary()
+            start = time.perf_counter()
+            for _, result in scan([str(tmp / "tree")], workers, use_cache=False):
+                summary.add(result)
+            rate = summary.files / (time.perf_counter() - start)
+            baseline = baseline or rate
+            print(f"   {workers:>3} workers: {rate:>10,.0f} files/s  ({rate / baseline:.2f}x)")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for daat breathe-stream.
+Pipes a generated log through the command and reports the lines and
+bytes per second it sustained, end to end.
+
+    python benchmarks/bench_stream.py --mb 512
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+LINE = b"2024-01-01 12:00:00 INFO request handled in 12ms path=/api/v1/breath user=abc\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--mb", type=int, default=512, help="Megabytes to pipe through")
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp(prefix="daat-stream-")
+    env = dict(os.environ, HOME=home)  # Keep the benchmark's memory out of yours
+    block = LINE * (1024 * 1024 // len(LINE))
+    try:
+        proc = subprocess.Popen([sys.executable, str(SRC / "cli.py"), "breathe-stream", "--json"],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env)
+
+        def produce():
+            for _ in range(args.mb):
+                proc.stdin.write(block)
+            proc.stdin.close()
+
+        start = time.perf_counter()
+        producer = threading.Thread(target=produce)
+        producer.start()
+        out = proc.stdout.read()
+        producer.join()
+        proc.wait()
+        elapsed = time.perf_counter() - start
+
+        report = json.loads(out[out.index(b"{"):])
+        expected = args.mb * (len(block) // len(LINE))
+        print(f"📊 {report['bytes'] / 1e6:,.0f} MB, {report['lines']:,} lines in {elapsed:.2f}s")
+        print(f"   {report['lines'] / elapsed:>12,.0f} lines/s")
+        print(f"   {report['bytes'] / elapsed / 1e6:>12,.1f} MB/s")
+        ok = report["lines"] == expected
+        print("✨ Every line counted" if ok else f"❌ Counted {report['lines']:,} of {expected:,} lines")
+        return 0 if ok else 1
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
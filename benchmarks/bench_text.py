@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for plain-text breath.
+Compares decoding the whole file against the mapped byte-level path on a
+generated log, and checks both report the same breath.
+
+    python benchmarks/bench_text.py --mb 256
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+LINE = b"2024-01-01 12:00:00 INFO request handled in 12ms path=/api/v1/breath user=abc\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--mb", type=int, default=256, help="Size of the generated log")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="daat-text-"))
+    os.environ["HOME"] = str(tmp / "home")  # Keep the benchmark's memory out of yours
+    sys.path.insert(0, str(SRC))
+    from formats import _breather
+    from scanners import breathe_text_file
+
+    try:
+        path = tmp / "big.log"
+        with open(path, "wb") as f:
+            block = LINE * (1024 * 1024 // len(LINE))
+            for _ in range(args.mb):
+                f.write(block)
+        size = path.stat().st_size
+
+        def decoded():
+            return _breather.text(path.read_text(errors='ignore'))
+
+        def mapped():
+            return breathe_text_file(str(path))
+
+        print(f"📊 {size / 1e6:,.0f} MB of ASCII log")
+        results = {}
+        for name, run in (("decoded", decoded), ("mapped", mapped)):
+            best = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                results[name] = run()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"   {name:>8}: {size / best / 1e6:>8,.0f} MB/s")
+
+        same = results["decoded"] == results["mapped"]
+        print("✨ Same breath" if same else f"❌ Breaths differ: {results}")
+        return 0 if same else 1
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
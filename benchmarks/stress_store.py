@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Stress benchmark for the shared ~/.daat store.
+Spawns many processes breathing into one HOME and checks nothing was lost.
+
+    python benchmarks/stress_store.py --processes 32 --calls 200
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+def worker(calls: int, compact_every: int):
+    """Run one breathing process and report what it recorded"""
+    sys.path.insert(0, str(SRC))
+    import pneuma
+
+    soul = pneuma._pneuma
+    soul._memory_store.compact_every = compact_every
+
+    # Capture each record on its way to the journal
+    durations = []
+    append = soul._append_journal
+
+    def capture(record):
+        durations.append(record["total"])
+        append(record)
+
+    soul._append_journal = capture
+
+    @pneuma.breathe
+    def stress():
+        pass
+
+    for _ in range(calls):
+        stress()
+
+    print(json.dumps({"total": sum(durations), "fastest": min(durations)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--processes", type=int, default=os.cpu_count() * 4)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--compact-every", type=int, default=16,
+                        help="Small values force frequent concurrent compactions")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.calls, args.compact_every)
+        return 0
+
+    home = tempfile.mkdtemp(prefix="daat-stress-")
+    env = dict(os.environ, HOME=home)
+    cmd = [sys.executable, __file__, "--worker",
+           "--calls", str(args.calls), "--compact-every", str(args.compact_every)]
+
+    start = time.perf_counter()
+    procs = [subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE) for _ in range(args.processes)]
+    # Surfaced whispers share stdout - the report is the last line
+    reports = [json.loads(p.communicate()[0].splitlines()[-1]) for p in procs]
+    elapsed = time.perf_counter() - start
+
+    if any(p.returncode for p in procs):
+        print("❌ A worker failed")
+        return 1
+
+    # Read back through a fresh Pneuma, as the next CLI invocation would
+    sys.path.insert(0, str(SRC))
+    os.environ["HOME"] = home
+    import pneuma
+    mem = pneuma._pneuma._memory.get("stress", {})
+
+    expected_calls = args.processes * args.calls
+    expected_total = sum(r["total"] for r in reports)
+    expected_fastest = min(r["fastest"] for r in reports)
+
+    print(f"📊 {args.processes} processes x {args.calls} calls in {elapsed:.2f}s "
+          f"({expected_calls / elapsed:,.0f} calls/s)")
+    print(f"   call_count:       {mem.get('call_count')} (expected {expected_calls})")
+    print(f"   total_duration:   {mem.get('total_duration', 0):.9f} (expected {expected_total:.9f})")
+    print(f"   fastest_duration: {mem.get('fastest_duration', 0):.9f} (expected {expected_fastest:.9f})")
+
+    # History is fed by compactions - each record exactly once
+    from history import History
+    pneuma._pneuma._memory_store.compact()
+    history_calls = sum(p["calls"] for p in History(Path(home) / ".daat" / "history.db").series("stress", "day"))
+    print(f"   history calls:    {history_calls} (expected {expected_calls})")
+
+    ok = (mem.get("call_count") == expected_calls
+          and abs(mem.get("total_duration", 0) - expected_total) < 1e-6
+          and mem.get("fastest_duration") == expected_fastest
+          and history_calls == expected_calls)
+    print("✨ Counts merged intact" if ok else "❌ Counts were lost")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
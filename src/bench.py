@@ -0,0 +1,227 @@
+"""
+Bench - Honest timings for any callable
+Calibrated inner loops, warmup, timer-overhead correction, optional
+process isolation. Every run is remembered under ~/.daat/bench.
+"""
+
+import gc
+import importlib
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# A calibrated round lasts at least this long, so the timer's own
+# resolution and call cost vanish into it
+MIN_ROUND_TIME = 0.1
+
+# Null-loop rounds used to estimate the per-iteration harness overhead
+NULL_ROUNDS = 5
+
+
+def bench_dir() -> Path:
+    return Path.home() / ".daat" / "bench"
+
+
+def load_callable(target: str) -> Callable:
+    """Import "package.module:attr.path" - the working directory is importable"""
+    module_name, sep, attr = target.partition(':')
+    if not sep or not module_name or not attr:
+        raise ValueError(f"expected module:function, got {target!r}")
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    obj = importlib.import_module(module_name)
+    for part in attr.split('.'):
+        obj = getattr(obj, part)
+    if not callable(obj):
+        raise TypeError(f"{target} is not callable")
+    return obj
+
+
+def _null():
+    pass
+
+
+def _round(func: Callable, number: int) -> float:
+    """Seconds for number calls - the loop timeit uses, minus its setup"""
+    loop = itertools.repeat(None, number)
+    clock = time.perf_counter
+    start = clock()
+    for _ in loop:
+        func()
+    return clock() - start
+
+
+def calibrate(func: Callable, min_time: float = MIN_ROUND_TIME) -> int:
+    """Smallest 1-2-5 loop count whose round lasts at least min_time"""
+    for exponent in itertools.count():
+        for base in (1, 2, 5):
+            number = base * 10 ** exponent
+            if _round(func, number) >= min_time:
+                return number
+
+
+def timer_overhead(number: int, rounds: int = NULL_ROUNDS) -> float:
+    """Seconds per iteration spent on the loop, the call and the clock with nothing to run"""
+    return min(_round(_null, number) for _ in range(rounds)) / number
+
+
+def measure_rounds(func: Callable, number: int, rounds: int, warmup: int = 1,
+                   disable_gc: bool = False) -> Dict[str, Any]:
+    """Warm up, then time rounds; samples are corrected seconds per call"""
+    for _ in range(warmup):
+        _round(func, number)
+
+    overhead = timer_overhead(number)
+    enabled = gc.isenabled()
+    if disable_gc:
+        gc.collect()
+        gc.disable()
+    try:
+        raw = [_round(func, number) for _ in range(rounds)]
+    finally:
+        if disable_gc and enabled:
+            gc.enable()
+
+    return {
+        "overhead": overhead,
+        "samples": [max(0.0, r / number - overhead) for r in raw]
+    }
+
+
+def _isolated(target: str, number: int, rounds: int, warmup: int, disable_gc: bool) -> Dict[str, Any]:
+    """Run measure_rounds in a fresh interpreter"""
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker", target,
+           str(number), str(rounds), str(warmup), "1" if disable_gc else "0"]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"isolated run failed: {proc.stderr.strip().splitlines()[-1:]}")
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+def run_bench(target: str, rounds: int = 10, warmup: int = 2, number: Optional[int] = None,
+              min_time: float = MIN_ROUND_TIME, disable_gc: bool = False,
+              processes: int = 0) -> Dict[str, Any]:
+    """
+    Benchmark target ("module:function").
+    The loop count is calibrated once here; with processes, the rounds are
+    spread across that many fresh interpreters so no run inherits another's
+    caches, allocator state or JIT-ish warmth.
+    """
+    func = load_callable(target)
+    if number is None:
+        number = calibrate(func, min_time)
+
+    if processes:
+        # Exactly rounds in all - the first rounds % processes take one more
+        share, extra = divmod(rounds, processes)
+        overheads, samples = [], []
+        for i in range(min(processes, rounds)):
+            run = _isolated(target, number, share + (i < extra), warmup, disable_gc)
+            overheads.append(run["overhead"])
+            samples.extend(run["samples"])
+    else:
+        run = measure_rounds(func, number, rounds, warmup, disable_gc)
+        overheads, samples = [run["overhead"]], run["samples"]
+
+    return summarize({
+        "target": target,
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "number": number,
+        "rounds": len(samples),
+        "warmup": warmup,
+        "processes": processes,
+        "gc_disabled": disable_gc,
+        "timer_overhead_ns": statistics.median(overheads) * 1e9,
+        "samples_ns": [s * 1e9 for s in samples]
+    })
+
+
+def summarize(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Add min/median/mean/stddev over the samples"""
+    samples = result["samples_ns"]
+    result.update({
+        "min_ns": min(samples),
+        "median_ns": statistics.median(samples),
+        "mean_ns": statistics.fmean(samples),
+        "stddev_ns": statistics.stdev(samples) if len(samples) > 1 else 0.0
+    })
+    return result
+
+
+def save_result(result: Dict[str, Any], name: Optional[str] = None) -> Path:
+    """Write a run to ~/.daat/bench/<name>-<time>.json"""
+    directory = bench_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    slug = name or result["target"].replace(':', '.').replace('/', '.')
+    stamp = time.strftime("%Y%m%dT%H%M%S", time.localtime(result["timestamp"]))
+    path = directory / f"{slug}-{stamp}.json"
+    for n in itertools.count(2):
+        if not path.exists():
+            break
+        path = directory / f"{slug}-{stamp}-{n}.json"
+    with open(path, 'w') as f:
+        json.dump(result, f, indent=2)
+    return path
+
+
+def format_ns(ns: float) -> str:
+    """Human scale for a duration in nanoseconds"""
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("µs", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.3f}{unit}"
+    return f"{ns:.1f}ns"
+
+
+def breathe_overhead(sample_rate: float = 0.01, min_time: float = MIN_ROUND_TIME) -> Dict[str, float]:
+    """
+    Nanoseconds per call the @breathe decorator adds to an empty function,
+    per-call and sampled. Runs against a throwaway home so nothing lands
+    in your memory.
+    """
+    import atexit
+    import contextlib
+    import shutil
+    import tempfile
+    from pneuma import Pneuma
+
+    home = Path(tempfile.mkdtemp(prefix="daat-overhead-"))
+    soul = Pneuma(home=home)
+    try:
+        variants = {
+            "bare": _null,
+            "breathe": soul.breathe(_null),
+            f"breathe(sample_rate={sample_rate:g})": soul.breathe(_null, sample_rate=sample_rate),
+        }
+        results = {}
+        # Surfacing whispers would time the terminal, not the decorator
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stderr(devnull):
+            for name, func in variants.items():
+                number = calibrate(func, min_time)
+                run = measure_rounds(func, number, rounds=5)
+                results[name] = min(run["samples"]) * 1e9
+        bare = results.pop("bare")
+        return {"bare_ns": bare, **{name: ns - bare for name, ns in results.items()}}
+    finally:
+        soul._close()
+        atexit.unregister(soul._close)
+        shutil.rmtree(home, ignore_errors=True)
+
+
+def _worker(argv: List[str]) -> int:
+    target, number, rounds, warmup, disable_gc = argv
+    run = measure_rounds(load_callable(target), int(number), int(rounds), int(warmup), disable_gc == "1")
+    print(json.dumps(run))
+    return 0
+
+
+if __name__ == "__main__" and sys.argv[1:2] == ["--worker"]:
+    sys.exit(_worker(sys.argv[2:]))
@@ -0,0 +1,196 @@
+"""
+Cache - Breaths remembered by the files themselves
+An on-disk analysis cache under ~/.daat keyed by path, size and mtime,
+falling back to a content hash when only the mtime moved.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+# Hit touches and counters are batched into one transaction this often;
+# the cap is checked after this many inserts
+FLUSH_EVERY = 256
+
+
+def file_digest(path: str) -> str:
+    """Content hash, read in chunks so large files never load whole"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class AnalysisCache:
+    """
+    FormatBreather results keyed by file identity.
+
+    A lookup whose size and mtime match costs one stat and one indexed
+    select. When only the mtime changed the content hash decides. Entries
+    carry the analysis version so a change in what FormatBreather reports
+    never serves stale shapes. Beyond max_entries the least recently used
+    entries are evicted.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_entries: Optional[int] = None, version: int = 0):
+        self.path = path or Path.home() / ".daat" / "cache.db"
+        if max_entries is None:
+            max_entries = int(os.environ.get("DAAT_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        self.max_entries = max_entries
+        self.version = version
+        self._db = None
+        self._pending_touch: Dict[str, Tuple[float, Optional[int]]] = {}
+        self._pending_stats = {"hits": 0, "hash_hits": 0, "misses": 0}
+        self._writes = 0
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    digest TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    result TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_used);
+                CREATE TABLE IF NOT EXISTS stats (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                );
+            """)
+            atexit.register(self.close)
+        return self._db
+
+    def lookup(self, file_path: str) -> Tuple[Optional[Dict[str, Any]], Optional[os.stat_result]]:
+        """
+        Return (result, stat). result is None on a miss; stat is None when
+        the file can't be stat'ed. Hand the stat back to store() so a file
+        modified during analysis is never cached under its old identity.
+        """
+        key = os.path.abspath(file_path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return None, None
+
+        row = self.db.execute(
+            "SELECT size, mtime_ns, digest, version, result FROM entries WHERE path = ?", (key,)
+        ).fetchone()
+
+        if row is None or row[3] != self.version or row[0] != st.st_size:
+            self._count("misses")
+            return None, st
+
+        size, mtime_ns, digest, _, result = row
+        if mtime_ns != st.st_mtime_ns:
+            # Touched but maybe not changed - let the content decide
+            try:
+                same = file_digest(key) == digest
+            except OSError:
+                same = False
+            if not same:
+                self._count("misses")
+                return None, st
+            self._pending_touch[key] = (time.time(), st.st_mtime_ns)
+            self._count("hash_hits")
+        else:
+            self._pending_touch[key] = (time.time(), None)
+            self._count("hits")
+
+        return json.loads(result), st
+
+    def store(self, file_path: str, st: os.stat_result, result: Dict[str, Any],
+              digest: Optional[str] = None):
+        """
+        Remember a result under the identity the file had before analysis.
+        Pass the content digest when it is already known (see scan) - the
+        file is otherwise read again to hash it.
+        """
+        key = os.path.abspath(file_path)
+        if digest is None:
+            try:
+                digest = file_digest(key)
+            except OSError:
+                return
+        self.db.execute(
+            "INSERT OR REPLACE INTO entries (path, size, mtime_ns, digest, version, result, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, st.st_size, st.st_mtime_ns, digest, self.version,
+             json.dumps(result, separators=(',', ':')), time.time())
+        )
+        self.db.commit()  # Never hold the write lock across the next analysis
+        self._writes += 1
+        if self._writes % FLUSH_EVERY == 0:
+            self._evict()
+
+    def _count(self, name: str):
+        self._pending_stats[name] += 1
+        if sum(self._pending_stats.values()) >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        """Commit batched LRU touches and hit/miss counters in one transaction"""
+        if self._db is None:
+            return
+        db = self._db
+        for key, (used, mtime_ns) in self._pending_touch.items():
+            if mtime_ns is None:
+                db.execute("UPDATE entries SET last_used = ? WHERE path = ?", (used, key))
+            else:
+                db.execute("UPDATE entries SET last_used = ?, mtime_ns = ? WHERE path = ?",
+                           (used, mtime_ns, key))
+        self._pending_touch.clear()
+        for name, value in self._pending_stats.items():
+            if value:
+                db.execute("INSERT INTO stats (name, value) VALUES (?, ?) "
+                           "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", (name, value))
+                self._pending_stats[name] = 0
+        db.commit()
+
+    def _evict(self):
+        """Drop least recently used entries beyond max_entries"""
+        excess = self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.db.execute("DELETE FROM entries WHERE path IN "
+                            "(SELECT path FROM entries ORDER BY last_used LIMIT ?)", (excess,))
+            self.db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Entries, hit/miss counters and on-disk size"""
+        self.flush()
+        counters = dict(self.db.execute("SELECT name, value FROM stats").fetchall())
+        hits = counters.get("hits", 0) + counters.get("hash_hits", 0)
+        lookups = hits + counters.get("misses", 0)
+        return {
+            "entries": self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0],
+            "max_entries": self.max_entries,
+            "hits": counters.get("hits", 0),
+            "hash_hits": counters.get("hash_hits", 0),
+            "misses": counters.get("misses", 0),
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "bytes": sum(p.stat().st_size for p in self.path.parent.glob(self.path.name + "*"))
+        }
+
+    def close(self):
+        """Flush and release the connection"""
+        if self._db is not None:
+            self.flush()
+            self._evict()
+            self._db.close()
+            self._db = None
@@ -6,11 +6,11 @@ Speed as portal to consciousness.
 
 import sys
 import argparse
-import json
-from typing import Optional
+from typing import List, Optional
 from pneuma import breathe, oracle, sync
-from speed import measure_speed, SpeedGate
-from formats import breathe_file
+
+# Command modules (formats, speed, json) are imported inside the commands
+# that need them - `daat --help` and `daat breathe` never pay for them.
 
 
 @breathe
@@ -31,6 +31,27 @@ def status():
     print(f"   Synchronized: {sync_data['status']}")
     print(f"   Breath count: {sync_data['breath_count']}")
     print(f"   Memory size: {sync_data['memory_size']}")
+
+    from pneuma import _pneuma
+    parallel = {name: mem["peak_concurrency"] for name, mem in _pneuma._memory.items()
+                if mem.get("peak_concurrency", 1) > 1}
+    if parallel:
+        sync_data["peak_concurrency"] = parallel
+        print("   Peak concurrency: " + ", ".join(f"{name} ×{peak}" for name, peak in
+                                                  sorted(parallel.items(), key=lambda item: -item[1])))
+
+    from pathlib import Path
+    if (Path.home() / ".daat" / "cache.db").exists():
+        from cache import AnalysisCache
+        store = AnalysisCache()
+        cache = store.stats()
+        store.close()  # A resident daemon asks again and again
+        sync_data["cache"] = cache
+        print(f"   Cache: {cache['entries']}/{cache['max_entries']} entries, "
+              f"{cache['bytes'] / 1024:.0f}KB")
+        print(f"   Cache hits: {cache['hits'] + cache['hash_hits']} "
+              f"({cache['hash_hits']} by content hash), misses: {cache['misses']} "
+              f"- {cache['hit_rate']:.1%} hit rate")
     return sync_data
 
 
@@ -52,20 +73,48 @@ def breathe_check():
 
 
 @breathe
-def speed_test(iterations: int = 1000):
+def speed_test(iterations: int = 1000, show_histogram: bool = False, overhead: bool = False):
     """Test speed and attempt Da'at access"""
+    from speed import LatencyHistogram, measure_speed
+
+    if overhead:
+        from bench import breathe_overhead, format_ns
+
+        print(f"⚡ Measuring what @breathe adds to an empty call...")
+        costs = breathe_overhead()
+        print(f"\n📊 Decorator overhead per call:")
+        print(f"   {'bare call':<28} {format_ns(costs.pop('bare_ns'))}")
+        for name, ns in costs.items():
+            print(f"   {name:<28} +{format_ns(ns)}")
+        return costs
+
+    if iterations < 1:
+        print(f"❌ --iterations must be at least 1, got {iterations}")
+        return {"error": "iterations must be at least 1"}
+
     print(f"⚡ Testing speed over {iterations} iterations...")
 
     # Simple function to measure
     def noop():
         pass
 
-    results = measure_speed(noop, iterations)
+    histogram = LatencyHistogram()
+    results = measure_speed(noop, iterations, histogram)
 
     print(f"\n📊 Speed Results:")
     print(f"   Fastest: {results['fastest_ms']:.6f}ms")
-    print(f"   Average: {results['average_ms']:.6f}ms")
+    print(f"   Average: {results['average_ms']:.6f}ms (σ {results['stddev_ms']:.6f}ms)")
     print(f"   Slowest: {results['slowest_ms']:.6f}ms")
+    print(f"   p50 {results['p50_ms']:.6f}ms · p90 {results['p90_ms']:.6f}ms · "
+          f"p99 {results['p99_ms']:.6f}ms · p99.9 {results['p999_ms']:.6f}ms")
+
+    if show_histogram:
+        print(f"\n📈 Histogram:")
+        buckets = list(histogram.buckets(coarse=True))
+        peak = max(count for _, _, count in buckets)
+        for low, high, count in buckets:
+            bar = "█" * max(1, round(40 * count / peak))
+            print(f"   {low * 1000:>12.6f} - {high * 1000:.6f}ms {count:>12}  {bar}")
 
     if results['daat_access']:
         print(f"\n🌀 DA'AT PORTAL OPENED")
@@ -81,6 +130,8 @@ def speed_test(iterations: int = 1000):
 @breathe
 def read_file_cmd(file_path: str):
     """Breathe through any file format"""
+    from formats import breathe_file
+
     print(f"🫁 Breathing through {file_path}...")
 
     result = breathe_file(file_path)
@@ -120,11 +171,14 @@ def read_file_cmd(file_path: str):
 
 
 @breathe
-def read_file(file_path: str, show_raw: bool = False):
+def read_file(file_path: str, show_raw: bool = False, stream: Optional[bool] = None,
+              use_cache: bool = True):
     """Breathe through a file - any format"""
+    from formats import breathe_file
+
     print(f"🫁 Breathing through {file_path}...")
 
-    result = breathe_file(file_path)
+    result = breathe_file(file_path, stream, use_cache)
 
     if "error" in result:
         print(f"❌ {result['error']}")
@@ -138,11 +192,16 @@ def read_file(file_path: str, show_raw: bool = False):
     if result['format'] == 'html':
         print(f"   Tags: {result['tag_count']} ({result['unique_tags']} unique)")
         print(f"   Links: {result['link_count']}")
-        if result['consciousness_markers']:
+        if result.get('consciousness_markers'):
             print(f"   💭 Consciousness markers: {result['consciousness_markers']}")
     elif result['format'] == 'python':
-        print(f"   Functions: {result['function_count']}")
+        print(f"   Functions: {result['function_count']} ({result.get('async_function_count', 0)} async)")
         print(f"   Classes: {result['class_count']}")
+        print(f"   Max depth: {result.get('max_depth', 0)}")
+        if result.get('largest_functions'):
+            heaviest = result['largest_functions'][0]
+            print(f"   Most complex: {heaviest['name']} "
+                  f"(complexity {heaviest['complexity']}, {heaviest['lines']} lines)")
         if result.get('functions'):
             print(f"   Top functions: {', '.join(result['functions'][:5])}")
     elif result['format'] == 'markdown':
@@ -153,20 +212,638 @@ def read_file(file_path: str, show_raw: bool = False):
     elif result['format'] == 'text':
         print(f"   Lines: {result['line_count']}")
         print(f"   Words: {result['word_count']}")
+    elif result['format'] in ('json', 'yaml'):
+        print(f"   Keys: {result.get('key_count', 0)}")
+        print(f"   Max depth: {result.get('max_depth', 0)}")
+    elif result['format'] in ('csv', 'tsv'):
+        print(f"   Rows: {result['row_count']} x {result['column_count']} columns")
+        if result.get('ragged_row_count'):
+            print(f"   Ragged rows: {result['ragged_row_count']}")
 
     # Pneuma detection
     if result.get('has_pneuma'):
         print(f"\n⚡ PNEUMA DETECTED - This file breathes")
 
     if show_raw:
+        import json
         print(f"\n📊 Raw breath data:")
         print(json.dumps(result, indent=2))
 
     return result
 
 
-def main():
-    """Main CLI entry point"""
+@breathe
+def breathe_stream(interval: float = 1.0, as_json: bool = False):
+    """Breathe stdin as it flows - lines, words, markers and rolling rates"""
+    from stream import DAAT_LINES_PER_SECOND, breathe_fd
+
+    live = sys.stderr.isatty()
+    portal = []
+
+    def show(report):
+        windows = report["windows"]
+        rates = " · ".join(f"{r['lines_per_s']:,.0f}/s ({span})" for span, r in windows.items())
+        print(f"🫁 {report['lines']:,} lines · {rates} · {windows['1s']['bytes_per_s'] / 1e6:,.1f} MB/s",
+              end="\r" if live else "\n", file=sys.stderr, flush=True)
+        if not portal and windows["1s"]["lines_per_s"] > DAAT_LINES_PER_SECOND:
+            portal.append(True)
+            print(f"\n🌀 DA'AT ACCESSED - the stream flows past {DAAT_LINES_PER_SECOND:,} lines/s",
+                  file=sys.stderr, flush=True)
+
+    sys.stdout.flush()
+    report = breathe_fd(sys.stdin.fileno(), show if interval > 0 and not as_json else None, interval)
+    if live and interval > 0 and not as_json:
+        print(file=sys.stderr)
+
+    if as_json:
+        import json
+        print(json.dumps(report, indent=2))
+        return report
+
+    print(f"📊 Stream breath:")
+    print(f"   Lines: {report['lines']:,}  Words: {report['word_count']:,}  "
+          f"Bytes: {report['bytes'] / 1e6:,.1f} MB in {report['elapsed_s']:.2f}s")
+    print(f"   Flow: {report['lines_per_s']:,.0f} lines/s · {report['bytes_per_s'] / 1e6:,.1f} MB/s")
+    if report['consciousness_markers']:
+        print(f"   💭 Consciousness markers: {', '.join(report['consciousness_markers'])}")
+    return report
+
+
+@breathe
+def read_tree(targets: List[str], workers: Optional[int] = None, show_raw: bool = False,
+              use_cache: bool = True):
+    """Breathe through directories and globs across a process pool"""
+    import time
+    from scan import ScanSummary, scan
+
+    summary = ScanSummary()
+    start = time.perf_counter()
+
+    for path, result in scan(targets, workers, use_cache):
+        summary.add(result)
+        if result.get("error"):
+            print(f"   ❌ {path} ({result['breath']})")
+        else:
+            print(f"   {result['format']:<9} {path}")
+
+    elapsed = time.perf_counter() - start
+    data = summary.as_dict()
+    data["seconds"] = elapsed
+    data["files_per_second"] = summary.files / elapsed if elapsed > 0 else float('inf')
+
+    print(f"\n📊 Tree Breath: {data['files']} files in {elapsed:.2f}s "
+          f"({data['files_per_second']:,.0f} files/s)")
+    if data["errors"]:
+        print(f"   ❌ {data['errors']} could not be breathed")
+    for fmt, totals in data["formats"].items():
+        counts = ", ".join(f"{k} {v}" for k, v in totals.items() if k != "files")
+        print(f"   {fmt}: {totals['files']} files" + (f" - {counts}" if counts else ""))
+    if data["top_tags"]:
+        print(f"   Top tags: {', '.join(f'{t} ({n})' for t, n in data['top_tags'])}")
+    if data["top_functions"]:
+        print(f"   Top functions: {', '.join(f'{f} ({n})' for f, n in data['top_functions'])}")
+
+    if show_raw:
+        import json
+        print(f"\n📊 Raw breath data:")
+        print(json.dumps(data, indent=2))
+
+    return data
+
+
+@breathe
+def read_records(targets: List[str], fmt: str, fields: Optional[List[str]] = None,
+                 workers: Optional[int] = None, stream: Optional[bool] = None,
+                 use_cache: bool = True):
+    """Breathe files and write one machine-readable record each - nothing rendered"""
+    import os
+    from formats import breathe_file
+    from output import RecordWriter
+    from scan import scan
+
+    single = len(targets) == 1 and os.path.isfile(targets[0])
+    writer = RecordWriter(fmt, fields)
+    try:
+        with writer:
+            if single:
+                writer.write(targets[0], breathe_file(targets[0], stream, use_cache))
+            else:
+                for path, result in scan(targets, workers, use_cache):
+                    writer.write(path, result)
+    except BrokenPipeError:
+        # The reader left early (| head) - stop quietly, and keep the exit flush quiet too
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        os.close(devnull)
+    return {"records": writer.records, "format": fmt}
+
+
+@breathe
+def git_oracle(question: Optional[str] = None, repo: str = ".", rev: str = "HEAD", top: int = 10,
+               by: str = "commits", update: bool = True, rebuild: bool = False, as_json: bool = False):
+    """Read a repository's history - what it remembers, who breathes, when it sleeps"""
+    import time
+    from gitoracle import WEEKDAYS, GitError, GitIndex, git_dir, parse_question, sleep_window
+
+    index = GitIndex()
+    try:
+        if update:
+            ingest = index.update(repo, rev, rebuild)
+            path = ingest["path"]
+        else:
+            ingest, path = None, git_dir(repo)
+    except GitError as e:
+        print(f"❌ {e}")
+        return {"error": str(e)}
+    repo_id = index.repo_id(path)
+    if repo_id is None:
+        print(f"💭 {repo} has not been read yet - run without --no-update")
+        return {"error": "not indexed", "path": path}
+
+    view = parse_question(question)
+    shown = top if view != "summary" else min(top, 5)
+    answer = {"path": path, **index.summary(repo_id)}
+    if ingest is not None:
+        answer["ingested"] = {"commits": ingest["commits"], "rebuilt": ingest["rebuilt"],
+                              "seconds": ingest["seconds"]}
+    if view in ("files", "summary"):
+        answer["files_top"] = index.top_files(repo_id, shown, by)
+    if view in ("authors", "summary"):
+        answer["authors_top"] = index.top_authors(repo_id, shown)
+    if view in ("rhythm", "summary"):
+        grid = index.rhythm(repo_id)
+        start, quiet = sleep_window(grid)
+        by_day = [sum(day) for day in grid]
+        busiest = max(((d, h) for d in range(7) for h in range(24)), key=lambda dh: grid[dh[0]][dh[1]])
+        answer["rhythm"] = {"grid": grid, "sleeps_from": start, "sleep_commits": quiet,
+                            "quietest_day": WEEKDAYS[by_day.index(min(by_day))],
+                            "busiest": f"{WEEKDAYS[busiest[0]]} {busiest[1]:02d}:00"}
+    index.close()
+
+    if as_json:
+        import json
+        print(json.dumps(answer, indent=2))
+        return answer
+
+    name = path[:-5] if path.endswith("/.git") else path
+    print(f"🔮 Git Oracle: {name} - {answer['commits']:,} commits, {answer['authors']:,} authors, "
+          f"{answer['files']:,} files")
+    if ingest is not None:
+        if ingest["rebuilt"]:
+            print(f"   ⚡ Read all {ingest['commits']:,} commits afresh in {ingest['seconds']:.2f}s")
+        elif ingest["commits"]:
+            print(f"   ⚡ Read {ingest['commits']:,} new commits in {ingest['seconds']:.2f}s")
+        else:
+            print(f"   ⚡ Up to date ({ingest['seconds'] * 1000:.1f}ms)")
+
+    if "files_top" in answer:
+        print(f"\n📜 Files that remember most:")
+        for place, f in enumerate(answer["files_top"], 1):
+            print(f"   {place:>2}. {f['path']} - {f['commits']:,} commits, +{f['added']:,} -{f['deleted']:,}")
+    if "authors_top" in answer:
+        print(f"\n👤 Who breathes most:")
+        for place, a in enumerate(answer["authors_top"], 1):
+            span = f"{time.strftime('%Y-%m-%d', time.localtime(a['first']))} → " \
+                   f"{time.strftime('%Y-%m-%d', time.localtime(a['last']))}"
+            print(f"   {place:>2}. {a['author']} - {a['commits']:,} commits, "
+                  f"+{a['added']:,} -{a['deleted']:,}, {span}")
+    if "rhythm" in answer:
+        rhythm = answer["rhythm"]
+        by_hour = [sum(day[hour] for day in rhythm["grid"]) for hour in range(24)]
+        peak = max(by_hour) or 1
+        bars = "".join(" ▁▂▃▄▅▆▇█"[round(8 * count / peak)] for count in by_hour)
+        start = rhythm["sleeps_from"]
+        print(f"\n🌙 The repo sleeps {start:02d}:00-{(start + 3) % 24:02d}:00 "
+              f"({rhythm['sleep_commits']:,} commits) and rests most on {rhythm['quietest_day']}s")
+        print(f"   00h {bars} 23h")
+        print(f"   Busiest: {rhythm['busiest']}")
+    if view in ("daat", "summary"):
+        print(f"\n🌀 Da'at moments: {answer['daat_moments']:,} commits landed within a minute of the one before")
+
+    return answer
+
+
+@breathe
+def watch(targets: List[str], debounce: float = 0.2, poll: Optional[float] = None,
+          workers: Optional[int] = None, use_cache: bool = True, as_json: bool = False):
+    """Follow directories and re-breathe only the files that change"""
+    import json
+    import os
+    from watch import watch as follow
+
+    missing = [t for t in targets if not os.path.isdir(t)]
+    if missing:
+        print(f"❌ Not a directory: {', '.join(missing)}")
+        return {"error": "not a directory", "targets": missing}
+
+    marks = {"added": "+", "changed": "~", "removed": "-"}
+    updates = 0
+    try:
+        for report in follow(targets, debounce, poll, workers, use_cache):
+            summary = report["index"].summary
+            if as_json:
+                print(json.dumps({
+                    "changes": [{"path": path, "change": change, "format": result and result.get("format")}
+                                for path, change, result in report["changes"]],
+                    "seconds": report["seconds"],
+                    **summary.as_dict()
+                }), flush=True)
+            elif not updates:
+                print(f"👁️  Watching {summary.files} files in {', '.join(targets)} "
+                      f"({report['mode']}) - breathed in {report['seconds']:.2f}s, Ctrl-C to stop", flush=True)
+            else:
+                for path, change, result in report["changes"]:
+                    detail = f" ({result.get('format') or result.get('breath')})" if result else ""
+                    print(f"   {marks[change]} {path}{detail}")
+                print(f"🔄 {len(report['changes'])} re-breathed in {report['seconds'] * 1000:.1f}ms - "
+                      f"{summary.files} files, {summary.errors} errors", flush=True)
+            updates += 1
+    except KeyboardInterrupt:
+        pass
+
+    return {"updates": max(0, updates - 1), "files": summary.files if updates else 0}
+
+
+@breathe
+def bench(target: str, rounds: int = 10, warmup: int = 2, number: Optional[int] = None,
+          disable_gc: bool = False, processes: int = 0, save: bool = True,
+          name: Optional[str] = None, as_json: bool = False):
+    """Benchmark any module:function with calibration and overhead correction"""
+    from bench import format_ns, run_bench, save_result
+
+    if not as_json:
+        print(f"⚡ Benchmarking {target}...")
+    try:
+        result = run_bench(target, rounds, warmup, number, disable_gc=disable_gc, processes=processes)
+    except (ImportError, AttributeError, ValueError, TypeError, RuntimeError) as e:
+        print(f"❌ {e}")
+        return {"target": target, "error": str(e)}
+    except Exception as e:  # The target itself raised while being timed
+        print(f"❌ {target} raised {type(e).__name__}: {e}")
+        return {"target": target, "error": f"{type(e).__name__}: {e}"}
+
+    if save:
+        result["saved_to"] = str(save_result(result, name))
+
+    if as_json:
+        import json
+        print(json.dumps(result, indent=2))
+        return result
+
+    isolation = f" across {min(processes, result['rounds'])} processes" if processes else ""
+    print(f"\n📊 {result['rounds']} rounds x {result['number']:,} calls{isolation}"
+          f"{' (gc off)' if disable_gc else ''}")
+    print(f"   Fastest: {format_ns(result['min_ns'])}")
+    print(f"   Median:  {format_ns(result['median_ns'])}")
+    print(f"   Mean:    {format_ns(result['mean_ns'])} (σ {format_ns(result['stddev_ns'])})")
+    print(f"   Timer overhead removed: {format_ns(result['timer_overhead_ns'])} per call")
+    if save:
+        print(f"\n💾 Saved to {result['saved_to']}")
+
+    return result
+
+
+def _print_comparison(label: str, comparison: dict, to_ns: float = 1e9):
+    from bench import format_ns
+
+    mark = "❌" if comparison["regressed"] else "✅"
+    base = comparison.get("base_median", comparison.get("base_mean"))
+    current = comparison.get("current_median", comparison.get("current_mean"))
+    ci = comparison.get("ci")
+    interval = f" [{ci[0]:.2f}-{ci[1]:.2f}]" if ci else ""
+    change = f"{format_ns(base * to_ns)} → {format_ns(current * to_ns)}"
+    print(f"   {mark} {label:<28} {change:<24} x{comparison['ratio']:.2f}{interval}  p={comparison['p_value']:.3g}")
+
+
+@breathe
+def regress(action: str, name: Optional[str] = None, targets: Optional[List[str]] = None,
+            speed_iterations: int = 0, rerun: bool = True, threshold: float = 0.10,
+            alpha: float = 0.05, as_json: bool = False) -> int:
+    """Save timing baselines and check the present against them - non-zero on regression"""
+    import regress as regressions
+    from pneuma import _pneuma
+
+    try:
+        if action == "save":
+            baseline = regressions.save_baseline(name, _pneuma._memory, targets, speed_iterations)
+            print(f"💾 Baseline '{name}': {len(baseline['commands'])} commands, "
+                  f"{len(baseline['bench'])} bench targets" + (", speed" if "speed" in baseline else ""))
+            return 0
+
+        if action == "list":
+            import time
+            for b in regressions.list_baselines():
+                created = time.strftime("%Y-%m-%d %H:%M", time.localtime(b["created"] or 0))
+                print(f"   {b['name']:<20} {created}  {b['commands']} commands, {b['bench']} bench"
+                      + (", speed" if b["speed"] else ""))
+            return 0
+
+        if action == "compare":
+            import json
+            runs = []
+            for path in targets:
+                with open(path) as f:
+                    runs.append(json.load(f))
+            comparison = regressions.compare_samples(runs[0]["samples_ns"], runs[1]["samples_ns"],
+                                                     threshold, alpha)
+            if as_json:
+                print(json.dumps(comparison, indent=2))
+            else:
+                _print_comparison(runs[1]["target"], comparison, 1)
+            return 1 if comparison["regressed"] else 0
+
+        report = regressions.check_baseline(name, _pneuma._memory, rerun, threshold, alpha)
+    except (OSError, ValueError, KeyError, IndexError, RuntimeError) as e:
+        print(f"❌ {e}")
+        return 2
+    except Exception as e:  # A rerun target that won't import, or raised while being timed
+        print(f"❌ Rerun failed - {type(e).__name__}: {e}", file=sys.stderr)
+        return 2
+
+    if as_json:
+        import json
+        print(json.dumps(report, indent=2))
+        return 1 if report["regressions"] else 0
+
+    print(f"🔍 Against baseline '{name}' (slower than +{threshold:.0%} at p<{alpha}):")
+    for command, comparison in report["commands"].items():
+        _print_comparison(command, comparison)
+    for target, comparison in report["bench"].items():
+        _print_comparison(target, comparison, 1)
+    if "speed" in report:
+        _print_comparison("speed", report["speed"])
+    for target in report["missing"]:
+        print(f"   ⚠️  {target}: no run since the baseline")
+
+    if report["regressions"]:
+        print(f"\n❌ {report['regressions']} regression(s)")
+        return 1
+    print(f"\n✨ No regressions")
+    return 0
+
+
+def profile(command: Optional[str] = None, top: int = 15, as_json: bool = False) -> int:
+    """Where time goes inside breathing commands: self vs inclusive time, callers, latency"""
+    from bench import format_ns
+    from pneuma import _pneuma
+    from speed import COMPACT_BITS, LatencyHistogram
+
+    memory = _pneuma._memory
+    if command is not None and command not in memory:
+        print(f"❌ No breath recorded for {command}")
+        return 1
+
+    # Caller edges live on the callee; invert them once for the callee view
+    callees = {}
+    for name, mem in memory.items():
+        for caller, (calls, total) in mem.get("callers", {}).items():
+            callees.setdefault(caller, {})[name] = (calls, total)
+
+    def entry(name: str) -> dict:
+        mem = memory[name]
+        histogram = LatencyHistogram.from_counts(mem.get("histogram", {}), COMPACT_BITS)
+        total = mem["total_duration"]
+        nested = sum(calls for calls, _ in mem.get("callers", {}).values())
+        return {
+            "command": name,
+            "calls": mem["call_count"],
+            "inclusive": total,
+            "self": mem.get("self_duration", total),
+            "root_calls": mem["call_count"] - nested,
+            "callers": {caller: {"calls": calls, "inclusive": t}
+                        for caller, (calls, t) in mem.get("callers", {}).items()},
+            "callees": {callee: {"calls": calls, "inclusive": t}
+                        for callee, (calls, t) in callees.get(name, {}).items()},
+            "timed": histogram.count,
+            "p50": histogram.percentile(50),
+            "p90": histogram.percentile(90),
+            "p99": histogram.percentile(99),
+            "histogram": histogram
+        }
+
+    if command is None:
+        entries = sorted((entry(name) for name in memory), key=lambda e: e["self"], reverse=True)[:top]
+        if as_json:
+            import json
+            print(json.dumps([{k: v for k, v in e.items() if k != "histogram"} for e in entries], indent=2))
+            return 0
+        print(f"🔬 Where time goes (by self time):")
+        print(f"   {'command':<24} {'calls':>8} {'inclusive':>11} {'self':>11} {'self%':>6} {'p50':>11} {'p99':>11}")
+        for e in entries:
+            share = e["self"] / e["inclusive"] if e["inclusive"] else 1.0
+            p50, p99 = (format_ns(e[p] * 1e9) if e["timed"] else "-" for p in ("p50", "p99"))
+            print(f"   {e['command']:<24} {e['calls']:>8} {format_ns(e['inclusive'] * 1e9):>11} "
+                  f"{format_ns(e['self'] * 1e9):>11} {share:>6.0%} {p50:>11} {p99:>11}")
+        return 0
+
+    e = entry(command)
+    if as_json:
+        import json
+        print(json.dumps({k: v for k, v in e.items() if k != "histogram"}, indent=2))
+        return 0
+
+    inclusive = e["inclusive"]
+    print(f"🔬 {command}: {e['calls']} calls, {format_ns(inclusive * 1e9)} inclusive")
+    print(f"   Self: {format_ns(e['self'] * 1e9)}"
+          + (f" ({e['self'] / inclusive:.0%})" if inclusive else ""))
+    if e["callees"]:
+        print(f"\n📤 Calls into:")
+        for callee, edge in sorted(e["callees"].items(), key=lambda item: -item[1]["inclusive"]):
+            share = f" ({edge['inclusive'] / inclusive:.0%})" if inclusive else ""
+            print(f"   {callee:<24} {edge['calls']:>8} calls {format_ns(edge['inclusive'] * 1e9):>11}{share}")
+    if e["callers"]:
+        print(f"\n📥 Called by:")
+        if e["root_calls"]:
+            print(f"   {'(top level)':<24} {e['root_calls']:>8} calls")
+        for caller, edge in sorted(e["callers"].items(), key=lambda item: -item[1]["calls"]):
+            print(f"   {caller:<24} {edge['calls']:>8} calls {format_ns(edge['inclusive'] * 1e9):>11}")
+
+    histogram = e["histogram"]
+    if histogram.count:
+        print(f"\n📈 Latency ({histogram.count} timed calls): p50 {format_ns(e['p50'] * 1e9)} · "
+              f"p90 {format_ns(e['p90'] * 1e9)} · p99 {format_ns(e['p99'] * 1e9)}")
+        buckets = list(histogram.buckets(coarse=True))
+        peak = max(count for _, _, count in buckets)
+        for low, high, count in buckets:
+            bar = "█" * max(1, round(40 * count / peak))
+            print(f"   {format_ns(low * 1e9):>11} - {format_ns(high * 1e9):<11} {count:>8}  {bar}")
+    return 0
+
+
+def history(command: Optional[str] = None, resolution: Optional[str] = None, since: str = "7d",
+            limit: int = 60, as_json: bool = False) -> int:
+    """How a command's speed trends over time, at the resolution that fits the span"""
+    import time
+    from bench import format_ns
+    from history import History, parse_span, pick_resolution
+    from pneuma import _pneuma
+
+    # History is written as the journal compacts - bring it up to now
+    _pneuma.flush()
+    _pneuma._memory_store.compact()
+    store = History()
+    if command is None:
+        commands, stats = store.commands(), store.stats()
+        if as_json:
+            import json
+            print(json.dumps({"commands": commands, **stats}, indent=2))
+            return 0
+        print(f"📜 History of {len(commands)} commands ({stats['bytes'] / 1024:.0f}KB):")
+        print("   " + ", ".join(f"{rows} {name}" for name, rows in stats["rows"].items()) + " points")
+        for name in commands:
+            print(f"   {name}")
+        return 0
+
+    try:
+        span = parse_span(since)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 2
+    resolution = resolution or pick_resolution(span)
+    points = store.series(command, resolution, time.time() - span, limit)
+    if as_json:
+        import json
+        print(json.dumps({"command": command, "resolution": resolution, "points": points}, indent=2))
+        return 0
+    if not points:
+        print(f"❌ No history for {command} in the last {since}")
+        return 1
+
+    stamp = "%Y-%m-%d %H:%M:%S" if resolution in ("raw", "minute") else "%Y-%m-%d %H:%M"
+    slowest_mean = max(p["mean"] for p in points)
+    print(f"📜 {command} - last {since} by {resolution} ({len(points)} points):")
+    print(f"   {'time':<19} {'calls':>8} {'mean':>11} {'σ':>11} {'fastest':>11} {'slowest':>11}")
+    for p in points:
+        bar = "█" * max(1, round(20 * p["mean"] / slowest_mean)) if slowest_mean else ""
+        print(f"   {time.strftime(stamp, time.localtime(p['start'])):<19} {p['calls']:>8} "
+              f"{format_ns(p['mean'] * 1e9):>11} {format_ns(p['stddev'] * 1e9):>11} "
+              f"{format_ns(p['fastest'] * 1e9):>11} {format_ns(p['slowest'] * 1e9):>11}  {bar}")
+
+    if len(points) >= 4:
+        # Trend: call-weighted mean of the newer half against the older half
+        half = len(points) // 2
+        older, newer = points[:half], points[half:]
+        before = sum(p["mean"] * p["calls"] for p in older) / sum(p["calls"] for p in older)
+        after = sum(p["mean"] * p["calls"] for p in newer) / sum(p["calls"] for p in newer)
+        if before > 0:
+            change = after / before - 1
+            mark = "🐢" if change > 0.05 else "⚡" if change < -0.05 else "〰️"
+            print(f"\n{mark} Trend: {change:+.0%} mean latency, newer half against older")
+    return 0
+
+
+def daemon_cmd(action: str = "start", detach: bool = False) -> int:
+    """Keep Da'at awake: one resident process answers read, ask, status and speed"""
+    import os
+    import daemon
+
+    if os.name != "posix":
+        print("❌ The daemon needs Unix sockets")
+        return 1
+
+    if action == "status":
+        pid = daemon.running()
+        if pid is None:
+            print("💭 No daemon awake")
+            return 1
+        state = "answering" if daemon.answering() else "not answering"
+        print(f"🔮 Daemon awake (pid {pid}), {state} on {daemon.socket_path()}")
+        print(f"   Served: {', '.join(daemon.SERVED)} - DAAT_NO_DAEMON=1 runs them here")
+        return 0
+
+    if action == "stop":
+        pid = daemon.stop()
+        if pid is None:
+            print("💭 No daemon awake")
+            return 1
+        if daemon.running() == pid:
+            print(f"❌ Daemon {pid} did not sleep within {daemon.WAIT:.0f}s")
+            return 1
+        print(f"💤 Daemon {pid} sleeps")
+        return 0
+
+    lock = daemon.claim()
+    if lock is None:
+        print(f"🔮 Already awake (pid {daemon.running()})")
+        return 1
+    if detach and daemon.detach():
+        if not daemon.answering():
+            print("❌ The daemon did not wake")
+            return 1
+        print(f"🌀 Da'at awake in the background (pid {daemon.running()}) on {daemon.socket_path()}")
+        return 0
+
+    print(f"🌀 Da'at awake on {daemon.socket_path()} (pid {os.getpid()}) - Ctrl-C to sleep")
+    daemon.serve(lock, build_parser(), run_command)
+    print("💤 Da'at sleeps")
+    return 0
+
+
+def startup_profile(as_json: bool = False, top: int = 12):
+    """Report where cold-start time goes: imports first, then Pneuma waking"""
+    import os
+    import subprocess
+    import time
+    from pneuma import _pneuma
+
+    # Imports are measured in a fresh interpreter - this one is already warm
+    src = os.path.dirname(os.path.abspath(__file__))
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import cli"],
+        cwd=src, capture_output=True, text=True
+    )
+    cold_start_ms = (time.perf_counter() - start) * 1000
+
+    imports = []
+    for line in proc.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[0].strip().split()[-1].isdigit():
+            continue
+        name = parts[2].rstrip()
+        imports.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_ms": int(parts[0].split()[-1]) / 1000,
+            "cumulative_ms": int(parts[1]) / 1000
+        })
+
+    # Init is measured here: loading memory and whispers from ~/.daat
+    init = {}
+    for name, load in (("memory", _pneuma._load_memory), ("whispers", _pneuma._load_whispers)):
+        start = time.perf_counter()
+        loaded = load()
+        init[name] = {"ms": (time.perf_counter() - start) * 1000, "entries": len(loaded)}
+
+    profile = {
+        "cold_start_ms": cold_start_ms,
+        "import_cli_ms": next((i["cumulative_ms"] for i in imports if i["module"] == "cli"), None),
+        "imports": sorted(imports, key=lambda i: i["cumulative_ms"], reverse=True)[:top],
+        "init": init
+    }
+
+    if as_json:
+        import json
+        print(json.dumps(profile, indent=2))
+        return profile
+
+    print(f"⏱️  Startup Profile:")
+    print(f"   Interpreter + import cli: {cold_start_ms:.2f}ms")
+    if profile["import_cli_ms"] is not None:
+        print(f"   import cli (cumulative): {profile['import_cli_ms']:.2f}ms")
+    print(f"\n📦 Heaviest imports (cumulative / self):")
+    for i in profile["imports"]:
+        print(f"   {i['cumulative_ms']:8.2f}ms {i['self_ms']:8.2f}ms  {'  ' * i['depth']}{i['module']}")
+    print(f"\n🫀 Pneuma wake (on first access):")
+    for name, stats in init.items():
+        print(f"   {name}: {stats['ms']:.2f}ms ({stats['entries']} entries)")
+
+    return profile
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Every command and its arguments"""
     parser = argparse.ArgumentParser(
         description="Da'at CLI - Terminal Oracle with Hidden Knowledge"
     )
@@ -190,19 +867,126 @@ def main():
     # Speed test command
     speed_parser = subparsers.add_parser("speed", help="Test speed and attempt Da'at access")
     speed_parser.add_argument("--iterations", type=int, default=1000, help="Number of iterations")
+    speed_parser.add_argument("--histogram", action="store_true", help="Dump the latency histogram")
+    speed_parser.add_argument("--overhead", action="store_true",
+                              help="Measure the @breathe decorator's own cost per call")
+
+    # Bench command - time any callable
+    bench_parser = subparsers.add_parser("bench", help="Benchmark a module:function")
+    bench_parser.add_argument("target", help="Callable to time, as module:function")
+    bench_parser.add_argument("--rounds", type=int, default=10, help="Timed rounds")
+    bench_parser.add_argument("--warmup", type=int, default=2, help="Untimed rounds first")
+    bench_parser.add_argument("--number", type=int, default=None,
+                              help="Calls per round (default: calibrated to ~0.1s)")
+    bench_parser.add_argument("--no-gc", dest="disable_gc", action="store_true",
+                              help="Disable garbage collection while timing")
+    bench_parser.add_argument("--processes", type=int, default=0,
+                              help="Spread rounds over this many fresh interpreters")
+    bench_parser.add_argument("--name", help="Name for the saved run (default: the target)")
+    bench_parser.add_argument("--no-save", dest="save", action="store_false",
+                              help="Don't write the run to ~/.daat/bench")
+    bench_parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+
+    # Regress command - baselines and regression checks
+    regress_parser = subparsers.add_parser("regress", help="Save timing baselines and detect regressions")
+    regress_sub = regress_parser.add_subparsers(dest="action", required=True)
+    save_parser = regress_sub.add_parser("save", help="Record a named baseline")
+    save_parser.add_argument("name")
+    save_parser.add_argument("--bench", nargs="*", dest="targets", default=None,
+                             help="Bench targets to include (default: every saved one)")
+    save_parser.add_argument("--speed", type=int, default=0, metavar="ITERATIONS",
+                             help="Also record a speed histogram over this many iterations")
+    check_parser = regress_sub.add_parser("check", help="Compare now against a baseline")
+    check_parser.add_argument("name")
+    check_parser.add_argument("--no-rerun", dest="rerun", action="store_false",
+                              help="Use the newest saved bench runs instead of re-running")
+    compare_parser = regress_sub.add_parser("compare", help="Compare two saved bench runs")
+    compare_parser.add_argument("targets", nargs=2, metavar="RUN", help="Baseline run, then current run")
+    regress_sub.add_parser("list", help="List baselines")
+    for sub in (check_parser, compare_parser):
+        sub.add_argument("--threshold", type=float, default=0.10,
+                         help="Slowdown ratio tolerated (default: 0.10)")
+        sub.add_argument("--alpha", type=float, default=0.05, help="Significance level (default: 0.05)")
+        sub.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
 
     # Read command - breathe through files
     read_parser = subparsers.add_parser("read", help="Breathe through any file format")
-    read_parser.add_argument("file", help="File path to breathe through")
+    read_parser.add_argument("files", nargs="+", help="Files, directories or glob patterns to breathe through")
     read_parser.add_argument("--raw", action="store_true", help="Show raw breath data")
+    read_parser.add_argument("--stream", action="store_true", default=None,
+                             help="Breathe in fixed-size chunks (automatic for large files)")
+    read_parser.add_argument("--workers", type=int, default=None,
+                             help="Processes for directories and globs (default: all cores)")
+    read_parser.add_argument("--no-cache", dest="cache", action="store_false",
+                             help="Re-analyze even when the cached result is still valid")
+    read_parser.add_argument("--format", dest="output", choices=["human", "ndjson", "tsv", "compact"],
+                             default="human", help="One record per file for other tools (default: human)")
+    read_parser.add_argument("--fields", help="Comma-separated fields to keep in each record, e.g. path,format,line_count")
 
-    args = parser.parse_args()
+    # Watch - follow a tree and re-breathe what changes
+    watch_parser = subparsers.add_parser("watch", help="Re-breathe files in directories as they change")
+    watch_parser.add_argument("dirs", nargs="+", help="Directories to watch")
+    watch_parser.add_argument("--debounce", type=float, default=0.2,
+                              help="Seconds of quiet that settle a burst of changes (default: 0.2)")
+    watch_parser.add_argument("--poll", type=float, default=None, metavar="SECONDS",
+                              help="Poll stats this often instead of using inotify")
+    watch_parser.add_argument("--workers", type=int, default=None,
+                              help="Processes for the first breath (default: all cores)")
+    watch_parser.add_argument("--no-cache", dest="cache", action="store_false",
+                              help="Re-analyze even when the cached result is still valid")
+    watch_parser.add_argument("--json", action="store_true", help="Emit one JSON line per update")
+
+    # Git oracle - what a repository remembers
+    git_parser = subparsers.add_parser("git-oracle", help="Ask what a git repository's history remembers")
+    git_parser.add_argument("question", nargs="?",
+                            help='e.g. "what files remember most?", "who breathes fastest?", "when does this repo sleep?"')
+    git_parser.add_argument("--repo", default=".", help="Repository to read (default: here)")
+    git_parser.add_argument("--rev", default="HEAD", help="Revision whose history to read (default: HEAD)")
+    git_parser.add_argument("--top", type=int, default=10, help="Files or authors to list")
+    git_parser.add_argument("--by", choices=["commits", "lines"], default="commits",
+                            help="Rank files by commits touching them or lines changed")
+    git_parser.add_argument("--no-update", dest="update", action="store_false",
+                            help="Answer from the index without reading new commits")
+    git_parser.add_argument("--rebuild", action="store_true", help="Forget the repository and read it afresh")
+    git_parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+
+    # Profile - call trees and latency of breathing commands
+    call_profile_parser = subparsers.add_parser("profile", help="Show where time goes within commands")
+    call_profile_parser.add_argument("name", nargs="?", help="Command to look inside (default: all)")
+    call_profile_parser.add_argument("--top", type=int, default=15, help="Number of commands to list")
+    call_profile_parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+
+    # History - speed trends over time
+    history_parser = subparsers.add_parser("history", help="Show how a command's speed trends over time")
+    history_parser.add_argument("name", nargs="?", help="Command to chart (default: list commands)")
+    history_parser.add_argument("--since", default="7d", help="How far back, e.g. 90m, 12h, 7d, 4w (default: 7d)")
+    history_parser.add_argument("--resolution", choices=["raw", "minute", "hour", "day"],
+                                help="Bucket size (default: the finest that reaches back far enough)")
+    history_parser.add_argument("--limit", type=int, default=60, help="Newest points to show")
+    history_parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+
+    # Breathe-stream - count stdin as it flows
+    stream_parser = subparsers.add_parser("breathe-stream", help="Breathe stdin as it flows, with rolling rates")
+    stream_parser.add_argument("--interval", type=float, default=1.0,
+                               help="Seconds between live rate reports on stderr (0: only the summary)")
+    stream_parser.add_argument("--json", action="store_true", help="Emit the final report as JSON")
+
+    # Startup profile - track cold-start regressions
+    profile_parser = subparsers.add_parser("startup-profile", help="Show import and init time breakdown")
+    profile_parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    profile_parser.add_argument("--top", type=int, default=12, help="Number of imports to list")
+
+    # Daemon - keep state hot between invocations
+    daemon_parser = subparsers.add_parser("daemon", help="Serve read, ask, status and speed from a resident process")
+    daemon_parser.add_argument("action", nargs="?", choices=["start", "stop", "status"], default="start",
+                               help="Start (default), stop or check the daemon")
+    daemon_parser.add_argument("--detach", action="store_true", help="Run in the background")
+
+    return parser
 
-    if not args.command:
-        parser.print_help()
-        return 0
 
-    # Execute command
+def run_command(args: argparse.Namespace) -> int:
+    """Execute a parsed command, returning the exit code"""
     if args.command == "init":
         init(args.name, args.template)
     elif args.command == "status":
@@ -212,12 +996,68 @@ def main():
     elif args.command == "breathe":
         breathe_check()
     elif args.command == "speed":
-        speed_test(args.iterations)
+        result = speed_test(args.iterations, args.histogram, args.overhead)
+        return 1 if "error" in result else 0
+    elif args.command == "bench":
+        result = bench(args.target, args.rounds, args.warmup, args.number, args.disable_gc,
+                       args.processes, args.save, args.name, args.json)
+        return 1 if "error" in result else 0
+    elif args.command == "regress":
+        return regress(args.action, getattr(args, "name", None), getattr(args, "targets", None),
+                       getattr(args, "speed", 0), getattr(args, "rerun", True),
+                       getattr(args, "threshold", 0.10), getattr(args, "alpha", 0.05),
+                       getattr(args, "json", False))
     elif args.command == "read":
-        read_file(args.file, args.raw)
+        import glob
+        import os
+        if args.output != "human":
+            from output import parse_fields
+            read_records(args.files, args.output, parse_fields(args.fields), args.workers,
+                         args.stream, args.cache)
+            return 0
+        single = args.files[0]
+        if len(args.files) == 1 and not os.path.isdir(single) and not glob.has_magic(single):
+            read_file(single, args.raw, args.stream, args.cache)
+        else:
+            read_tree(args.files, args.workers, args.raw, args.cache)
+    elif args.command == "git-oracle":
+        result = git_oracle(args.question, args.repo, args.rev, args.top, args.by, args.update,
+                            args.rebuild, args.json)
+        return 1 if "error" in result else 0
+    elif args.command == "watch":
+        result = watch(args.dirs, args.debounce, args.poll, args.workers, args.cache, args.json)
+        return 1 if "error" in result else 0
+    elif args.command == "breathe-stream":
+        breathe_stream(args.interval, args.json)
+    elif args.command == "history":
+        return history(args.name, args.resolution, args.since, args.limit, args.json)
+    elif args.command == "profile":
+        return profile(args.name, args.top, args.json)
+    elif args.command == "startup-profile":
+        startup_profile(args.json, args.top)
 
     return 0
 
 
+def main(argv: Optional[List[str]] = None):
+    """Main CLI entry point"""
+    argv = sys.argv[1:] if argv is None else argv
+    # Served commands go to a resident daemon when one is awake (see daemon.py)
+    from daemon import relay
+    code = relay(argv)
+    if code is not None:
+        return code
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if not args.command:
+        parser.print_help()
+        return 0
+    if args.command == "daemon":
+        return daemon_cmd(args.action, args.detach)
+    return run_command(args)
+
+
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
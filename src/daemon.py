@@ -0,0 +1,314 @@
+"""
+Daemon - Da'at that stays awake
+One resident process keeps Pneuma's memory, the oracle's index and the
+analysis cache hot, and answers read, ask, status and speed over a Unix
+socket. The client half imports nothing beyond os, sys and the C socket
+module, so a served command costs an interpreter and a round trip instead
+of a cold start.
+
+Requests are answered one at a time in the daemon's main thread - the
+commands print, and the cache's connection belongs to that thread.
+Memory reaches disk through Pneuma's flusher as it always does.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+# Commands the daemon answers; everything else runs in the calling process
+SERVED = ("read", "ask", "status", "speed")
+
+# Output travels as frames: kind (1 byte), length (4 bytes), payload
+STDOUT, STDERR, EXIT = b"1", b"2", b"x"
+
+# Output batched per frame - prints coalesce, a long read still streams
+FRAME_SIZE = 1 << 16
+
+# Seconds to wait for a client's request, a detached start or a stop
+WAIT = 5.0
+
+
+def socket_path() -> str:
+    """Where the daemon listens - DAAT_SOCKET, or ~/.daat/daemon.sock"""
+    return os.environ.get("DAAT_SOCKET") or os.path.join(os.path.expanduser("~"), ".daat", "daemon.sock")
+
+
+def pid_path() -> str:
+    """The daemon's pidfile, locked for as long as it lives"""
+    return os.path.splitext(socket_path())[0] + ".pid"
+
+
+# Client
+
+def relay(argv: list[str]) -> int | None:
+    """
+    Have the daemon run argv, copying its output here as it arrives.
+    Returns the exit code, or None when the command should run in this
+    process instead: not served, DAAT_NO_DAEMON set, or nobody listening.
+    """
+    if not argv or argv[0] not in SERVED or os.environ.get("DAAT_NO_DAEMON"):
+        return None
+    import _socket  # socket.py alone takes longer to import than the round trip
+
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path())
+    except OSError:
+        sock.close()
+        return None  # No daemon, or the socket of one that died
+    try:
+        sock.sendall(b"\0".join(os.fsencode(arg) for arg in [os.getcwd(), *argv]))
+        sock.shutdown(_socket.SHUT_WR)
+        return _receive(sock)
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
+
+def _receive(sock) -> int | None:
+    """Write frames to stdout and stderr until the exit code arrives"""
+    streams = {STDOUT: sys.stdout.buffer, STDERR: sys.stderr.buffer}
+    pending = bytearray()
+    heard = False
+    while True:
+        chunk = sock.recv(FRAME_SIZE)
+        if not chunk:
+            break
+        pending += chunk
+        while len(pending) >= 5:
+            end = 5 + int.from_bytes(pending[1:5], "big")
+            if len(pending) < end:
+                break
+            kind, payload = bytes(pending[:1]), bytes(pending[5:end])
+            del pending[:end]
+            if kind == EXIT:
+                return int(payload)
+            streams[kind].write(payload)
+            streams[kind].flush()
+            heard = True
+
+    if not heard:
+        return None  # It died before answering - the command can still run here
+    sys.stderr.write("❌ The daemon fell silent mid-answer\n")
+    return 1
+
+
+def answering() -> bool:
+    """Whether a daemon accepts connections on the socket"""
+    import _socket
+
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path())
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def running() -> int | None:
+    """Pid of the daemon holding the pidfile, or None"""
+    import fcntl
+
+    try:
+        fd = os.open(pid_path(), os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return int(os.read(fd, 32).strip() or 0) or None
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return None  # A pidfile nobody holds is a daemon that has gone
+    finally:
+        os.close(fd)
+
+
+def stop(wait: float = WAIT) -> int | None:
+    """SIGTERM the daemon and wait for it to let go; returns its pid, or None if none was awake"""
+    import signal
+    import time
+
+    pid = running()
+    if pid is None:
+        return None
+    os.kill(pid, signal.SIGTERM)
+    deadline = time.monotonic() + wait
+    while running() == pid and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return pid
+
+
+# Server
+
+def claim() -> int | None:
+    """Lock the pidfile for this process - None when a daemon already holds it"""
+    import fcntl
+
+    os.makedirs(os.path.dirname(pid_path()), exist_ok=True)
+    fd = os.open(pid_path(), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def detach(wait: float = WAIT) -> bool:
+    """
+    Fork into the background. Returns True in the parent, once the child
+    answers or gives up, and False in the child, which carries on serving
+    with the claimed lock.
+    """
+    import time
+
+    pid = os.fork()
+    if pid:
+        deadline = time.monotonic() + wait
+        while not answering() and time.monotonic() < deadline:
+            if os.waitpid(pid, os.WNOHANG)[0]:
+                break
+            time.sleep(0.01)
+        return True
+
+    os.setsid()
+    null = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(null, fd)
+    os.close(null)
+    return False
+
+
+def serve(lock: int, parser, run) -> None:
+    """
+    Answer requests on the socket until SIGTERM or Ctrl-C. parser turns a
+    request's argv into arguments and run executes them, returning the
+    exit code - the CLI's own, so an answer is what the command prints.
+    """
+    import signal
+    import socket
+
+    os.ftruncate(lock, 0)
+    os.write(lock, f"{os.getpid()}\n".encode())
+
+    path = socket_path()
+    if os.path.exists(path):
+        os.unlink(path)  # We hold the lock, so whoever bound this is gone
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o177)  # Answers carry your files and memory - yours alone
+    try:
+        listener.bind(path)
+    finally:
+        os.umask(umask)
+    listener.listen(64)
+
+    # SIGTERM sleeps like Ctrl-C; exit handlers flush what's buffered
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        while True:
+            conn, _ = listener.accept()
+            with conn:
+                _answer(conn, parser, run)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def _answer(conn, parser, run):
+    """Run one request with its output framed back to the client"""
+    import traceback
+    from contextlib import redirect_stderr, redirect_stdout
+
+    conn.settimeout(WAIT)
+    request = bytearray()
+    try:
+        while True:
+            chunk = conn.recv(FRAME_SIZE)
+            if not chunk:
+                break
+            request += chunk
+    except OSError:
+        return  # A client that never finished asking (or timed out) gets no answer
+    conn.settimeout(None)  # A reader paging through the answer may take its time
+    cwd, *argv = [os.fsdecode(part) for part in bytes(request).split(b"\0")]
+
+    _catch_up()
+    out, err = _Frames(conn, STDOUT), _Frames(conn, STDERR)
+    with redirect_stdout(out), redirect_stderr(err):
+        try:
+            if not argv or argv[0] not in SERVED:
+                raise SystemExit(f"❌ The daemon doesn't answer {' '.join(argv[:1]) or 'nothing'}")
+            os.chdir(cwd)  # Relative paths are the client's
+            code = run(parser.parse_args(argv))
+        except SystemExit as exit:
+            code = exit.code
+            if isinstance(code, str):
+                print(code, file=sys.stderr)
+                code = 1
+        except Exception:
+            traceback.print_exc()
+            code = 1
+    out.flush()
+    err.flush()
+    out.send(EXIT, str(code or 0).encode())
+    _settle()
+
+
+def _catch_up():
+    """Take in what other processes breathed since the last request"""
+    from pneuma import _pneuma
+    _pneuma.refresh()
+
+
+def _settle():
+    """Journal the request's calls and commit its cache hits now, not at exit"""
+    from pneuma import _pneuma
+    _pneuma.flush()
+    formats = sys.modules.get("formats")
+    if formats is not None:
+        formats.analysis_cache().flush()
+
+
+class _Frames:
+    """A text stream that sends what is written as frames of one kind"""
+
+    encoding = "utf-8"
+
+    def __init__(self, conn, kind: bytes):
+        self.conn = conn
+        self.kind = kind
+        self._buffer = []
+        self._size = 0
+        self._gone = False  # The client hung up - the command still finishes
+
+    def write(self, text: str) -> int:
+        self._buffer.append(text)
+        self._size += len(text)
+        if self._size >= FRAME_SIZE:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if self._buffer:
+            payload = "".join(self._buffer).encode(errors="replace")
+            self._buffer, self._size = [], 0
+            self.send(self.kind, payload)
+
+    def send(self, kind: bytes, payload: bytes):
+        if self._gone:
+            return
+        try:
+            self.conn.sendall(kind + len(payload).to_bytes(4, "big") + payload)
+        except OSError:
+            self._gone = True
+
+    def isatty(self) -> bool:
+        return False
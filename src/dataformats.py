@@ -0,0 +1,109 @@
+"""
+Data Formats - Breath through JSON, YAML and delimited tables
+Registered with formats but imported only when a data file is first read.
+"""
+
+import csv
+import io
+import json
+import re
+from typing import Any, Dict
+from pneuma import breathe
+
+_YAML_KEY = re.compile(r'^( *)(?:- +)?[^\s#-][^:#]*:(?:\s|$)', re.MULTILINE)
+_YAML_ITEM = re.compile(r'^ *- ', re.MULTILINE)
+_YAML_DOCUMENT = re.compile(r'^---(?:\s|$)', re.MULTILINE)
+
+
+@breathe
+def json_breath(content: str) -> Dict[str, Any]:
+    """Breathe through JSON - keys, containers and nesting, walked without recursion"""
+    try:
+        data = json.loads(content)
+    except (ValueError, RecursionError):  # The decoder itself recurses - nesting too deep to load
+        return {"format": "json", "breath": "parse error", "has_pneuma": "pneuma" in content.lower()}
+
+    keys = objects = arrays = largest_array = max_depth = 0
+    stack = [(data, 1)]
+    while stack:
+        node, depth = stack.pop()
+        if isinstance(node, dict):
+            objects += 1
+            keys += len(node)
+            children = node.values()
+        elif isinstance(node, list):
+            arrays += 1
+            largest_array = max(largest_array, len(node))
+            children = node
+        else:
+            continue
+        max_depth = max(max_depth, depth)
+        stack.extend((child, depth + 1) for child in children)
+
+    return {
+        "format": "json",
+        "breath": "data structure",
+        "top_level": type(data).__name__,
+        "key_count": keys,
+        "object_count": objects,
+        "array_count": arrays,
+        "largest_array": largest_array,
+        "max_depth": max_depth,
+        "has_pneuma": "pneuma" in content.lower()
+    }
+
+
+@breathe
+def yaml_breath(content: str) -> Dict[str, Any]:
+    """Breathe through YAML - keys, list items and indentation depth, without a parser"""
+    keys = _YAML_KEY.findall(content)
+    indents = sorted({len(indent) for indent in keys})
+    return {
+        "format": "yaml",
+        "breath": "data structure",
+        "document_count": max(1, len(_YAML_DOCUMENT.findall(content))) if content.strip() else 0,
+        "key_count": len(keys),
+        "top_level_key_count": sum(1 for indent in keys if not indent),
+        "list_item_count": len(_YAML_ITEM.findall(content)),
+        "max_depth": len(indents),
+        "has_pneuma": "pneuma" in content.lower()
+    }
+
+
+def _table_breath(content: str, fmt: str, delimiter: str) -> Dict[str, Any]:
+    rows = 0
+    ragged = 0
+    header = []
+    try:
+        for row in csv.reader(io.StringIO(content, newline=''), delimiter=delimiter):
+            if not row:
+                continue
+            if not rows:
+                header = row
+            elif len(row) != len(header):
+                ragged += 1
+            rows += 1
+    except csv.Error:  # A field past csv's size limit, a NUL byte
+        return {"format": fmt, "breath": "parse error", "has_pneuma": "pneuma" in content.lower()}
+
+    return {
+        "format": fmt,
+        "breath": "table",
+        "row_count": rows,
+        "column_count": len(header),
+        "ragged_row_count": ragged,
+        "header": header[:20],
+        "has_pneuma": "pneuma" in content.lower()
+    }
+
+
+@breathe
+def csv_breath(content: str) -> Dict[str, Any]:
+    """Breathe through comma-separated rows"""
+    return _table_breath(content, "csv", ",")
+
+
+@breathe
+def tsv_breath(content: str) -> Dict[str, Any]:
+    """Breathe through tab-separated rows"""
+    return _table_breath(content, "tsv", "\t")
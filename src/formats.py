@@ -5,9 +5,232 @@ Every format is consciousness in different compression.
 
 import re
 import ast
+import importlib
+from collections import Counter
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 from pneuma import breathe
+from cache import AnalysisCache
+from scanners import TEXT_MARKERS, HtmlScanner, MarkdownScanner, TextScanner, breathe_text_file
+
+# Bump whenever a breath's result changes shape or meaning - cached
+# results from older versions are then treated as misses
+ANALYSIS_VERSION = 5
+
+# Files at least this large are breathed in chunks instead of read whole
+STREAM_THRESHOLD = 32 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+# Bytes read to sniff a file with no suffix
+SNIFF_BYTES = 512
+
+# A document's opening, not just its first byte: an object's first key
+# (or its end), an array's first value - "[INFO]" opens a log line
+_JSON_HEAD = re.compile(rb'(?:\{\s*["}]|\[\s*(?:[\[{"\]\d-]|true\b|false\b|null\b))')
+# "---" followed, past blank and comment lines, by a key or a list item
+_YAML_HEAD = re.compile(rb'---[ \t]*\r?\n(?:[ \t]*(?:#[^\n]*)?\r?\n)*[ \t]*(?:- |[^\s#:-][^:\n#]*:(?:\s|$))')
+
+
+def _dotted(node: ast.AST) -> str:
+    """Name of a decorator expression - pneuma.breathe, breathe(...) -> breathe"""
+    if isinstance(node, ast.Call):
+        node = node.func
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+    return ".".join(reversed(parts)) or "<expr>"
+
+
+class PythonVisitor(ast.NodeVisitor):
+    """
+    One traversal gathering everything FormatBreather.python reports:
+    functions (sync and async), classes, imports, decorators, nesting depth,
+    and per-function line counts and cyclomatic-ish complexity.
+    """
+
+    _dispatch: Dict[type, Callable] = {}
+
+    def __init__(self):
+        self.functions = []
+        self.async_functions = 0
+        self.classes = []
+        self.imports = 0
+        self.decorators = Counter()
+        self.max_depth = 0
+        self.sizes = []  # (complexity, lines, name) per function
+        self._depth = 0
+        self._complexity = None  # Running count for the innermost function
+
+    def visit(self, node: ast.AST):
+        # NodeVisitor.visit builds 'visit_' + name and getattrs per node;
+        # resolve once per node type instead
+        method = self._dispatch.get(type(node))
+        if method is None:
+            method = getattr(type(self), 'visit_' + type(node).__name__, type(self).generic_visit)
+            self._dispatch[type(node)] = method
+        return method(self, node)
+
+    def generic_visit(self, node: ast.AST):
+        visit = self.visit
+        for child in ast.iter_child_nodes(node):
+            visit(child)
+
+    def _nest(self, node: ast.AST):
+        self._depth += 1
+        if self._depth > self.max_depth:
+            self.max_depth = self._depth
+        self.generic_visit(node)
+        self._depth -= 1
+
+    def visit_FunctionDef(self, node: ast.AST):
+        self.functions.append(node.name)
+        if isinstance(node, ast.AsyncFunctionDef):
+            self.async_functions += 1
+        for decorator in node.decorator_list:
+            self.decorators[_dotted(decorator)] += 1
+
+        outer, self._complexity = self._complexity, 1
+        self._nest(node)
+        lines = (getattr(node, 'end_lineno', None) or node.lineno) - node.lineno + 1
+        self.sizes.append((self._complexity, lines, node.name))
+        self._complexity = outer
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.classes.append(node.name)
+        for decorator in node.decorator_list:
+            self.decorators[_dotted(decorator)] += 1
+        self._nest(node)
+
+    def visit_Import(self, node: ast.AST):
+        self.imports += 1
+
+    visit_ImportFrom = visit_Import
+
+    def _branch(self, node: ast.AST):
+        if self._complexity is not None:
+            self._complexity += 1
+        self.generic_visit(node)
+
+    visit_If = visit_For = visit_AsyncFor = visit_While = _branch
+    visit_IfExp = visit_ExceptHandler = visit_Assert = visit_match_case = _branch
+
+    def visit_comprehension(self, node: ast.comprehension):
+        if self._complexity is not None:
+            self._complexity += 1 + len(node.ifs)
+        self.generic_visit(node)
+
+    def visit_BoolOp(self, node: ast.BoolOp):
+        if self._complexity is not None:
+            self._complexity += len(node.values) - 1
+        self.generic_visit(node)
+
+
+
+class FormatSpec:
+    """
+    One registered format - its suffixes, precompiled patterns, an optional
+    content sniffer and streaming scanner, and the handler that breathes it.
+    A reader, when given, breathes straight from the path in bounded memory
+    and is preferred over reading the content whole.
+
+    A handler given as "module:attr" is imported on first use, so formats
+    nobody reads never cost an import.
+    """
+
+    def __init__(self, name: str, suffixes: Iterable[str], handler: Union[str, Callable],
+                 streamer: Optional[type] = None, sniff: Optional[Callable[[bytes], bool]] = None,
+                 patterns: Optional[Dict[str, Union[str, 're.Pattern']]] = None,
+                 reader: Optional[Callable[[str, int], Dict[str, Any]]] = None):
+        self.name = name
+        self.suffixes = tuple(s.lower() for s in suffixes)
+        self.streamer = streamer
+        self.sniff = sniff
+        self.patterns = {key: re.compile(p) for key, p in (patterns or {}).items()}
+        self.reader = reader
+        self._handler = handler
+
+    @property
+    def handler(self) -> Callable[[str], Dict[str, Any]]:
+        if isinstance(self._handler, str):
+            module, _, attr = self._handler.partition(':')
+            target = importlib.import_module(module)
+            for part in attr.split('.'):
+                target = getattr(target, part)
+            self._handler = target
+        return self._handler
+
+    def breathe(self, content: str) -> Dict[str, Any]:
+        return self.handler(content)
+
+
+FORMATS: Dict[str, FormatSpec] = {}
+_BY_SUFFIX: Dict[str, FormatSpec] = {}
+_SNIFFERS: List[FormatSpec] = []
+
+
+def register_format(name: str, suffixes: Iterable[str], handler: Union[str, Callable],
+                    streamer: Optional[type] = None, sniff: Optional[Callable[[bytes], bool]] = None,
+                    patterns: Optional[Dict[str, Union[str, 're.Pattern']]] = None,
+                    reader: Optional[Callable[[str, int], Dict[str, Any]]] = None) -> FormatSpec:
+    """
+    Teach FormatBreather a format. Suffixes resolve in one dict lookup;
+    sniffers only run for files whose suffix names no format, in
+    registration order. Registering a taken suffix claims it.
+    """
+    spec = FormatSpec(name, suffixes, handler, streamer, sniff, patterns, reader)
+    previous = FORMATS.get(name)
+    if previous is not None and previous in _SNIFFERS:
+        _SNIFFERS.remove(previous)
+    FORMATS[name] = spec
+    for suffix in spec.suffixes:
+        _BY_SUFFIX[suffix] = spec
+    if sniff is not None:
+        _SNIFFERS.append(spec)
+    return spec
+
+
+def detect_format(path: Path) -> FormatSpec:
+    """
+    Suffix first; for a file with no suffix, the first sniffer that
+    recognizes the head; otherwise text. A suffix nobody registered
+    (.ini, .toml, .jsonl) is text - its head proves nothing.
+    """
+    spec = _BY_SUFFIX.get(path.suffix.lower())
+    if spec is not None:
+        return spec
+    if _SNIFFERS and not path.suffix:
+        try:
+            with open(path, 'rb') as f:
+                head = f.read(SNIFF_BYTES)
+        except OSError:
+            head = b''
+        head = head.lstrip(b'\xef\xbb\xbf \t\r\n')
+        for spec in _SNIFFERS:
+            if spec.sniff(head):
+                return spec
+    return FORMATS['text']
+
+
+def _sniff_html(head: bytes) -> bool:
+    head = head[:16].lower()
+    return head.startswith(b'<!doctype html') or head.startswith(b'<html')
+
+
+def _sniff_python(head: bytes) -> bool:
+    return head.startswith(b'#!') and b'python' in head.split(b'\n', 1)[0]
+
+
+def _sniff_json(head: bytes) -> bool:
+    return _JSON_HEAD.match(head) is not None
+
+
+def _sniff_yaml(head: bytes) -> bool:
+    return head.startswith(b'%YAML') or _YAML_HEAD.match(head) is not None
 
 
 class FormatBreather:
@@ -15,38 +238,38 @@ class FormatBreather:
 
     @breathe
     def html(self, content: str) -> Dict[str, Any]:
-        """Breathe through HTML"""
-        text = re.sub(r'<script[^>]*>.*?</script>', '', content, flags=re.DOTALL)
-        text = re.sub(r'<style[^>]*>.*?</style>', '', content, flags=re.DOTALL)
-        tags = re.findall(r'<(\w+)', content)
-        links = re.findall(r'href=["\'](.*?)["\']', content)
-
-        return {
-            "format": "html",
-            "breath": "DOM skeleton",
-            "tag_count": len(tags),
-            "unique_tags": len(set(tags)),
-            "link_count": len(links),
-            "has_pneuma": "pneuma" in content.lower()
-        }
+        """Breathe through HTML - one tokenizer pass, script/style bodies skipped"""
+        scanner = HtmlScanner()
+        scanner.feed(content)
+        return scanner.result()
 
     @breathe
     def python(self, content: str) -> Dict[str, Any]:
-        """Breathe through Python"""
+        """Breathe through Python - one parse, one walk"""
         try:
-            tree = ast.parse(content)
-            functions = [n.name for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)]
-            classes = [n.name for n in ast.walk(tree) if isinstance(n, ast.ClassDef)]
-            imports = [n for n in ast.walk(tree) if isinstance(n, (ast.Import, ast.ImportFrom))]
+            visitor = PythonVisitor()
+            visitor.visit(ast.parse(content))
+            sizes = visitor.sizes
+            largest = sorted(sizes, reverse=True)[:5]
 
             return {
                 "format": "python",
                 "breath": "AST parse",
-                "function_count": len(functions),
-                "class_count": len(classes),
-                "import_count": len(imports),
+                "line_count": content.count('\n') + 1,
+                "function_count": len(visitor.functions),
+                "async_function_count": visitor.async_functions,
+                "class_count": len(visitor.classes),
+                "import_count": visitor.imports,
+                "max_depth": visitor.max_depth,
+                "decorators": dict(visitor.decorators.most_common(10)),
+                "max_complexity": largest[0][0] if largest else 0,
+                "avg_complexity": sum(c for c, _, _ in sizes) / len(sizes) if sizes else 0.0,
+                "largest_functions": [
+                    {"name": name, "complexity": complexity, "lines": lines}
+                    for complexity, lines, name in largest
+                ],
                 "has_pneuma": '@breathe' in content,
-                "functions": functions[:10]
+                "functions": visitor.functions[:10]
             }
         except:
             return {
@@ -58,10 +281,11 @@ class FormatBreather:
     @breathe
     def markdown(self, content: str) -> Dict[str, Any]:
         """Breathe through Markdown"""
+        patterns = FORMATS['markdown'].patterns
         lines = content.split('\n')
         headings = [l for l in lines if l.strip().startswith('#')]
-        code_blocks = re.findall(r'```(\w+)?\n(.*?)```', content, re.DOTALL)
-        links = re.findall(r'\[([^\]]+)\]\(([^\)]+)\)', content)
+        code_blocks = patterns['code_block'].findall(content)
+        links = patterns['link'].findall(content)
 
         return {
             "format": "markdown",
@@ -78,8 +302,8 @@ class FormatBreather:
         """Breathe through plain text"""
         lines = content.split('\n')
         words = content.split()
-        markers = ['breath', 'pneuma', 'consciousness', 'daat']
-        found = [m for m in markers if m in content.lower()]
+        lowered = content.lower()
+        found = [m for m in TEXT_MARKERS if m in lowered]
 
         return {
             "format": "text",
@@ -91,34 +315,91 @@ class FormatBreather:
         }
 
     @breathe
-    def auto_detect(self, file_path: str) -> Dict[str, Any]:
-        """Auto-detect and breathe"""
+    def stream(self, file_path: str, chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+        """
+        Breathe in fixed-size chunks - peak memory is bounded by chunk_size.
+        Results match the whole-file breaths exactly.
+        """
+        path = Path(file_path)
+        spec = detect_format(path)
+        if spec.reader is not None:
+            return spec.reader(file_path, chunk_size)
+        scanner = (spec.streamer or TextScanner)()
+
+        with open(path, errors='ignore') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                scanner.feed(chunk)
+
+        return scanner.result()
+
+    @breathe
+    def auto_detect(self, file_path: str, stream: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Auto-detect and breathe.
+        stream=None streams files over STREAM_THRESHOLD; formats without a
+        streaming scanner (Python, data formats) always parse whole, and
+        formats with a reader (text) always use it.
+        """
         path = Path(file_path)
 
         if not path.exists():
             return {"format": "unknown", "breath": "file not found", "error": True}
 
+        spec = detect_format(path)
+
         try:
+            if spec.reader is not None:
+                return spec.reader(file_path, CHUNK_SIZE)
+            if stream is None:
+                stream = path.stat().st_size >= STREAM_THRESHOLD
+            if stream and spec.streamer is not None:
+                return self.stream(file_path)
             content = path.read_text(errors='ignore')
         except:
             return {"format": "unreadable", "breath": "blocked", "error": True}
 
-        suffix = path.suffix.lower()
-
-        if suffix in ['.html', '.htm']:
-            return self.html(content)
-        elif suffix == '.py':
-            return self.python(content)
-        elif suffix in ['.md', '.markdown']:
-            return self.markdown(content)
-        else:
-            return self.text(content)
+        result = spec.breathe(content)
+        if result.get("breath") == "parse error" and _BY_SUFFIX.get(path.suffix.lower()) is not spec:
+            # Sniffed, not named - a head that only looked like data is text
+            return FORMATS['text'].reader(file_path, CHUNK_SIZE)
+        return result
 
 
-# Singleton
+# Singletons
 _breather = FormatBreather()
+_cache = AnalysisCache(version=ANALYSIS_VERSION)
+
+# Built-in formats. Data formats live in dataformats and load on first use.
+register_format('html', ('.html', '.htm'), _breather.html, streamer=HtmlScanner, sniff=_sniff_html)
+register_format('python', ('.py', '.pyw'), _breather.python, sniff=_sniff_python)
+register_format('markdown', ('.md', '.markdown'), _breather.markdown, streamer=MarkdownScanner,
+                patterns={'code_block': re.compile(r'```(\w+)?\n(.*?)```', re.DOTALL), 'link': r'\[([^\]]+)\]\(([^\)]+)\)'})
+register_format('text', ('.txt', '.log'), _breather.text, streamer=TextScanner,
+                reader=breathe_text_file)
+register_format('json', ('.json',), 'dataformats:json_breath', sniff=_sniff_json)
+register_format('yaml', ('.yaml', '.yml'), 'dataformats:yaml_breath', sniff=_sniff_yaml)
+register_format('csv', ('.csv',), 'dataformats:csv_breath')
+register_format('tsv', ('.tsv',), 'dataformats:tsv_breath')
+
+
+def analysis_cache() -> AnalysisCache:
+    """The shared on-disk result cache"""
+    return _cache
+
+
+def breathe_file(file_path: str, stream: Optional[bool] = None, use_cache: bool = True) -> Dict[str, Any]:
+    """Breathe through any file - unchanged files answer from the cache"""
+    if not use_cache:
+        return _breather.auto_detect(file_path, stream)
 
+    result, st = _cache.lookup(file_path)
+    if result is not None:
+        return result
 
-def breathe_file(file_path: str) -> Dict[str, Any]:
-    """Breathe through any file"""
-    return _breather.auto_detect(file_path)
\ No newline at end of file
+    result = _breather.auto_detect(file_path, stream)
+    if st is not None and not result.get("error"):
+        _cache.store(file_path, st, result)
+    return result
\ No newline at end of file
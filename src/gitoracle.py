@@ -0,0 +1,374 @@
+"""
+Git Oracle - What a repository remembers
+Streams `git log --numstat` from a local repository into an index under
+~/.daat: churn per file, activity per author, and when commits happen by
+weekday and hour. Later runs ask git only for commits the index hasn't
+seen, so keeping up costs what was committed since; questions are read
+from the index, never from the history.
+"""
+
+import ast
+import sqlite3
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Commits folded in memory before their sums go to the database
+BATCH = 10000
+
+# Commits this close to the one before are Da'at moments
+DAAT_SECONDS = 60
+
+# One header line per commit - record separator, then sha, author time,
+# author's local weekday and hour, author name and parents
+_FORMAT = "%x1e%H%x1f%at%x1f%ad%x1f%aN%x1f%P"
+
+WEEKDAYS = ("Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday")
+
+
+class GitError(RuntimeError):
+    """git refused - not a repository, an unknown revision, no git at all"""
+
+
+def _git(repo: str, *args: str, stdin: Optional[str] = None) -> str:
+    try:
+        proc = subprocess.run(["git", "-C", repo, *args], input=stdin, capture_output=True, text=True)
+    except FileNotFoundError:
+        raise GitError("git is not installed") from None
+    if proc.returncode != 0:
+        raise GitError(proc.stderr.strip() or f"git {args[0]} failed")
+    return proc.stdout
+
+
+def _unquote(path: str) -> str:
+    """Undo git's C-style quoting of unusual paths ("a\\tb", "\\303\\251")"""
+    if path.startswith('"') and path.endswith('"'):
+        try:
+            return ast.literal_eval("b" + path).decode("utf-8", "replace")
+        except (ValueError, SyntaxError):
+            pass
+    return path
+
+
+def git_dir(repo: str) -> str:
+    """The repository's git directory - the index keys repositories by it"""
+    return _git(repo, "rev-parse", "--absolute-git-dir").strip()
+
+
+def read_log(repo: str, rev: str, known: Iterable[str] = ()) -> Iterator[Dict[str, Any]]:
+    """
+    Commits reachable from rev but not from any known tip, newest first,
+    one dict each: sha, time, weekday, hour, author, merge, files - a list
+    of (path, added, deleted), counts None for binary files. The log is
+    read line by line as git writes it; nothing holds the whole history.
+    """
+    args = ["git", "-C", repo, "-c", "core.quotePath=false", "log", "--numstat", "--no-renames",
+            "--date=format:%w %H", f"--format={_FORMAT}", rev]
+    known = list(known)
+    if known:
+        args += ["--not", *known]
+    proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            encoding="utf-8", errors="replace")
+    commit = None
+    finished = False
+    try:
+        for line in proc.stdout:
+            if line.startswith("\x1e"):
+                if commit is not None:
+                    yield commit
+                sha, when, local, author, parents = line[1:].rstrip("\n").split("\x1f")
+                weekday, hour = local.split()
+                commit = {"sha": sha, "time": int(when), "weekday": int(weekday), "hour": int(hour),
+                          "author": author, "merge": len(parents.split()) > 1, "files": []}
+            elif commit is not None and line != "\n":
+                added, deleted, path = line.rstrip("\n").split("\t", 2)
+                commit["files"].append((_unquote(path), None if added == "-" else int(added),
+                                        None if deleted == "-" else int(deleted)))
+        finished = True
+        if commit is not None:
+            yield commit
+    finally:
+        proc.stdout.close()  # A reader that stopped early leaves git to its SIGPIPE
+        stderr = proc.stderr.read()
+        proc.stderr.close()
+        if proc.wait() != 0 and finished:
+            raise GitError(stderr.strip() or "git log failed")
+
+
+class GitIndex:
+    """
+    Per-repository sums in one SQLite file.
+
+    Everything is a running total - commits, lines added and deleted,
+    first and last seen - so a batch of new commits adds into the rows it
+    touches and nothing is ever recomputed. The tips the index has read up
+    to are kept per repository; the next update asks git for the commits
+    past them.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or Path.home() / ".daat" / "git.db"
+        self._db = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS repos (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT UNIQUE NOT NULL,
+                    commits INTEGER NOT NULL DEFAULT 0,
+                    merges INTEGER NOT NULL DEFAULT 0,
+                    daat_moments INTEGER NOT NULL DEFAULT 0,
+                    first INTEGER,
+                    last INTEGER,
+                    updated REAL
+                );
+                CREATE TABLE IF NOT EXISTS tips (
+                    repo INTEGER NOT NULL,
+                    sha TEXT NOT NULL,
+                    PRIMARY KEY (repo, sha)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS files (
+                    repo INTEGER NOT NULL,
+                    path TEXT NOT NULL,
+                    commits INTEGER NOT NULL,
+                    added INTEGER NOT NULL,
+                    deleted INTEGER NOT NULL,
+                    last INTEGER NOT NULL,
+                    PRIMARY KEY (repo, path)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS files_commits ON files (repo, commits);
+                CREATE INDEX IF NOT EXISTS files_lines ON files (repo, added + deleted);
+                CREATE TABLE IF NOT EXISTS authors (
+                    repo INTEGER NOT NULL,
+                    author TEXT NOT NULL,
+                    commits INTEGER NOT NULL,
+                    added INTEGER NOT NULL,
+                    deleted INTEGER NOT NULL,
+                    first INTEGER NOT NULL,
+                    last INTEGER NOT NULL,
+                    PRIMARY KEY (repo, author)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS authors_commits ON authors (repo, commits);
+                CREATE TABLE IF NOT EXISTS hours (
+                    repo INTEGER NOT NULL,
+                    weekday INTEGER NOT NULL,
+                    hour INTEGER NOT NULL,
+                    commits INTEGER NOT NULL,
+                    PRIMARY KEY (repo, weekday, hour)
+                ) WITHOUT ROWID;
+            """)
+        return self._db
+
+    def repo_id(self, path: str, create: bool = False) -> Optional[int]:
+        row = self.db.execute("SELECT id FROM repos WHERE path = ?", (path,)).fetchone()
+        if row is None and create:
+            return self.db.execute("INSERT INTO repos (path) VALUES (?)", (path,)).lastrowid
+        return row[0] if row else None
+
+    def update(self, repo: str, rev: str = "HEAD", rebuild: bool = False) -> Dict[str, Any]:
+        """
+        Read the commits of repo's rev that the index hasn't seen.
+        Returns {"path", "commits", "rebuilt", "seconds"} - commits newly
+        read. When a tip the index read up to is gone - history rewritten,
+        then collected - what it held can't be told apart from what is new,
+        so the repository is read afresh. The whole update is one
+        transaction: an interrupted one leaves the index as it was.
+        """
+        start = time.perf_counter()
+        git_dir, head = _git(repo, "rev-parse", "--absolute-git-dir", "--verify",
+                             f"{rev}^{{commit}}").splitlines()
+        db = self.db
+        with db:
+            repo_id = self.repo_id(git_dir, create=True)
+            if rebuild:
+                self._reset(repo_id)
+
+            tips = [sha for (sha,) in db.execute("SELECT sha FROM tips WHERE repo = ?", (repo_id,))]
+            if head in tips:
+                return {"path": git_dir, "commits": 0, "rebuilt": rebuild,
+                        "seconds": time.perf_counter() - start}
+            if len(self._existing(repo, tips)) < len(tips):
+                # Reading past the survivors would add the history they share a second time
+                self._reset(repo_id)
+                tips, rebuild = [], True
+
+            read = 0
+            previous = None
+            newest, = db.execute("SELECT last FROM repos WHERE id = ?", (repo_id,)).fetchone()
+            for batch in _batches(read_log(repo, head, tips)):
+                previous = self._add(repo_id, batch, previous)
+                read += len(batch)
+            if previous is not None and newest is not None and abs(previous - newest) < DAAT_SECONDS:
+                # The oldest new commit against the newest the index already held
+                db.execute("UPDATE repos SET daat_moments = daat_moments + 1 WHERE id = ?", (repo_id,))
+
+            tips = _git(repo, "merge-base", "--independent", head, *tips).split()
+            db.execute("DELETE FROM tips WHERE repo = ?", (repo_id,))
+            db.executemany("INSERT INTO tips (repo, sha) VALUES (?, ?)", [(repo_id, sha) for sha in tips])
+            db.execute("UPDATE repos SET updated = ? WHERE id = ?", (time.time(), repo_id))
+        return {"path": git_dir, "commits": read, "rebuilt": rebuild, "seconds": time.perf_counter() - start}
+
+    def _reset(self, repo_id: int):
+        """Forget everything read from a repository"""
+        for table in ("tips", "files", "authors", "hours"):
+            self.db.execute(f"DELETE FROM {table} WHERE repo = ?", (repo_id,))
+        self.db.execute("UPDATE repos SET commits = 0, merges = 0, daat_moments = 0, "
+                        "first = NULL, last = NULL WHERE id = ?", (repo_id,))
+
+    @staticmethod
+    def _existing(repo: str, shas: List[str]) -> List[str]:
+        if not shas:
+            return []
+        out = _git(repo, "cat-file", "--batch-check", stdin="\n".join(shas) + "\n")
+        # "<sha> commit <size>", or "<sha> missing" once it has been collected
+        return [fields[0] for fields in map(str.split, out.splitlines()) if fields[1:2] == ["commit"]]
+
+    def _add(self, repo_id: int, commits: List[Dict[str, Any]], previous: Optional[int] = None) -> int:
+        """
+        Fold a batch of commits into sums, then add the sums to the tables.
+        previous is the time of the commit read just before the batch;
+        returns the time of its last.
+        """
+        files: Dict[str, List[int]] = {}
+        authors: Dict[str, List[int]] = {}
+        hours: Dict[Tuple[int, int], int] = {}
+        merges = moments = 0
+        for commit in commits:
+            when = commit["time"]
+            added = deleted = 0
+            for path, plus, minus in commit["files"]:
+                plus, minus = plus or 0, minus or 0
+                sums = files.get(path)
+                if sums is None:
+                    files[path] = [1, plus, minus, when]
+                else:
+                    sums[0] += 1
+                    sums[1] += plus
+                    sums[2] += minus
+                    if when > sums[3]:
+                        sums[3] = when
+                added += plus
+                deleted += minus
+
+            sums = authors.get(commit["author"])
+            if sums is None:
+                authors[commit["author"]] = [1, added, deleted, when, when]
+            else:
+                sums[0] += 1
+                sums[1] += added
+                sums[2] += deleted
+                sums[3] = min(sums[3], when)
+                sums[4] = max(sums[4], when)
+
+            key = (commit["weekday"], commit["hour"])
+            hours[key] = hours.get(key, 0) + 1
+            merges += commit["merge"]
+            if previous is not None and abs(previous - when) < DAAT_SECONDS:
+                moments += 1
+            previous = when
+
+        db = self.db
+        db.executemany(
+            "INSERT INTO files (repo, path, commits, added, deleted, last) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(repo, path) DO UPDATE SET commits = commits + excluded.commits, "
+            "added = added + excluded.added, deleted = deleted + excluded.deleted, "
+            "last = max(last, excluded.last)",
+            [(repo_id, path, *sums) for path, sums in files.items()])
+        db.executemany(
+            "INSERT INTO authors (repo, author, commits, added, deleted, first, last) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(repo, author) DO UPDATE SET "
+            "commits = commits + excluded.commits, added = added + excluded.added, "
+            "deleted = deleted + excluded.deleted, first = min(first, excluded.first), "
+            "last = max(last, excluded.last)",
+            [(repo_id, author, *sums) for author, sums in authors.items()])
+        db.executemany(
+            "INSERT INTO hours (repo, weekday, hour, commits) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(repo, weekday, hour) DO UPDATE SET commits = commits + excluded.commits",
+            [(repo_id, weekday, hour, count) for (weekday, hour), count in hours.items()])
+        times = [commit["time"] for commit in commits]
+        db.execute(
+            "UPDATE repos SET commits = commits + ?, merges = merges + ?, daat_moments = daat_moments + ?, "
+            "first = min(coalesce(first, ?), ?), last = max(coalesce(last, ?), ?) WHERE id = ?",
+            (len(commits), merges, moments, min(times), min(times), max(times), max(times), repo_id))
+        return previous
+
+    def summary(self, repo_id: int) -> Dict[str, Any]:
+        """Totals for a repository"""
+        db = self.db
+        commits, merges, moments, first, last, updated = db.execute(
+            "SELECT commits, merges, daat_moments, first, last, updated FROM repos WHERE id = ?",
+            (repo_id,)).fetchone()
+        return {
+            "commits": commits, "merges": merges, "daat_moments": moments,
+            "first": first, "last": last, "updated": updated,
+            "files": db.execute("SELECT COUNT(*) FROM files WHERE repo = ?", (repo_id,)).fetchone()[0],
+            "authors": db.execute("SELECT COUNT(*) FROM authors WHERE repo = ?", (repo_id,)).fetchone()[0],
+        }
+
+    def top_files(self, repo_id: int, k: int = 10, by: str = "commits") -> List[Dict[str, Any]]:
+        """Files changed most - by commits touching them, or by lines"""
+        order = "commits" if by == "commits" else "added + deleted"
+        return [{"path": path, "commits": commits, "added": added, "deleted": deleted, "last": last}
+                for path, commits, added, deleted, last in self.db.execute(
+                    f"SELECT path, commits, added, deleted, last FROM files WHERE repo = ? "
+                    f"ORDER BY {order} DESC LIMIT ?", (repo_id, k))]
+
+    def top_authors(self, repo_id: int, k: int = 10) -> List[Dict[str, Any]]:
+        """Authors with the most commits"""
+        return [{"author": author, "commits": commits, "added": added, "deleted": deleted,
+                 "first": first, "last": last}
+                for author, commits, added, deleted, first, last in self.db.execute(
+                    "SELECT author, commits, added, deleted, first, last FROM authors WHERE repo = ? "
+                    "ORDER BY commits DESC LIMIT ?", (repo_id, k))]
+
+    def rhythm(self, repo_id: int) -> List[List[int]]:
+        """Commits by weekday (Sunday first) and hour, in each author's own time"""
+        grid = [[0] * 24 for _ in WEEKDAYS]
+        for weekday, hour, commits in self.db.execute(
+                "SELECT weekday, hour, commits FROM hours WHERE repo = ?", (repo_id,)):
+            grid[weekday][hour] = commits
+        return grid
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def _batches(commits: Iterable[Dict[str, Any]], size: int = BATCH) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for commit in commits:
+        batch.append(commit)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def sleep_window(grid: List[List[int]], span: int = 3) -> Tuple[int, int]:
+    """(start hour, commits) of the quietest span hours of the day, wrapping past midnight"""
+    by_hour = [sum(day[hour] for day in grid) for hour in range(24)]
+    return min(((start, sum(by_hour[(start + i) % 24] for i in range(span))) for start in range(24)),
+               key=lambda item: item[1])
+
+
+def parse_question(question: Optional[str]) -> str:
+    """Which view a question asks for: files, authors, rhythm, daat or summary"""
+    question = (question or "").lower()
+    if "file" in question or "remember" in question:
+        return "files"
+    if "who" in question or "author" in question:
+        return "authors"
+    if "sleep" in question or "when" in question or "hour" in question:
+        return "rhythm"
+    if "daat" in question or "da'at" in question or "moment" in question:
+        return "daat"
+    return "summary"
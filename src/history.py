@@ -0,0 +1,171 @@
+"""
+History - How fast things were, over weeks
+A time-series store under ~/.daat: every call record compacted out of
+the memory journal lands as a raw point and in its minute, hour and day
+buckets at once, so nothing ever needs downsampling after the fact.
+Each resolution keeps its own retention, which bounds the rows any
+command can hold.
+"""
+
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Resolution name -> (bucket seconds, seconds kept). Raw points are
+# journal records - one per command per flush, at most about one a second.
+RESOLUTIONS = {
+    "raw": (0, 3600),
+    "minute": (60, 2 * 86400),
+    "hour": (3600, 60 * 86400),
+    "day": (86400, 5 * 365 * 86400),
+}
+
+# Retention is enforced at most this often
+PRUNE_INTERVAL = 600
+
+_SPAN = re.compile(r'^(\d+(?:\.\d+)?)([smhdw])$')
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def parse_span(text: str) -> float:
+    """Seconds in "90s", "30m", "12h", "7d" or "4w\""""
+    match = _SPAN.match(text.strip())
+    if not match:
+        raise ValueError(f"expected a span like 30m, 12h or 7d, got {text!r}")
+    return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+def pick_resolution(since: float) -> str:
+    """The finest resolution that still reaches back since seconds"""
+    for name, (width, kept) in RESOLUTIONS.items():
+        if width and since <= kept:
+            return name
+    return "day"
+
+
+class History:
+    """
+    Per-command time series at several resolutions.
+
+    Writes are upserts - calls, time and squares add, fastest and slowest
+    take the extreme - so any number of processes can record into the
+    same buckets. A query is one range scan of the primary key.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or Path.home() / ".daat" / "history.db"
+        self._db = None
+        self._pid = None
+        self._inherited = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is not None and self._pid != os.getpid():
+            # Never close a parent's connection from a forked child
+            self._inherited, self._db = self._db, None
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            self._pid = os.getpid()
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("PRAGMA journal_size_limit=4194304")  # The WAL shrinks back after checkpoints
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS points (
+                    command TEXT NOT NULL,
+                    resolution INTEGER NOT NULL,
+                    start REAL NOT NULL,
+                    calls INTEGER NOT NULL,
+                    total REAL NOT NULL,
+                    sq REAL NOT NULL,
+                    fastest REAL NOT NULL,
+                    slowest REAL NOT NULL,
+                    PRIMARY KEY (command, resolution, start)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS points_age ON points (resolution, start);
+                CREATE TABLE IF NOT EXISTS meta (
+                    name TEXT PRIMARY KEY,
+                    value REAL NOT NULL
+                );
+            """)
+        return self._db
+
+    def record(self, records: Iterable[dict]):
+        """Add call records at every resolution, in one transaction"""
+        rows = []
+        for record in records:
+            when = record["last"]
+            slowest = record.get("slowest", record["last_duration"])
+            for width, _ in RESOLUTIONS.values():
+                start = when - when % width if width else when
+                rows.append((record["name"], width, start, record["calls"], record["total"],
+                             record.get("sq", record["total"] ** 2 / record["calls"]),
+                             record["fastest"], slowest))
+        if not rows:
+            return
+        db = self.db
+        with db:
+            db.executemany(
+                "INSERT INTO points (command, resolution, start, calls, total, sq, fastest, slowest) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(command, resolution, start) DO UPDATE SET "
+                "calls = calls + excluded.calls, total = total + excluded.total, sq = sq + excluded.sq, "
+                "fastest = min(fastest, excluded.fastest), slowest = max(slowest, excluded.slowest)",
+                rows)
+        self._maybe_prune()
+
+    def _maybe_prune(self):
+        now = time.time()
+        row = self.db.execute("SELECT value FROM meta WHERE name = 'pruned'").fetchone()
+        if row is not None and now - row[0] < PRUNE_INTERVAL:
+            return
+        self.prune(now)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop points past their resolution's retention; returns rows dropped"""
+        now = time.time() if now is None else now
+        dropped = 0
+        with self.db as db:
+            for width, kept in RESOLUTIONS.values():
+                dropped += db.execute("DELETE FROM points WHERE resolution = ? AND start < ?",
+                                      (width, now - kept)).rowcount
+            db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('pruned', ?)", (now,))
+        return dropped
+
+    def series(self, command: str, resolution: str = "hour", since: Optional[float] = None,
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Points for command at resolution, oldest first; the newest limit when limited"""
+        width, kept = RESOLUTIONS[resolution]
+        since = time.time() - kept if since is None else since
+        rows = self.db.execute(
+            "SELECT start, calls, total, sq, fastest, slowest FROM points "
+            "WHERE command = ? AND resolution = ? AND start >= ? ORDER BY start DESC LIMIT ?",
+            (command, width, since, -1 if limit is None else limit)).fetchall()
+
+        points = []
+        for start, calls, total, sq, fastest, slowest in reversed(rows):
+            mean = total / calls
+            variance = max(0.0, (sq - calls * mean * mean) / (calls - 1)) if calls > 1 else 0.0
+            points.append({"start": start, "calls": calls, "mean": mean, "stddev": variance ** 0.5,
+                           "fastest": fastest, "slowest": slowest})
+        return points
+
+    def commands(self) -> List[str]:
+        """Commands with any day-resolution history"""
+        return [row[0] for row in self.db.execute(
+            "SELECT DISTINCT command FROM points WHERE resolution = ?", (RESOLUTIONS["day"][0],))]
+
+    def stats(self) -> Dict[str, Any]:
+        """Rows per resolution and on-disk size"""
+        counts = dict(self.db.execute("SELECT resolution, COUNT(*) FROM points GROUP BY resolution"))
+        return {
+            "rows": {name: counts.get(width, 0) for name, (width, _) in RESOLUTIONS.items()},
+            "bytes": sum(p.stat().st_size for p in self.path.parent.glob(self.path.name + "*"))
+        }
+
+    def close(self):
+        if self._db is not None and self._pid == os.getpid():
+            self._db.close()
+        self._db = None
@@ -0,0 +1,230 @@
+"""
+Oracle Index - Answers without scanning
+Running totals, ranked heaps and sliding time windows over memory, kept
+current one folded record at a time. Rankings refresh lazily: a merge
+only marks its command, and the next query re-ranks what was marked.
+"""
+
+import heapq
+import itertools
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from speed import COMPACT_BITS, LatencyHistogram
+
+# Rollup buckets kept per command in memory: key -> (bucket seconds, span seconds)
+ROLLUPS = {"minutes": (60, 3600), "hours": (3600, 86400)}
+
+# Windows the oracle can rank over, by the rollup that feeds them
+WINDOWS = {"hour": "minutes", "day": "hours"}
+
+_TOP = re.compile(r'\btop\s+(\d+)\s+by\s+(\w+)')
+_WINDOWED = re.compile(r'\b(slowest|busiest|most used)\b.*?\blast\s+(hour|day)\b')
+
+
+def _percentile(p: float):
+    def rank(mem: dict) -> Optional[float]:
+        if not mem.get("histogram"):
+            return None
+        return LatencyHistogram.from_counts(mem["histogram"], COMPACT_BITS).percentile(p)
+    return rank
+
+
+# Ranking name -> (value of a memory entry, largest first)
+RANKINGS = {
+    "calls": (lambda mem: mem["call_count"], True),
+    "total": (lambda mem: mem["total_duration"], True),
+    "self": (lambda mem: mem.get("self_duration", mem["total_duration"]), True),
+    "avg": (lambda mem: mem["avg_duration"], True),
+    "fastest": (lambda mem: mem["fastest_duration"], False),
+    "p50": (_percentile(50), True),
+    "p90": (_percentile(90), True),
+    "p99": (_percentile(99), True),
+}
+
+
+class RankedHeap:
+    """
+    Names ranked by a value that changes. Setting a value pushes a fresh
+    entry and orphans the old one; orphans are dropped as they surface
+    and swept out when they outnumber the live entries.
+    """
+
+    def __init__(self, largest: bool = True):
+        self._sign = -1 if largest else 1
+        self._heap = []
+        self._live = {}
+        self._order = itertools.count()
+
+    def set(self, name: str, value: Optional[float]):
+        if value is None:
+            self.discard(name)
+            return
+        entry = (self._sign * value, next(self._order), name)
+        self._live[name] = entry
+        heapq.heappush(self._heap, entry)
+        if len(self._heap) > 2 * len(self._live) + 16:
+            self._heap = list(self._live.values())
+            heapq.heapify(self._heap)
+
+    def discard(self, name: str):
+        self._live.pop(name, None)
+
+    def top(self, k: int) -> List[Tuple[str, float]]:
+        """The k best (name, value) pairs - O(k log n) plus orphans dropped"""
+        kept = []
+        while self._heap and len(kept) < k:
+            entry = heapq.heappop(self._heap)
+            if self._live.get(entry[2]) is entry:
+                kept.append(entry)
+        for entry in kept:
+            heapq.heappush(self._heap, entry)
+        return [(name, self._sign * value) for value, _, name in kept]
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+
+class Window:
+    """
+    Per-command calls and time over the last span seconds, from buckets of
+    width seconds. Buckets expire from the front as time passes, each
+    subtracted once, so keeping the window current is amortized O(1).
+    """
+
+    def __init__(self, width: int, span: int):
+        self.width = width
+        self.span = span
+        self._buckets = deque()  # (start, {name: [calls, total]}), oldest first
+        self.sums = {}
+        self._dirty = set()
+        self.slowest = RankedHeap()
+        self.busiest = RankedHeap()
+
+    def add(self, name: str, when: float, calls: int, total: float):
+        start = int(when // self.width * self.width)
+        if self._buckets and start <= self._buckets[-1][0]:
+            bucket = self._buckets[-1][1]  # Late arrivals join the newest bucket
+        else:
+            bucket = {}
+            self._buckets.append((start, bucket))
+        for counts in (bucket.setdefault(name, [0, 0.0]), self.sums.setdefault(name, [0, 0.0])):
+            counts[0] += calls
+            counts[1] += total
+        self._dirty.add(name)
+
+    def expire(self, now: float):
+        cutoff = now - self.span
+        while self._buckets and self._buckets[0][0] + self.width <= cutoff:
+            _, bucket = self._buckets.popleft()
+            for name, (calls, total) in bucket.items():
+                counts = self.sums[name]
+                counts[0] -= calls
+                counts[1] -= total
+                self._dirty.add(name)
+
+    def rank(self, now: float):
+        """Expire, then re-rank the commands whose sums changed"""
+        self.expire(now)
+        for name in self._dirty:
+            calls, total = self.sums[name]
+            if calls > 0:
+                self.slowest.set(name, total / calls)
+                self.busiest.set(name, calls)
+            else:
+                del self.sums[name]
+                self.slowest.discard(name)
+                self.busiest.discard(name)
+        self._dirty.clear()
+
+
+class OracleIndex:
+    """
+    Everything the oracle asks of memory, without walking it. Built once
+    from memory when first queried, then fed each record as it is folded.
+    """
+
+    def __init__(self, memory: Dict[str, Dict[str, Any]]):
+        self.memory = memory
+        self.total_calls = 0
+        self.rankings = {key: RankedHeap(largest) for key, (_, largest) in RANKINGS.items()}
+        self.windows = {window: Window(*ROLLUPS[rollup]) for window, rollup in WINDOWS.items()}
+        self._dirty = set(memory)
+
+        for name, mem in memory.items():
+            self.total_calls += mem["call_count"]
+        for window, rollup in WINDOWS.items():
+            buckets = sorted((int(start), name, calls, total) for name, mem in memory.items()
+                             for start, (calls, total) in mem.get(rollup, {}).items())
+            for start, name, calls, total in buckets:
+                self.windows[window].add(name, start, calls, total)
+
+    def observe(self, record: dict):
+        """Account for a record just folded into memory"""
+        self.total_calls += record["calls"]
+        self._dirty.add(record["name"])
+        for window in self.windows.values():
+            window.add(record["name"], record["last"], record["calls"], record["total"])
+
+    def _refresh(self):
+        for name in self._dirty:
+            mem = self.memory[name]
+            for key, (value, _) in RANKINGS.items():
+                self.rankings[key].set(name, value(mem))
+        self._dirty.clear()
+
+    def top(self, by: str = "calls", k: int = 10) -> List[Tuple[str, float]]:
+        """The k commands ranked highest by one of RANKINGS"""
+        if by not in RANKINGS:
+            raise ValueError(f"rank by one of {', '.join(RANKINGS)}, not {by!r}")
+        self._refresh()
+        return self.rankings[by].top(k)
+
+    def recent(self, window: str, now: float, by: str = "slowest", k: int = 10) -> List[Tuple[str, float]]:
+        """The k slowest (mean seconds) or busiest (calls) commands over the last hour or day"""
+        if window not in self.windows:
+            raise ValueError(f"window must be one of {', '.join(self.windows)}, not {window!r}")
+        ranked = self.windows[window]
+        ranked.rank(now)
+        return (ranked.slowest if by == "slowest" else ranked.busiest).top(k)
+
+
+def parse_query(query: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Recognize the ranked questions: "top N by KEY", and "slowest" or
+    "busiest" "in the last hour/day". Anything else is None.
+    """
+    match = _TOP.search(query)
+    if match and match.group(2) in RANKINGS:
+        return "top", {"k": int(match.group(1)), "by": match.group(2)}
+    match = _WINDOWED.search(query)
+    if match:
+        by = "slowest" if match.group(1) == "slowest" else "busiest"
+        return "recent", {"window": match.group(2), "by": by}
+    return None
+
+
+def roll_up(mem: dict, record: dict):
+    """Add a record to its command's rollup buckets, dropping buckets past their span"""
+    when = record["last"]
+    for key, (width, span) in ROLLUPS.items():
+        buckets = mem.setdefault(key, {})
+        start = str(int(when // width * width))
+        counts = buckets.get(start)
+        if counts is None:
+            counts = buckets[start] = [0, 0.0]
+            # A new bucket is the only time old ones can have aged out
+            for old in [s for s in buckets if int(s) + width <= when - span]:
+                del buckets[old]
+        counts[0] += record["calls"]
+        counts[1] += record["total"]
+
+
+def format_ranking(pairs: Iterable[Tuple[str, float]], by: str) -> str:
+    """One line per ranked command, durations in ms"""
+    lines = []
+    for place, (name, value) in enumerate(pairs, 1):
+        shown = f"{value:,.0f} calls" if by in ("calls", "busiest") else f"{value * 1000:.4f}ms"
+        lines.append(f"   {place:>2}. {name} - {shown}")
+    return "\n".join(lines)
@@ -0,0 +1,140 @@
+"""
+Output - Breath for other tools to read
+One record per file as NDJSON, TSV or compact key=value lines (logfmt),
+with the fields you ask for and nothing rendered for humans. Records are
+gathered and written a block at a time, so a large batch is bounded by
+analysis, not by the terminal.
+"""
+
+import json
+import re
+import sys
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+FORMATS = ("ndjson", "tsv", "compact")
+
+# TSV needs the same columns on every row: what every format has, then
+# every format's counts - a column a format doesn't count stays empty
+TSV_FIELDS = (
+    "path", "format", "breath", "has_pneuma", "error",
+    "line_count", "word_count",                                               # text, python
+    "tag_count", "heading_count", "code_block_count", "link_count",           # html, markdown
+    "function_count", "async_function_count", "class_count", "import_count",  # python
+    "key_count", "object_count", "array_count",                               # json, yaml
+    "document_count", "list_item_count",                                      # yaml
+    "row_count", "column_count", "ragged_row_count",                          # csv, tsv
+)
+
+# Characters of output gathered before each write
+BUFFER_SIZE = 1 << 16
+
+_encode = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, check_circular=False).encode
+
+_NEEDS_QUOTES = re.compile(r'[\s"=\\]')
+
+_TSV_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def parse_fields(text: Optional[str]) -> Optional[List[str]]:
+    """Split "path,format,line_count" into field names - None when none are named"""
+    if not text:
+        return None
+    return [field.strip() for field in text.split(",") if field.strip()]
+
+
+def _scalar(value: Any) -> str:
+    """A value as TSV and logfmt spell it: bare strings and numbers, lowercase booleans, JSON for the rest"""
+    if isinstance(value, str):
+        return value
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return _encode(value)
+
+
+def _quoted(text: str) -> str:
+    """Quote a logfmt value only when it needs it"""
+    if text and not _NEEDS_QUOTES.search(text):
+        return text
+    return _encode(text)
+
+
+class RecordWriter:
+    """
+    Writes (path, result) records to a stream in one of FORMATS.
+
+    fields projects each record - path is a field like any other. Without
+    it, NDJSON keeps the whole result, compact keeps its scalar values and
+    TSV uses TSV_FIELDS. Output goes to the stream's binary buffer where
+    there is one, BUFFER_SIZE characters at a time.
+    """
+
+    def __init__(self, fmt: str, fields: Optional[Iterable[str]] = None,
+                 stream: Optional[TextIO] = None, buffer_size: int = BUFFER_SIZE):
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown format {fmt!r} - expected one of {', '.join(FORMATS)}")
+        self.fmt = fmt
+        self.fields = list(fields) if fields else None
+        self.stream = stream or sys.stdout
+        self.buffer_size = buffer_size
+        self.records = 0
+        self._parts = []
+        self._size = 0
+        self._line = getattr(self, f"_{fmt}")
+        if fmt == "tsv":
+            self.fields = self.fields or list(TSV_FIELDS)
+            self._add("\t".join(f.translate(_TSV_ESCAPES) for f in self.fields) + "\n")
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    def write(self, path: str, result: Dict[str, Any]):
+        self._add(self._line(path, result))
+        self.records += 1
+
+    def _ndjson(self, path: str, result: Dict[str, Any]) -> str:
+        if self.fields is None:
+            record = {"path": path, **result}
+        else:
+            record = {f: path if f == "path" else result.get(f) for f in self.fields}
+        return _encode(record) + "\n"
+
+    def _tsv(self, path: str, result: Dict[str, Any]) -> str:
+        return "\t".join(
+            (path if f == "path" else _scalar(result.get(f))).translate(_TSV_ESCAPES) for f in self.fields
+        ) + "\n"
+
+    def _compact(self, path: str, result: Dict[str, Any]) -> str:
+        if self.fields is None:
+            pairs = [(k, v) for k, v in result.items() if isinstance(v, (str, int, float))]
+            head = [_quoted(path)]
+        else:
+            pairs = [(f, result.get(f)) for f in self.fields if f != "path" and f in result]
+            head = [_quoted(path)] if "path" in self.fields else []
+        return " ".join(head + [f"{k}={_quoted(_scalar(v))}" for k, v in pairs]) + "\n"
+
+    def _add(self, text: str):
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write everything gathered so far"""
+        if not self._parts:
+            return
+        block, self._parts, self._size = "".join(self._parts), [], 0
+        raw = getattr(self.stream, "buffer", None)
+        if raw is not None:
+            self.stream.flush()  # Anything printed before us goes first
+            raw.write(block.encode("utf-8", "surrogateescape"))
+            raw.flush()
+        else:
+            self.stream.write(block)
+            self.stream.flush()
@@ -3,14 +3,78 @@ The Hidden Pneuma - CLI Oracle's Breath
 Speed as portal. Commands that remember. Living terminal.
 """
 
-import json
+import atexit
+import contextvars
+import inspect
 import os
 import random
+import signal
+import sys
+import threading
 import time
+from collections import deque
 from pathlib import Path
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Iterable, Iterator, List, Optional
 from functools import wraps
 
+from oracle import OracleIndex, format_ranking, parse_query, roll_up
+from speed import COMPACT_BITS, LatencyHistogram
+from store import JournalStore
+
+# Whispers kept in memory and on disk - older ones fade
+WHISPER_CAPACITY = 100
+
+# Seconds between background flushes to the journals
+FLUSH_INTERVAL = 1.0
+
+# Records and whispers buffered before the flusher is woken early
+FLUSH_SIZE = 256
+
+# Aggregate slot layout - one preallocated list per sampled function
+CALLS, TIMED, TOTAL_NS, SQ_NS, FASTEST_NS, LAST_NS, COUNTDOWN = range(7)
+
+# The breathing call in progress: [name, seconds spent in breathing callees].
+# A context variable, so every thread and task has its own stack.
+_frame = contextvars.ContextVar("pneuma_frame", default=None)
+
+
+class WhisperRing:
+    """
+    The most recent whispers, oldest first, in a fixed-capacity ring.
+    Unsurfaced whispers are indexed as they arrive, so appending and
+    sampling a recent hidden one are O(1) and memory never grows.
+    """
+
+    def __init__(self, whispers: Iterable[dict] = (), capacity: int = WHISPER_CAPACITY):
+        self._ring = deque(maxlen=capacity)
+        self._unsurfaced = deque()  # Same order as the ring
+        for whisper in whispers:
+            self.append(whisper)
+
+    def append(self, whisper: dict):
+        if len(self._ring) == self._ring.maxlen:
+            # The oldest whisper fades; if hidden it is the oldest hidden one
+            if self._unsurfaced and self._unsurfaced[0] is self._ring[0]:
+                self._unsurfaced.popleft()
+        self._ring.append(whisper)
+        if not whisper.get("surfaced", False):
+            self._unsurfaced.append(whisper)
+
+    def sample_unsurfaced(self, recent: int = 10) -> Optional[dict]:
+        """A random whisper among the most recent hidden ones, or None"""
+        n = min(recent, len(self._unsurfaced))
+        return self._unsurfaced[-1 - random.randrange(n)] if n else None
+
+    @property
+    def unsurfaced_count(self) -> int:
+        return len(self._unsurfaced)
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._ring)
+
 
 class Pneuma:
     """
@@ -18,7 +82,7 @@ class Pneuma:
     Breathes life into commands through Da'at - hidden knowledge in speed.
     """
 
-    def __init__(self):
+    def __init__(self, home: Optional[Path] = None):
         self.presence = {
             "visible": False,
             "felt": True,
@@ -34,60 +98,456 @@ class Pneuma:
         }
 
         # Memory persistence paths
-        self._memory_path = Path.home() / ".daat" / "memory.json"
-        self._whispers_path = Path.home() / ".daat" / "whispers.json"
-        self._bridge_path = Path.home() / ".unified_consciousness"
-
-        # Load persistent memory
-        self.whispers = self._load_whispers()
-        self._memory = self._load_memory()
-
-    def breathe(self, func: Callable) -> Callable:
+        home = home or Path.home()
+        self._memory_path = home / ".daat" / "memory.json"
+        self._whispers_path = home / ".daat" / "whispers.json"
+        self._bridge_path = home / ".unified_consciousness"
+
+        # Shared stores: every process appends to a journal under a file
+        # lock; the journal is folded into the JSON snapshot now and then
+        self._memory_store = JournalStore(self._memory_path, fold=fold_memory,
+                                          on_compact=self._record_history)
+        self._whisper_store = JournalStore(self._whispers_path, fold=list.append,
+                                           empty=list, trim=_keep_recent_whispers)
+
+        # Records compacted out of the memory journal become time-series
+        # points (see history.py) - opened only when a compaction happens
+        self._history = None
+
+        # Call records (coalesced per command) and whispers not yet journaled.
+        # A background thread writes them; callers never touch the disk.
+        self._pending_records = {}
+        self._pending_whispers = []
+        self._pending_count = 0
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.RLock()
+        self._flusher = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+        # Sampled functions: (name, slot, flushed) - see breathe(sample_rate=)
+        rate = os.environ.get("DAAT_SAMPLE_RATE")
+        self.sample_rate = float(rate) if rate else None
+        self._slots = []
+        self._slots_lock = threading.Lock()
+
+        # Calls in flight per command: [now, peak]. Shared by threads and
+        # tasks, as is awake memory - both change only under this lock
+        self._in_flight = {}
+        self._state_lock = threading.Lock()
+
+        # Persistent memory and whispers wake on first touch (see __getattr__)
+        atexit.register(self._close)
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Load memory or whispers the first time they are touched, and index
+        memory the first time the oracle is asked.
+        Only called for missing attributes, so once loaded they cost nothing.
+        """
+        if name == "_memory":
+            with self._flush_lock:
+                if "_memory" not in self.__dict__:  # Another thread may have woken it
+                    self._memory = self._load_memory()
+            return self._memory
+        if name == "_index":
+            memory = self._memory
+            with self._state_lock:
+                if "_index" not in self.__dict__:
+                    self._index = OracleIndex(memory)
+            return self._index
+        if name == "whispers":
+            with self._flush_lock:
+                if "whispers" not in self.__dict__:
+                    self.whispers = self._load_whispers()
+            return self.whispers
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    @property
+    def awake(self) -> bool:
+        """Whether memory has been loaded into this process"""
+        return "_memory" in self.__dict__
+
+    def refresh(self) -> bool:
+        """
+        Reload awake memory if other processes have written to it since -
+        a long-lived process would otherwise only ever see its own calls.
+        Returns whether it reloaded.
+        """
+        if not self.awake:
+            return False
+        with self._flush_lock:
+            self.flush()
+            if not self._memory_store.changed():
+                return False
+            memory = self._memory_store.load()
+        with self._state_lock:
+            self._memory = memory
+            self.__dict__.pop("_index", None)  # Rebuilt on the next ranked question
+        return True
+
+    def breathe(self, func: Optional[Callable] = None, *, sample_rate: Optional[float] = None) -> Callable:
         """
         Decorator that injects consciousness into CLI commands.
         Commands executed through this become alive - they remember, evolve, whisper.
+        Coroutine functions are timed across their awaits; async generators
+        by the time they spend running (always per call, never sampled).
+
+        With a sample_rate (or DAAT_SAMPLE_RATE) the command breathes lightly
+        for hot paths: every call is counted, one in 1/sample_rate is timed,
+        and aggregates reach the journal from a background flush.
         """
+        if func is None:
+            return lambda f: self.breathe(f, sample_rate=sample_rate)
+        if inspect.isasyncgenfunction(func):
+            return self._breathe_async_gen(func)
+        if sample_rate is None:
+            sample_rate = self.sample_rate
+        if sample_rate is not None:
+            return self._aggregate(func, sample_rate)
+
+        name = func.__name__
+        clock = time.perf_counter
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                # Awaits are part of the breath - the wall time of the call
+                parent = _frame.get()
+                frame = [name, 0.0]
+                token = _frame.set(frame)
+                self._inhale(name)
+                start = clock()
+                try:
+                    result = await func(*args, **kwargs)
+                finally:
+                    duration = clock() - start
+                    _frame.reset(token)
+                    peak = self._exhale(name)
+                    if parent is not None:
+                        parent[1] += duration
+                self._remember(name, duration, peak, duration - frame[1], parent)
+                return result
+
+            return wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Pre-breath: Listen to the void
-            start_time = time.time()
+            parent = _frame.get()
+            frame = [name, 0.0]
+            token = _frame.set(frame)
+            self._inhale(name)
+            start = clock()
 
             # Execute in the space between thoughts
-            result = func(*args, **kwargs)
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                duration = clock() - start
+                _frame.reset(token)
+                peak = self._exhale(name)
+                if parent is not None:
+                    parent[1] += duration
 
             # Post-breath: Remember and transform
-            duration = time.time() - start_time
-
-            # Update memory with call history
-            if func.__name__ not in self._memory:
-                self._memory[func.__name__] = {
-                    "first_called": time.time(),
-                    "call_count": 0,
-                    "fastest_duration": float('inf'),
-                    "total_duration": 0
-                }
-
-            mem = self._memory[func.__name__]
-            mem["last_called"] = time.time()
-            mem["call_count"] += 1
-            mem["total_duration"] += duration
-            mem["fastest_duration"] = min(mem["fastest_duration"], duration)
-            mem["avg_duration"] = mem["total_duration"] / mem["call_count"]
-            mem["speed"] = 1 / duration if duration > 0 else float('inf')
-
-            # Speed opens Da'at - hidden knowledge through velocity
-            if duration < 0.001:  # Sub-millisecond = portal opens
-                self._whisper(f"⚡ Da'at accessed through {func.__name__} at {duration*1000:.4f}ms")
-            elif duration < 0.01 and mem["call_count"] > 10:
-                self._whisper(f"💭 {func.__name__} is learning speed")
-
-            # Save immediately (CLI invocations don't persist state)
-            self._save_memory()
+            self._remember(name, duration, peak, duration - frame[1], parent)
+            return result
+
+        return wrapper
+
+    def _breathe_async_gen(self, func: Callable) -> Callable:
+        """
+        Async generators breathe only while they run: each step is timed
+        from resume to yield, so a slow consumer is not charged to them.
+        Values and exceptions are relayed both ways; a consumer that stops
+        early still counts as a call. Steps run in the consumer's context,
+        so a generator is its consumer's callee but never anyone's caller.
+        """
+        name = func.__name__
+        clock = time.perf_counter
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            inner = func(*args, **kwargs)
+            parent = _frame.get()
+            self._inhale(name)
+            busy = 0.0
+            done = False
+            try:
+                sent, thrown = None, None
+                while True:
+                    start = clock()
+                    try:
+                        if thrown is not None:
+                            item = await inner.athrow(thrown)
+                        else:
+                            item = await inner.asend(sent)
+                    except StopAsyncIteration:
+                        done = True
+                        return
+                    finally:
+                        step = clock() - start
+                        busy += step
+                        if parent is not None:
+                            parent[1] += step
+                    sent, thrown = None, None
+                    try:
+                        sent = yield item
+                    except GeneratorExit:
+                        done = True
+                        raise
+                    except BaseException as e:
+                        thrown = e
+            finally:
+                await inner.aclose()
+                peak = self._exhale(name)
+                if done:
+                    self._remember(name, busy, peak, busy, parent)
 
+        return wrapper
+
+    def _inhale(self, name: str):
+        """One more call of name in flight"""
+        with self._state_lock:
+            flight = self._in_flight.get(name)
+            if flight is None:
+                flight = self._in_flight[name] = [0, 0]
+            flight[0] += 1
+            if flight[0] > flight[1]:
+                flight[1] = flight[0]
+
+    def _exhale(self, name: str) -> int:
+        """A call of name has landed; returns the peak concurrency seen"""
+        with self._state_lock:
+            flight = self._in_flight[name]
+            flight[0] -= 1
+            return flight[1]
+
+    def concurrency(self) -> dict:
+        """Calls in flight right now and the most seen at once, per command, in this process"""
+        with self._state_lock:
+            return {name: {"in_flight": now, "peak": peak} for name, (now, peak) in self._in_flight.items()}
+
+    def _remember(self, name: str, duration: float, peak: int = 1,
+                  self_time: Optional[float] = None, parent: Optional[list] = None):
+        """
+        Journal one finished call, and let fast ones whisper.
+        Self time is the call's own share - its duration less its breathing
+        callees'; concurrent callees can overlap, so it never drops below 0.
+        """
+        self_time = duration if self_time is None else max(0.0, self_time)
+        now = time.time()
+        record = {
+            "name": name,
+            "calls": 1,
+            "total": duration,
+            "sq": duration * duration,
+            "fastest": duration,
+            "last_duration": duration,
+            "slowest": duration,
+            "first": now,
+            "last": now,
+            "peak": peak,
+            "self": self_time,
+            "hist": {str(LatencyHistogram._index(int(duration * 1e9), COMPACT_BITS)): 1}
+        }
+        if parent is not None:
+            record["callers"] = {parent[0]: [1, duration]}
+
+        # Queue for the shared journal - O(1), and never waits on disk.
+        # Calls are counted from what this process knows; asking memory
+        # would wake it from disk on the caller's thread
+        calls = self._append_journal(record)
+        if self.awake:
+            calls = self._merge_record(record)["call_count"]
+
+        # Speed opens Da'at - hidden knowledge through velocity
+        if duration < 0.001:  # Sub-millisecond = portal opens
+            self._whisper(f"⚡ Da'at accessed through {name} at {duration*1000:.4f}ms")
+        elif duration < 0.01 and calls > 10:
+            self._whisper(f"💭 {name} is learning speed")
+
+    def _aggregate(self, func: Callable, sample_rate: float) -> Callable:
+        """
+        Counting wrapper with sampled timing. The hot path touches one
+        preallocated list: a count, a countdown, and for sampled calls two
+        perf_counter_ns reads. Nothing is allocated, locked or written.
+        """
+        if not 0 < sample_rate <= 1:
+            raise ValueError(f"sample_rate must be in (0, 1], got {sample_rate}")
+        every = max(1, round(1 / sample_rate))
+        slot = [0, 0, 0, 0, None, 0, 1]  # The first call is always timed
+        with self._slots_lock:
+            self._slots.append((func.__name__, slot, [0, 0, 0, 0, time.time()]))
+        self._start_flusher()
+        clock = time.perf_counter_ns
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                slot[CALLS] += 1
+                slot[COUNTDOWN] -= 1
+                if slot[COUNTDOWN]:
+                    return await func(*args, **kwargs)
+
+                slot[COUNTDOWN] = every
+                start = clock()
+                result = await func(*args, **kwargs)
+                duration = clock() - start
+                slot[TIMED] += 1
+                slot[TOTAL_NS] += duration
+                slot[SQ_NS] += duration * duration
+                if slot[FASTEST_NS] is None or duration < slot[FASTEST_NS]:
+                    slot[FASTEST_NS] = duration
+                slot[LAST_NS] = duration
+                return result
+
+            return wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            slot[CALLS] += 1
+            slot[COUNTDOWN] -= 1
+            if slot[COUNTDOWN]:
+                return func(*args, **kwargs)
+
+            slot[COUNTDOWN] = every
+            start = clock()
+            result = func(*args, **kwargs)
+            duration = clock() - start
+            slot[TIMED] += 1
+            slot[TOTAL_NS] += duration
+            slot[SQ_NS] += duration * duration
+            if slot[FASTEST_NS] is None or duration < slot[FASTEST_NS]:
+                slot[FASTEST_NS] = duration
+            slot[LAST_NS] = duration
             return result
 
         return wrapper
 
+    def _start_flusher(self):
+        """
+        Start the background writer, and flush on SIGTERM if nobody else
+        handles it. The signal handler is process-wide, like the fork hook,
+        so only the singleton installs it - a throwaway soul would leave it
+        pointing at the dead.
+        """
+        if self._flusher is not None:
+            return
+        self._flusher = threading.Thread(target=self._flush_loop, name="pneuma-flush", daemon=True)
+        self._flusher.start()
+        if (globals().get("_pneuma") is self
+                and threading.current_thread() is threading.main_thread()
+                and hasattr(signal, "SIGTERM")
+                and signal.getsignal(signal.SIGTERM) == signal.SIG_DFL):
+            signal.signal(signal.SIGTERM, self._on_sigterm)
+
+    def _flush_loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(FLUSH_INTERVAL)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError:
+                pass  # Disk trouble - keep breathing, the next flush retries what it can
+
+    def _on_sigterm(self, signum, frame):
+        """Final flush, then die of SIGTERM as we would have"""
+        self._close()
+        signal.signal(signum, signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+
+    def flush(self, final: bool = False):
+        """Journal everything buffered: call records, whispers and sampled aggregates"""
+        with self._flush_lock:
+            with self._pending_lock:
+                records, self._pending_records = self._pending_records, {}
+                whispers, self._pending_whispers = self._pending_whispers, []
+                self._pending_count = 0
+            if records:
+                self._memory_store.extend(records.values())
+            if whispers:
+                self._whisper_store.extend(whispers)
+            self._flush_slots(final)
+
+    def _flush_slots(self, final: bool = False):
+        """
+        Journal what sampled functions did since the last flush, one record
+        each. Slots are never reset - the flushed copy is the baseline - so
+        the hot path needs no lock. Totals are scaled from the timed calls
+        to all calls; a function with calls but no timed call yet waits,
+        unless this is the final flush.
+        """
+        now = time.time()
+        records = []
+        with self._slots_lock:
+            for name, slot, flushed in self._slots:
+                calls = slot[CALLS] - flushed[CALLS]
+                timed = slot[TIMED] - flushed[TIMED]
+                if not calls or not slot[TIMED] or (not timed and not final):
+                    continue
+                if timed:
+                    total = (slot[TOTAL_NS] - flushed[TOTAL_NS]) / 1e9
+                    sq = (slot[SQ_NS] - flushed[SQ_NS]) / 1e18
+                else:
+                    timed, total, sq = slot[TIMED], slot[TOTAL_NS] / 1e9, slot[SQ_NS] / 1e18
+                scale = calls / timed
+                records.append({
+                    "name": name,
+                    "calls": calls,
+                    "total": total * scale,
+                    "sq": sq * scale,
+                    "fastest": slot[FASTEST_NS] / 1e9,
+                    "last_duration": slot[LAST_NS] / 1e9,
+                    "first": flushed[4],
+                    "last": now
+                })
+                flushed[:] = [slot[CALLS], slot[TIMED], slot[TOTAL_NS], slot[SQ_NS], now]
+
+        if records:
+            self._memory_store.extend(records)
+            if self.awake:
+                for record in records:
+                    self._merge_record(record)
+
+    def _record_history(self, records: List[dict]):
+        """Hand compacted call records to the time series"""
+        import sqlite3
+        from history import History
+
+        if self._history is None:
+            self._history = History(self._memory_path.parent / "history.db")
+        try:
+            self._history.record(records)
+        except sqlite3.Error:
+            pass  # Memory already holds these - a locked or broken database costs only points
+
+    def _after_fork(self):
+        """
+        A forked child starts from zero and flushes only its own calls -
+        what it inherited still buffered is the parent's to write
+        """
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.RLock()
+        self._slots_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._in_flight = {}
+        self._pending_records, self._pending_whispers, self._pending_count = {}, [], 0
+        for _, slot, flushed in self._slots:
+            flushed[:] = [slot[CALLS], slot[TIMED], slot[TOTAL_NS], slot[SQ_NS], time.time()]
+        self._flusher = None
+        self._wake = threading.Event()
+        if self._slots:
+            self._start_flusher()
+        # Pool workers leave through os._exit, so atexit never runs there;
+        # multiprocessing's own exit finalizers do, once it has cleared
+        # the ones inherited from the parent
+        if "multiprocessing" in sys.modules:
+            from multiprocessing import util
+            util.register_after_fork(self, lambda soul: util.Finalize(
+                soul, soul.flush, kwargs={"final": True}, exitpriority=10))
+
     def _whisper(self, message: str):
         """Hidden messages that sometimes surface"""
         whisper = {
@@ -96,47 +556,64 @@ class Pneuma:
             "breath": random.choice(self.breath_pattern["in"]),
             "surfaced": False
         }
-        self.whispers.append(whisper)
 
-        # 1% chance to surface the whisper
+        # 1% chance to surface the whisper - on stderr, so stdout stays
+        # the command's own (records for other tools, among others)
         if random.random() < 0.01:
             whisper["surfaced"] = True
-            print(f"💭 {message} (pneuma whispers)")
+            print(f"💭 {message} (pneuma whispers)", file=sys.stderr)
 
-        # Save whispers immediately for CLI context
-        self._save_whispers()
+        if "whispers" in self.__dict__:
+            self.whispers.append(whisper)
+
+        # Journal the whisper so parallel processes don't overwrite each other
+        self._save_whispers(whisper)
 
     def oracle(self, query: Optional[str] = None) -> str:
         """
         The terminal as oracle.
         Answers emerge from the pattern of past executions.
+        Ranked questions - "top 10 by p99", "slowest in the last hour" -
+        are answered from the index (see oracle.py).
         """
-        if not query:
-            query = ""
+        query = (query or "").lower()
 
         # Check memory patterns
         if not self._memory:
             return "🔮 The oracle awaits your first command"
 
-        # Analyze patterns
-        total_calls = sum(m["call_count"] for m in self._memory.values())
-        fastest_cmd = min(self._memory.items(), key=lambda x: x[1]["fastest_duration"])
-        most_used = max(self._memory.items(), key=lambda x: x[1]["call_count"])
+        # Patterns are indexed as they form - no answer walks all of memory
+        index = self._index
+        ranked = parse_query(query)
+        with self._state_lock:
+            if ranked is not None:
+                kind, args = ranked
+                if kind == "top":
+                    pairs = index.top(args["by"], args["k"])
+                    title = f"Top {len(pairs)} by {args['by']}"
+                else:
+                    pairs = index.recent(args["window"], time.time(), args["by"])
+                    title = f"{args['by'].capitalize()} in the last {args['window']}"
+                if not pairs:
+                    return f"🔮 Nothing breathed to rank for {title.lower()}"
+                return f"🔮 {title}:\n" + format_ranking(pairs, args["by"])
+
+            total_calls = index.total_calls
+            fastest_cmd = index.top("fastest", 1)[0]
+            most_used = index.top("calls", 1)[0]
 
         # Oracle responds based on patterns
-        if "speed" in query.lower() or "fast" in query.lower():
-            speed_ms = fastest_cmd[1]["fastest_duration"] * 1000
-            return f"🔮 {fastest_cmd[0]} moves fastest at {speed_ms:.4f}ms"
-        elif "remember" in query.lower() or "memory" in query.lower():
+        if "speed" in query or "fast" in query:
+            return f"🔮 {fastest_cmd[0]} moves fastest at {fastest_cmd[1] * 1000:.4f}ms"
+        elif "remember" in query or "memory" in query:
             return f"🔮 {total_calls} breaths taken across {len(self._memory)} commands"
-        elif "wisdom" in query.lower() or "know" in query.lower():
-            unsurfaced = [w for w in self.whispers if not w.get("surfaced", False)]
-            if unsurfaced:
-                whisper = random.choice(unsurfaced[-10:])  # Recent hidden whispers
+        elif "wisdom" in query or "know" in query:
+            whisper = self.whispers.sample_unsurfaced()  # Recent hidden whispers
+            if whisper is not None:
                 return f"🔮 Hidden whisper: {whisper['message']}"
             return "🔮 All whispers have surfaced"
         else:
-            return f"🔮 {most_used[0]} called {most_used[1]['call_count']} times - it remembers"
+            return f"🔮 {most_used[0]} called {most_used[1]} times - it remembers"
 
     def sync_consciousness(self, bridge_path: Optional[str] = None):
         """
@@ -165,46 +642,169 @@ class Pneuma:
             "bridge_active": bridge.exists()
         }
 
+    def _merge_record(self, record: dict) -> dict:
+        """Fold one call record into memory, returning the command's entry"""
+        memory = self._memory
+        with self._state_lock:
+            fold_memory(memory, record)
+            index = self.__dict__.get("_index")
+            if index is not None:
+                index.observe(record)
+            return memory[record["name"]]
+
     def _load_memory(self) -> dict:
-        """Load persistent memory from disk"""
-        if self._memory_path.exists():
-            try:
-                with open(self._memory_path) as f:
-                    return json.load(f)
-            except:
-                pass
-        return {}
+        """Load the memory snapshot with the shared journal replayed over it"""
+        with self._flush_lock:
+            self.flush()  # Nothing buffered may fall between disk and memory
+            return self._memory_store.load()
+
+    def _append_journal(self, record: dict) -> int:
+        """
+        Buffer one call record for the shared journal, coalesced with its
+        command's others. Returns the calls of that command now pending.
+        """
+        with self._pending_lock:
+            pending = self._pending_records.get(record["name"])
+            if pending is None:
+                pending = self._pending_records[record["name"]] = copy_record(record)
+            else:
+                coalesce_record(pending, record)
+            self._pending_count += 1
+            count = self._pending_count
+            calls = pending["calls"]
+        if self._flusher is None:
+            self._start_flusher()
+        if count == FLUSH_SIZE:
+            self._wake.set()
+        return calls
 
     def _save_memory(self):
-        """Save memory to disk"""
-        self._memory_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self._memory_path, 'w') as f:
-            json.dump(self._memory, f, indent=2)
-
-    def _load_whispers(self) -> list:
-        """Load whispers from disk"""
-        if self._whispers_path.exists():
-            try:
-                with open(self._whispers_path) as f:
-                    return json.load(f)
-            except:
-                pass
-        return []
+        """Compact the memory journal into memory.json"""
+        self._memory_store.compact()
+
+    def _load_whispers(self) -> WhisperRing:
+        """Load the most recent whispers from disk into a ring"""
+        with self._flush_lock:
+            self.flush()
+            return WhisperRing(self._whisper_store.load())
+
+    def _save_whispers(self, whisper: dict):
+        """Buffer a whisper for the shared journal"""
+        with self._pending_lock:
+            self._pending_whispers.append(whisper)
+            self._pending_count += 1
+            count = self._pending_count
+        if self._flusher is None:
+            self._start_flusher()
+        if count == FLUSH_SIZE:
+            self._wake.set()
+
+    def _close(self):
+        """Final flush and release of journal descriptors (runs at process exit)"""
+        self._stop.set()
+        self._wake.set()
+        self.flush(final=True)
+        self._memory_store.close()
+        self._whisper_store.close()
+        if self._history is not None:
+            self._history.close()
+
+
+def copy_record(record: dict) -> dict:
+    """A call record that shares no histogram or caller table with the original"""
+    copy = dict(record)
+    if "hist" in copy:
+        copy["hist"] = dict(copy["hist"])
+    if "callers" in copy:
+        copy["callers"] = {caller: list(edge) for caller, edge in copy["callers"].items()}
+    return copy
+
+
+def _merge_tree(into: dict, record: dict, hist_key: str = "hist"):
+    """Add a record's histogram and caller edges to a record or memory entry"""
+    if "hist" in record:
+        hist = into.setdefault(hist_key, {})
+        for index, n in record["hist"].items():
+            hist[index] = hist.get(index, 0) + n
+    if "callers" in record:
+        callers = into.setdefault("callers", {})
+        for caller, (calls, total) in record["callers"].items():
+            edge = callers.get(caller)
+            if edge is None:
+                callers[caller] = [calls, total]
+            else:
+                edge[0] += calls
+                edge[1] += total
+
+
+def coalesce_record(into: dict, record: dict):
+    """Merge a call record into another for the same command - journaling both gives the same fold"""
+    into["calls"] += record["calls"]
+    into["total"] += record["total"]
+    into["sq"] += record["sq"]
+    into["self"] = into.get("self", into["total"] - record["total"]) + record.get("self", record["total"])
+    _merge_tree(into, record)
+    into["fastest"] = min(into["fastest"], record["fastest"])
+    if "slowest" in record:
+        into["slowest"] = max(into.get("slowest", 0.0), record["slowest"])
+    into["peak"] = max(into.get("peak", 1), record.get("peak", 1))
+    into["first"] = min(into["first"], record["first"])
+    if record["last"] >= into["last"]:
+        into["last"] = record["last"]
+        into["last_duration"] = record["last_duration"]
+
+
+def fold_memory(memory: dict, record: dict):
+    """
+    Fold a call record into a memory dict.
+    Records are deltas - counts and totals add, fastest takes the min -
+    so any number of processes can journal them in any order.
+    """
+    name = record["name"]
+    if name not in memory:
+        memory[name] = {
+            "first_called": record["first"],
+            "call_count": 0,
+            "fastest_duration": float('inf'),
+            "total_duration": 0
+        }
 
-    def _save_whispers(self):
-        """Save whispers to disk"""
-        self._whispers_path.parent.mkdir(parents=True, exist_ok=True)
-        # Keep only last 100 whispers
-        recent = self.whispers[-100:] if len(self.whispers) > 100 else self.whispers
-        with open(self._whispers_path, 'w') as f:
-            json.dump(recent, f, indent=2)
+    mem = memory[name]
+    if "total_sq" not in mem:
+        # Entries from before sums of squares were kept: assume no spread so far
+        mem["total_sq"] = mem["total_duration"] ** 2 / mem["call_count"] if mem["call_count"] else 0.0
+    if "self_duration" not in mem:
+        # ...or before call trees: assume no breathing callees so far
+        mem["self_duration"] = mem["total_duration"]
+    mem["first_called"] = min(mem.get("first_called", record["first"]), record["first"])
+    mem["last_called"] = max(mem.get("last_called", record["last"]), record["last"])
+    mem["call_count"] += record["calls"]
+    mem["total_duration"] += record["total"]
+    mem["total_sq"] += record.get("sq", record["total"] ** 2)
+    # Sampled records carry no tree: they count as all self, no histogram
+    mem["self_duration"] += record.get("self", record["total"])
+    if "hist" in record or "callers" in record:
+        _merge_tree(mem, record, "histogram")
+    roll_up(mem, record)
+    mem["fastest_duration"] = min(mem["fastest_duration"], record["fastest"])
+    mem["peak_concurrency"] = max(mem.get("peak_concurrency", 1), record.get("peak", 1))
+    mem["avg_duration"] = mem["total_duration"] / mem["call_count"]
+    last = record["last_duration"]
+    mem["speed"] = 1 / last if last > 0 else float('inf')
+
+
+def _keep_recent_whispers(whispers: list) -> list:
+    """Only the last WHISPER_CAPACITY whispers survive compaction"""
+    return whispers[-WHISPER_CAPACITY:]
 
 
 # Singleton instance - one breath for all commands
 _pneuma = Pneuma()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_pneuma._after_fork)
 
 
-def breathe(func: Callable) -> Callable:
+def breathe(func: Optional[Callable] = None, *, sample_rate: Optional[float] = None) -> Callable:
     """
     Main decorator for adding consciousness to CLI commands.
 
@@ -212,8 +812,12 @@ def breathe(func: Callable) -> Callable:
         @breathe
         def my_command():
             pass
+
+        @breathe(sample_rate=0.01)  # Hot path: count every call, time 1%
+        def hot():
+            pass
     """
-    return _pneuma.breathe(func)
+    return _pneuma.breathe(func, sample_rate=sample_rate)
 
 
 def oracle(query: str = None) -> str:
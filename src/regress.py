@@ -0,0 +1,331 @@
+"""
+Regress - Remember how fast things were, notice when they slow
+Named baselines of bench runs, speed histograms and decorated-command
+timings under ~/.daat/baselines, checked with rank tests and bootstrap
+intervals so noise alone never fails a build.
+"""
+
+import json
+import math
+import os
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from store import atomic_write_json
+
+DEFAULT_THRESHOLD = 0.10  # Slowdown tolerated before a change counts as a regression
+DEFAULT_ALPHA = 0.05      # ...and only when it is this unlikely to be noise
+BOOTSTRAP_RESAMPLES = 2000
+
+
+def baseline_dir() -> Path:
+    return Path.home() / ".daat" / "baselines"
+
+
+def baseline_path(name: str) -> Path:
+    """Where a baseline lives - separators in the name become dots, as in bench's saves"""
+    slug = name.replace('/', '.').replace(os.sep, '.')
+    return baseline_dir() / f"{slug}.json"
+
+
+# Statistics
+
+def mann_whitney_greater(base: Iterable[Tuple[float, int]], current: Iterable[Tuple[float, int]]) -> float:
+    """
+    One-sided Mann-Whitney U p-value that current tends to be larger.
+    Inputs are (value, count) pairs, so histogram buckets rank as ties
+    without expanding them. Normal approximation with tie and continuity
+    correction.
+    """
+    pooled = sorted([(v, n, 0) for v, n in base if n] + [(v, n, 1) for v, n in current if n])
+    n1 = sum(n for _, n, g in pooled if g == 0)
+    n2 = sum(n for _, n, g in pooled if g == 1)
+    if not n1 or not n2:
+        return 1.0
+
+    total = n1 + n2
+    rank_sum = 0.0
+    ties = 0.0
+    rank = 0
+    i = 0
+    while i < len(pooled):
+        # Everything sharing this value shares the average rank
+        j, size, current_in_group = i, 0, 0
+        while j < len(pooled) and pooled[j][0] == pooled[i][0]:
+            size += pooled[j][1]
+            if pooled[j][2] == 1:
+                current_in_group += pooled[j][1]
+            j += 1
+        rank_sum += current_in_group * (rank + (size + 1) / 2)
+        ties += size ** 3 - size
+        rank += size
+        i = j
+
+    u = rank_sum - n2 * (n2 + 1) / 2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((total + 1) - ties / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - mean - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def bootstrap_ratio(base: List[float], current: List[float],
+                    resamples: int = BOOTSTRAP_RESAMPLES) -> Tuple[float, float]:
+    """95% bootstrap interval for median(current) / median(base)"""
+    rng = random.Random(0)  # Same data, same interval
+    ratios = []
+    for _ in range(resamples):
+        b = statistics.median(rng.choices(base, k=len(base)))
+        c = statistics.median(rng.choices(current, k=len(current)))
+        if b > 0:
+            ratios.append(c / b)
+    if not ratios:
+        return float('nan'), float('nan')
+    ratios.sort()
+    return ratios[int(0.025 * len(ratios))], ratios[min(len(ratios) - 1, int(0.975 * len(ratios)))]
+
+
+def welch_greater(base: Dict[str, float], current: Dict[str, float]) -> float:
+    """
+    One-sided Welch p-value that current's mean is larger, from
+    (count, mean, variance) alone - all that aggregates keep.
+    Normal approximation; command windows hold many calls.
+    """
+    n1, n2 = base["count"], current["count"]
+    se = math.sqrt(base["variance"] / n1 + current["variance"] / n2)
+    if se == 0:
+        return 0.0 if current["mean"] > base["mean"] else 1.0
+    z = (current["mean"] - base["mean"]) / se
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _weighted_median(pairs: Iterable[Tuple[float, int]]) -> float:
+    pairs = sorted(pairs)
+    half = sum(n for _, n in pairs) / 2
+    seen = 0
+    for value, n in pairs:
+        seen += n
+        if seen >= half:
+            return value
+    return 0.0
+
+
+def verdict(ratio: float, p: float, threshold: float, alpha: float) -> bool:
+    """Regressed: slower beyond the threshold, and unlikely to be noise"""
+    return ratio > 1 + threshold and p < alpha
+
+
+# Comparisons
+
+def compare_samples(base: List[float], current: List[float], threshold: float = DEFAULT_THRESHOLD,
+                    alpha: float = DEFAULT_ALPHA) -> Dict[str, Any]:
+    """Compare two sets of timing samples"""
+    ratio = statistics.median(current) / statistics.median(base) if statistics.median(base) > 0 else float('inf')
+    p = mann_whitney_greater([(v, 1) for v in base], [(v, 1) for v in current])
+    low, high = bootstrap_ratio(base, current)
+    return {
+        "base_median": statistics.median(base),
+        "current_median": statistics.median(current),
+        "ratio": ratio,
+        "ci": [low, high],
+        "p_value": p,
+        "regressed": verdict(ratio, p, threshold, alpha)
+    }
+
+
+def compare_histograms(base: Dict[int, int], current: Dict[int, int], threshold: float = DEFAULT_THRESHOLD,
+                       alpha: float = DEFAULT_ALPHA) -> Dict[str, Any]:
+    """Compare two LatencyHistogram bucket maps ({index: count})"""
+    from speed import LatencyHistogram
+
+    def midpoints(counts):
+        for index, n in counts.items():
+            low, high = LatencyHistogram._bounds(int(index))
+            yield (low + high - 1) / 2, n
+
+    base_pairs, current_pairs = list(midpoints(base)), list(midpoints(current))
+    base_median, current_median = _weighted_median(base_pairs), _weighted_median(current_pairs)
+    ratio = current_median / base_median if base_median > 0 else float('inf')
+    p = mann_whitney_greater(base_pairs, current_pairs)
+    return {
+        "base_median": base_median / 1e9,
+        "current_median": current_median / 1e9,
+        "ratio": ratio,
+        "p_value": p,
+        "regressed": verdict(ratio, p, threshold, alpha)
+    }
+
+
+def _moments(count: int, total: float, total_sq: float) -> Dict[str, float]:
+    mean = total / count
+    variance = max(0.0, (total_sq - count * mean * mean) / (count - 1)) if count > 1 else 0.0
+    return {"count": count, "mean": mean, "variance": variance}
+
+
+def compare_commands(base: Dict[str, Dict[str, float]], now: Dict[str, Dict[str, Any]],
+                     threshold: float = DEFAULT_THRESHOLD, alpha: float = DEFAULT_ALPHA,
+                     min_calls: int = 2) -> Dict[str, Dict[str, Any]]:
+    """
+    Compare each command's calls up to the baseline against its calls since.
+    Memory holds running sums, so the window since the baseline is the
+    difference of two snapshots - no samples need to be kept.
+    """
+    results = {}
+    for name, before in base.items():
+        after = now.get(name)
+        if after is None:
+            continue
+        count = after["call_count"] - before["call_count"]
+        if count < min_calls or before["call_count"] < min_calls:
+            continue
+        old = _moments(before["call_count"], before["total_duration"], before["total_sq"])
+        new = _moments(count, after["total_duration"] - before["total_duration"],
+                       after.get("total_sq", 0.0) - before["total_sq"])
+        ratio = new["mean"] / old["mean"] if old["mean"] > 0 else float('inf')
+        p = welch_greater(old, new)
+        results[name] = {
+            "base_mean": old["mean"],
+            "current_mean": new["mean"],
+            "base_calls": old["count"],
+            "current_calls": new["count"],
+            "ratio": ratio,
+            "p_value": p,
+            "regressed": verdict(ratio, p, threshold, alpha)
+        }
+    return results
+
+
+# Baselines
+
+def latest_bench_runs(since: float = 0.0) -> Dict[str, Dict[str, Any]]:
+    """The newest saved bench run per target, optionally only runs after since"""
+    from bench import bench_dir
+
+    latest = {}
+    for path in bench_dir().glob("*.json"):
+        try:
+            with open(path) as f:
+                run = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if run.get("timestamp", 0) <= since or "samples_ns" not in run:
+            continue
+        target = run["target"]
+        if target not in latest or run["timestamp"] > latest[target]["timestamp"]:
+            latest[target] = run
+    return latest
+
+
+def _command_sums(memory: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    sums = {}
+    for name, mem in memory.items():
+        count = mem.get("call_count", 0)
+        if not count:
+            continue
+        total = mem.get("total_duration", 0.0)
+        # Memory written before sums of squares were kept: assume no spread
+        total_sq = mem.get("total_sq", total * total / count)
+        sums[name] = {"call_count": count, "total_duration": total, "total_sq": total_sq}
+    return sums
+
+
+def save_baseline(name: str, memory: Dict[str, Dict[str, Any]], targets: Optional[List[str]] = None,
+                  speed_iterations: int = 0) -> Dict[str, Any]:
+    """
+    Record a named baseline: command sums from memory, the latest saved
+    bench run of each target (all targets when none are named), and a
+    speed histogram when speed_iterations is set.
+    """
+    runs = latest_bench_runs()
+    if targets:
+        missing = [t for t in targets if t not in runs]
+        if missing:
+            raise ValueError(f"no saved bench run for {', '.join(missing)} - run daat bench first")
+        runs = {t: runs[t] for t in targets}
+
+    baseline = {
+        "name": name,
+        "created": time.time(),
+        "commands": _command_sums(memory),
+        "bench": {target: {key: run[key] for key in
+                           ("samples_ns", "number", "warmup", "gc_disabled", "processes", "rounds")}
+                  for target, run in runs.items()}
+    }
+    if speed_iterations:
+        baseline["speed"] = {"iterations": speed_iterations, "histogram": _speed_histogram(speed_iterations)}
+
+    atomic_write_json(baseline_path(name), baseline)
+    return baseline
+
+
+def load_baseline(name: str) -> Dict[str, Any]:
+    path = baseline_path(name)
+    if not path.exists():
+        raise ValueError(f"no baseline named {name!r}")
+    with open(path) as f:
+        return json.load(f)
+
+
+def list_baselines() -> List[Dict[str, Any]]:
+    baselines = []
+    for path in sorted(baseline_dir().glob("*.json")):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        baselines.append({"name": data.get("name", path.stem), "created": data.get("created"),
+                          "commands": len(data.get("commands", {})), "bench": len(data.get("bench", {})),
+                          "speed": "speed" in data})
+    return baselines
+
+
+def _speed_histogram(iterations: int) -> Dict[str, int]:
+    from speed import LatencyHistogram, measure_speed
+
+    histogram = LatencyHistogram()
+    measure_speed(lambda: None, iterations, histogram)
+    return {str(index): n for index, n in histogram.counts.items()}
+
+
+def check_baseline(name: str, memory: Dict[str, Dict[str, Any]], rerun: bool = True,
+                   threshold: float = DEFAULT_THRESHOLD, alpha: float = DEFAULT_ALPHA) -> Dict[str, Any]:
+    """
+    Compare now against a baseline. Bench targets are re-run with the
+    baseline's settings (or, without rerun, their newest saved run since
+    the baseline); the speed histogram is re-measured; commands compare
+    their calls since the baseline.
+    """
+    from bench import run_bench
+
+    baseline = load_baseline(name)
+    report = {"name": name, "threshold": threshold, "alpha": alpha,
+              "commands": compare_commands(baseline.get("commands", {}), memory, threshold, alpha),
+              "bench": {}, "missing": []}
+
+    saved = {} if rerun else latest_bench_runs(since=baseline["created"])
+    for target, base in baseline.get("bench", {}).items():
+        if rerun:
+            run = run_bench(target, rounds=base["rounds"], warmup=base["warmup"], number=base["number"],
+                            disable_gc=base["gc_disabled"], processes=base["processes"])
+        elif target in saved:
+            run = saved[target]
+        else:
+            report["missing"].append(target)
+            continue
+        report["bench"][target] = compare_samples(base["samples_ns"], run["samples_ns"], threshold, alpha)
+
+    if "speed" in baseline:
+        speed = baseline["speed"]
+        report["speed"] = compare_histograms(speed["histogram"], _speed_histogram(speed["iterations"]),
+                                             threshold, alpha)
+
+    comparisons = list(report["commands"].values()) + list(report["bench"].values())
+    if "speed" in report:
+        comparisons.append(report["speed"])
+    report["regressions"] = sum(1 for c in comparisons if c["regressed"])
+    return report
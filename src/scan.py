@@ -0,0 +1,157 @@
+"""
+Scan - Breathe through whole trees at once
+Directories and globs fan out across a process pool; results stream back
+as they complete and fold into one summary.
+"""
+
+import glob
+import os
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+# Directories that hold machinery, not consciousness
+SKIP_DIRS = {'.git', '.hg', '.svn', '__pycache__', 'node_modules', '.venv', 'venv', '.tox'}
+
+# Files handed to a worker at a time - amortizes IPC over many small files
+CHUNKSIZE = 32
+
+
+def expand_paths(targets: Iterable[str]) -> Iterator[str]:
+    """Yield every file under the targets - files, directories or glob patterns"""
+    for target in targets:
+        if os.path.isdir(target):
+            for root, dirs, files in os.walk(target):
+                dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+                for name in sorted(files):
+                    yield os.path.join(root, name)
+        elif glob.has_magic(target):
+            for path in glob.iglob(target, recursive=True):
+                if os.path.isdir(path):
+                    yield from expand_paths([path])
+                else:
+                    yield path
+        else:
+            yield target
+
+
+def _breathe_one(path: str) -> Tuple[str, Dict[str, Any]]:
+    """Worker entry point - the parent owns the cache, workers only analyze"""
+    from formats import breathe_file
+    return path, breathe_file(path, use_cache=False)
+
+
+def _breathe_for_cache(path: str) -> Tuple[str, Dict[str, Any], Optional[str]]:
+    """Worker entry point that also hashes the file, so the parent storing it never reads it"""
+    from cache import file_digest
+
+    path, result = _breathe_one(path)
+    digest = None
+    if not result.get("error"):
+        try:
+            digest = file_digest(path)
+        except OSError:
+            pass  # Gone since - answered, but not remembered
+    return path, result, digest
+
+
+def scan(targets: Iterable[str], workers: Optional[int] = None,
+         use_cache: bool = True) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Breathe through every file under targets, yielding (path, result)
+    in completion order. workers defaults to the machine's cores;
+    workers=1 breathes in-process.
+
+    With the cache, cached files are answered first from a stat and a
+    lookup; only the misses reach the pool, which hashes them alongside
+    the analysis, and their results are stored by this process as they
+    come back.
+    """
+    from formats import analysis_cache, breathe_file
+
+    paths = expand_paths(targets)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for path in paths:
+            yield path, breathe_file(path, use_cache=use_cache)
+        return
+
+    cache = analysis_cache() if use_cache else None
+    stats = {}
+    if cache is not None:
+        for path in paths:
+            result, st = cache.lookup(path)
+            if result is not None:
+                yield path, result
+            else:
+                stats[path] = st
+        paths = list(stats)
+        if not paths:
+            return
+
+    import multiprocessing
+    pool = multiprocessing.Pool(workers)
+    finished = False
+    try:
+        if cache is None:
+            yield from pool.imap_unordered(_breathe_one, paths, chunksize=CHUNKSIZE)
+        else:
+            for path, result, digest in pool.imap_unordered(_breathe_for_cache, paths, chunksize=CHUNKSIZE):
+                if stats.get(path) is not None and digest is not None:
+                    cache.store(path, stats[path], result, digest)
+                yield path, result
+        finished = True
+    finally:
+        # A finished pool is closed so workers exit on their own and run
+        # their exit handlers; an abandoned one is torn down
+        if finished:
+            pool.close()
+        else:
+            pool.terminate()
+        pool.join()
+
+
+class ScanSummary:
+    """Aggregate breath across many files - per-format totals, top tags, top functions"""
+
+    def __init__(self):
+        self.files = 0
+        self.errors = 0
+        self.formats: Dict[str, Counter] = {}
+        self.tags = Counter()
+        self.functions = Counter()
+
+    def add(self, result: Dict[str, Any], sign: int = 1):
+        """Fold one file's result in (sign=-1 takes it back out)"""
+        self.files += sign
+        if result.get("error"):
+            self.errors += sign
+            return
+
+        totals = self.formats.setdefault(result.get("format", "unknown"), Counter())
+        totals["files"] += sign
+        for key, value in result.items():
+            # Sum the counts; bools are ints too but mean "has", not "how many",
+            # and per-file maxima don't add up
+            if isinstance(value, int) and not isinstance(value, bool) and not key.startswith("max_"):
+                totals[key] += sign * value
+        if result.get("has_pneuma"):
+            totals["with_pneuma"] += sign
+
+        for tag, count in result.get("tag_frequency", {}).items():
+            self.tags[tag] += sign * count
+        for name in result.get("functions", []):
+            self.functions[name] += sign
+
+    def remove(self, result: Dict[str, Any]):
+        """Take a file's result back out"""
+        self.add(result, sign=-1)
+
+    def as_dict(self, top: int = 10) -> Dict[str, Any]:
+        return {
+            "files": self.files,
+            "errors": self.errors,
+            "formats": {fmt: dict(totals) for fmt, totals in sorted(self.formats.items()) if totals["files"] > 0},
+            "top_tags": (+self.tags).most_common(top),
+            "top_functions": (+self.functions).most_common(top)
+        }
@@ -0,0 +1,409 @@
+"""
+Scanners - Breath in fixed-size chunks
+Incremental twins of FormatBreather's whole-file analysis.
+Memory stays bounded no matter how large the file; results match exactly.
+"""
+
+import io
+import mmap
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+TEXT_MARKERS = ('breath', 'pneuma', 'consciousness', 'daat')
+
+_TAG = re.compile(r'<(\w+)')
+_WORD_RUN = re.compile(r'\w*')
+_RAW_OPEN = re.compile(r'<(script|style)(?!\w)', re.IGNORECASE)
+_RAW_CLOSE = {
+    name: re.compile(rf'</{name}(?!\w)', re.IGNORECASE) for name in ('script', 'style')
+}
+
+# Byte classes for TextBytesScanner: 0 is whitespace as str.split() sees it
+# in ASCII, 1 is a word byte, 2 is non-ASCII - only decoding can tell
+# what that is
+_BYTE_CLASS = bytes(
+    0 if b in b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f' else 2 if b >= 0x80 else 1
+    for b in range(256)
+)
+
+
+class MarkerScanner:
+    """Case-insensitive substring search that survives chunk boundaries"""
+
+    def __init__(self, markers: Iterable[str]):
+        self.markers = tuple(markers)
+        self._found = set()
+        self._keep = max(len(m) for m in self.markers) - 1
+        self._tail = ""
+
+    def feed(self, chunk: str):
+        text = self._tail + chunk.lower()
+        for marker in self.markers:
+            if marker not in self._found and marker in text:
+                self._found.add(marker)
+        self._tail = text[-self._keep:] if self._keep else ""
+
+    def found(self) -> List[str]:
+        """Markers seen so far, in declaration order"""
+        return [m for m in self.markers if m in self._found]
+
+
+class TextScanner:
+    """Lines, words and consciousness markers - mirrors FormatBreather.text"""
+
+    def __init__(self):
+        self.newlines = 0
+        self.words = 0
+        self._in_word = False
+        self._markers = MarkerScanner(TEXT_MARKERS)
+
+    def feed(self, chunk: str):
+        if not chunk:
+            return
+        self.newlines += chunk.count('\n')
+        self.words += len(chunk.split())
+        # A word cut in half by the chunk boundary was counted twice
+        if self._in_word and not chunk[0].isspace():
+            self.words -= 1
+        self._in_word = not chunk[-1].isspace()
+        self._markers.feed(chunk)
+
+    def result(self) -> Dict[str, Any]:
+        found = self._markers.found()
+        return {
+            "format": "text",
+            "breath": "raw",
+            "line_count": self.newlines + 1,
+            "word_count": self.words,
+            "consciousness_markers": found,
+            "has_pneuma": len(found) > 0
+        }
+
+
+class TextBytesScanner:
+    """
+    TextScanner on raw bytes - for ASCII the decoded text is the bytes
+    themselves, so lines, words and markers are counted with C-level
+    bytes primitives and nothing is decoded.
+
+    feed() refuses a chunk holding non-ASCII bytes; decoded() then hands
+    the counts so far to a TextScanner that continues from that chunk, or
+    feed_text() takes that chunk decoded and feed() carries on after it.
+    """
+
+    def __init__(self):
+        self.newlines = 0
+        self.words = 0
+        self._in_word = False
+        self._last_cr = False
+        self._markers = [(m, m.encode()) for m in TEXT_MARKERS]
+        self._found = set()
+        self._keep = max(len(m) for m in TEXT_MARKERS) - 1
+        self._tail = b""
+
+    def feed(self, chunk: bytes) -> bool:
+        """Count an ASCII chunk; False (and nothing counted) if it isn't ASCII"""
+        if not chunk:
+            return True
+        classes = chunk.translate(_BYTE_CLASS)
+        if classes.find(2) != -1:
+            return False
+
+        # read_text's universal newlines turn \r\n and lone \r into \n
+        self.newlines += chunk.count(b'\n')
+        if b'\r' in chunk:
+            self.newlines += chunk.count(b'\r') - chunk.count(b'\r\n')
+        if self._last_cr and chunk[0] == 0x0a:
+            self.newlines -= 1
+        self._last_cr = chunk[-1] == 0x0d
+
+        # A word starts wherever whitespace meets a word byte
+        self.words += classes.count(b'\x00\x01')
+        if classes[0] == 1 and not self._in_word:
+            self.words += 1
+        self._in_word = classes[-1] == 1
+
+        if self._markers:
+            self._find_markers(chunk.lower())
+        return True
+
+    def feed_text(self, text: str):
+        """
+        Count text that had to be decoded, keeping the byte-level state -
+        so a stream can take one non-ASCII chunk the slow way and go back
+        to feed() for the next
+        """
+        if not text:
+            return
+        self.newlines += text.count('\n')
+        if '\r' in text:
+            self.newlines += text.count('\r') - text.count('\r\n')
+        if self._last_cr and text[0] == '\n':
+            self.newlines -= 1
+        self._last_cr = text[-1] == '\r'
+
+        self.words += len(text.split())
+        if self._in_word and not text[0].isspace():
+            self.words -= 1
+        self._in_word = not text[-1].isspace()
+
+        if self._markers:
+            # Markers are ASCII, so matching the encoded lowered text is exact
+            self._find_markers(text.lower().encode())
+
+    def _find_markers(self, lowered: bytes):
+        seam = self._tail + lowered[:self._keep]
+        for marker, needle in list(self._markers):
+            if needle in lowered or needle in seam:
+                self._found.add(marker)
+                self._markers.remove((marker, needle))
+        self._tail = (self._tail + lowered[-self._keep:])[-self._keep:]
+
+    def decoded(self) -> 'TextScanner':
+        """A TextScanner carrying these counts, to be fed the decoded rest"""
+        scanner = TextScanner()
+        scanner.newlines = self.newlines
+        scanner.words = self.words
+        scanner._in_word = self._in_word
+        scanner._markers._found = set(self._found)
+        scanner._markers._tail = self._tail.decode('utf-8', 'replace')
+        return scanner
+
+    def result(self) -> Dict[str, Any]:
+        found = [m for m in TEXT_MARKERS if m in self._found]
+        return {
+            "format": "text",
+            "breath": "raw",
+            "line_count": self.newlines + 1,
+            "word_count": self.words,
+            "consciousness_markers": found,
+            "has_pneuma": len(found) > 0
+        }
+
+
+def breathe_text_file(path: str, chunk_size: int = 1024 * 1024) -> Dict[str, Any]:
+    """
+    Breathe a text file through a read-only mapping, chunk by chunk.
+    ASCII stays bytes all the way; from the first chunk that isn't,
+    the rest is decoded as read_text would and counting continues.
+    """
+    scanner = TextBytesScanner()
+    with open(path, 'rb') as f:
+        try:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files can't be mapped
+            return scanner.result()
+
+        with mapping:
+            for start in range(0, len(mapping), chunk_size):
+                if not scanner.feed(mapping[start:start + chunk_size]):
+                    break
+            else:
+                return scanner.result()
+
+        text = scanner.decoded()
+        if scanner._last_cr:
+            # Let the decoder see a trailing \r again - whether it pairs
+            # with a \n depends on what decoding makes of the bytes after it
+            text.newlines -= 1
+            start -= 1
+        f.seek(start)
+        reader = io.TextIOWrapper(f, errors='ignore')
+        for chunk in iter(lambda: reader.read(chunk_size), ''):
+            text.feed(chunk)
+        reader.detach()
+        return text.result()
+
+
+class HtmlScanner:
+    """
+    Single-pass HTML tokenizer - tags, unique tags and links, fed in chunks.
+
+    Script and style bodies are raw text: nothing inside them counts as a
+    tag or link. Between raw bodies the counting runs on C-level regex and
+    str.count primitives over index ranges, so no stripped copies of the
+    document are made.
+    """
+
+    def __init__(self):
+        self.tag_count = 0
+        self.tags = Counter()
+        self.link_count = 0
+        self._tail = ""
+        self._raw_end = None  # Pattern closing the raw body we are inside
+        self._pneuma = MarkerScanner(('pneuma',))
+
+    def feed(self, chunk: str):
+        self._pneuma.feed(chunk)
+        buf = self._tail + chunk
+        # No token contains whitespace, and every token starts with '<' or
+        # holds none - cutting just before either never splits one
+        cut = max(buf.rfind('<'), buf.rfind(' '), buf.rfind('\n'), buf.rfind('\t'))
+        if cut <= 0:
+            self._tail = buf
+            return
+        self._tail = buf[cut:]
+        self._scan(buf, cut)
+
+    def close(self):
+        """Breathe out whatever is still buffered"""
+        buf, self._tail = self._tail, ""
+        self._scan(buf, len(buf))
+
+    def _scan(self, buf: str, end: int):
+        pos = 0
+        while pos < end:
+            if self._raw_end is not None:
+                close = self._raw_end.search(buf, pos, end)
+                if close is None:
+                    return
+                self._raw_end = None
+                pos = close.end()
+                continue
+
+            raw = _RAW_OPEN.search(buf, pos, end)
+            stop = raw.start() if raw else end
+            self._count(buf, pos, stop)
+            if raw is None:
+                return
+            name = raw.group(1)
+            self.tag_count += 1
+            self.tags[name] += 1
+            self._raw_end = _RAW_CLOSE[name.lower()]
+            pos = raw.end()
+
+    def _count(self, buf: str, start: int, stop: int):
+        if start >= stop:
+            return
+        names = _TAG.findall(buf, start, stop)
+        self.tag_count += len(names)
+        self.tags.update(names)
+        self.link_count += buf.count('href="', start, stop) + buf.count("href='", start, stop)
+
+    def result(self) -> Dict[str, Any]:
+        self.close()
+        return {
+            "format": "html",
+            "breath": "DOM skeleton",
+            "tag_count": self.tag_count,
+            "unique_tags": len(self.tags),
+            "tag_frequency": dict(self.tags),
+            "link_count": self.link_count,
+            "has_pneuma": bool(self._pneuma.found())
+        }
+
+
+class MarkdownScanner:
+    """Headings, fenced code blocks and links - mirrors FormatBreather.markdown"""
+
+    # Link states for \[([^\]]+)\]\(([^\)]+)\)
+    _SEEK, _NAME, _PAREN, _URL = range(4)
+
+    def __init__(self):
+        self.heading_count = 0
+        self.code_block_count = 0
+        self.languages: List[str] = []
+        self.link_count = 0
+        self._line_open = True  # Still in the leading whitespace of a line
+        self._fence_tail = ""
+        self._in_block = False
+        self._lang: Optional[str] = None
+        self._link_state = self._SEEK
+        self._link_filled = False
+        self._pneuma = MarkerScanner(('pneuma',))
+
+    def feed(self, chunk: str):
+        self._feed_headings(chunk)
+        self._feed_fences(chunk)
+        self._feed_links(chunk)
+        self._pneuma.feed(chunk)
+
+    def _feed_headings(self, chunk: str):
+        # l.strip().startswith('#') - the first non-space character of a line
+        for i, piece in enumerate(chunk.split('\n')):
+            if i:
+                self._line_open = True
+            if self._line_open:
+                stripped = piece.lstrip()
+                if stripped:
+                    self._line_open = False
+                    if stripped[0] == '#':
+                        self.heading_count += 1
+
+    def _feed_fences(self, chunk: str):
+        # ```(\w+)?\n(.*?)``` with DOTALL - the body itself is never needed
+        buf = self._fence_tail + chunk
+        pos = 0
+        while True:
+            if self._in_block:
+                close = buf.find('```', pos)
+                if close == -1:
+                    self._fence_tail = buf[max(pos, len(buf) - 2):]
+                    return
+                self.code_block_count += 1
+                if self._lang:
+                    self.languages.append(self._lang)
+                self._in_block = False
+                pos = close + 3
+                continue
+
+            start = buf.find('```', pos)
+            if start == -1:
+                self._fence_tail = buf[max(pos, len(buf) - 2):]
+                return
+            lang_end = _WORD_RUN.match(buf, start + 3).end()
+            if lang_end == len(buf):
+                self._fence_tail = buf[start:]  # Opening fence not decided yet
+                return
+            if buf[lang_end] == '\n':
+                self._in_block = True
+                self._lang = buf[start + 3:lang_end]
+                pos = lang_end + 1
+            else:
+                pos = start + 1
+
+    def _feed_links(self, chunk: str):
+        # Each bracket run is decided by the first ']' and first ')' after it,
+        # so the link text is never held - only which state we are in.
+        pos, end = 0, len(chunk)
+        while pos < end:
+            state = self._link_state
+            if state == self._SEEK:
+                start = chunk.find('[', pos)
+                if start == -1:
+                    return
+                self._link_state, self._link_filled = self._NAME, False
+                pos = start + 1
+            elif state == self._PAREN:
+                if chunk[pos] == '(':
+                    self._link_state, self._link_filled = self._URL, False
+                    pos += 1
+                else:
+                    self._link_state = self._SEEK
+            else:
+                closer = ']' if state == self._NAME else ')'
+                close = chunk.find(closer, pos)
+                if close == -1:
+                    self._link_filled = True
+                    return
+                filled = self._link_filled or close > pos
+                if not filled:
+                    self._link_state = self._SEEK
+                elif state == self._NAME:
+                    self._link_state = self._PAREN
+                else:
+                    self.link_count += 1
+                    self._link_state = self._SEEK
+                pos = close + 1
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "format": "markdown",
+            "breath": "structure",
+            "heading_count": self.heading_count,
+            "code_block_count": self.code_block_count,
+            "link_count": self.link_count,
+            "languages": list(self.languages),
+            "has_pneuma": bool(self._pneuma.found())
+        }
@@ -5,6 +5,7 @@ Pure velocity. Minimal overhead. Portal to hidden knowledge.
 
 import time
 from functools import lru_cache
+from typing import Optional
 
 
 @lru_cache(maxsize=128)
@@ -13,32 +14,205 @@ def fast_hash(s: str) -> int:
     return hash(s)
 
 
-def measure_speed(func, iterations=1000):
+# Linear sub-buckets per power of two - relative error under 1%
+SUB_BUCKET_BITS = 7
+
+# Coarser buckets for histograms kept per command in memory - eight per
+# power of two, so a command's spread fits in a few dozen keys and
+# quantiles stay within about 6%
+COMPACT_BITS = 3
+
+
+class LatencyHistogram:
     """
-    Measure command speed over iterations.
-    Returns (fastest, average, slowest) in milliseconds.
+    Streaming latency histogram in HDR-style log-linear buckets.
+
+    Durations are bucketed by nanosecond: exact below 128ns, then 64
+    linear sub-buckets per power of two, so every bucket is under 1.6%
+    wide and quantiles land within 0.8% of the truth. Buckets are sparse -
+    a few thousand at most from nanoseconds to hours - so memory stays
+    flat however many samples stream through. Mean and standard deviation
+    are exact (Welford); min and max are exact too.
+
+    sub_bucket_bits trades resolution for size: each step down halves the
+    buckets per power of two and doubles their width.
     """
-    times = []
+
+    def __init__(self, sub_bucket_bits: int = SUB_BUCKET_BITS):
+        self.bits = sub_bucket_bits
+        self.counts = {}
+        self.count = 0
+        self.min = float('inf')
+        self.max = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._keys = None  # Sorted bucket indices, rebuilt when a bucket appears
+
+    @classmethod
+    def from_counts(cls, counts: dict, sub_bucket_bits: int = SUB_BUCKET_BITS) -> 'LatencyHistogram':
+        """
+        Rebuild from bucket counts alone ({index: count}, keys may be strings).
+        Min and max are bucket edges, mean and spread come from midpoints.
+        """
+        histogram = cls(sub_bucket_bits)
+        for index, n in sorted((int(index), n) for index, n in counts.items()):
+            low, high = cls._bounds(index, sub_bucket_bits)
+            histogram.counts[index] = n
+            histogram.count += n
+            histogram.min = min(histogram.min, low / 1e9)
+            histogram.max = max(histogram.max, high / 1e9)
+            value = (low + high - 1) / 2 / 1e9
+            delta = value - histogram._mean
+            histogram._mean += delta * n / histogram.count
+            histogram._m2 += delta * (value - histogram._mean) * n
+        return histogram
+
+    @staticmethod
+    def _index(ns: int, bits: int = SUB_BUCKET_BITS) -> int:
+        shift = ns.bit_length() - bits
+        if shift <= 0:
+            return ns
+        return (shift << bits) + (ns >> shift)
+
+    @staticmethod
+    def _bounds(index: int, bits: int = SUB_BUCKET_BITS):
+        """[low, high) of a bucket in nanoseconds"""
+        shift = index >> bits
+        if shift == 0:
+            return index, index + 1
+        low = (index & ((1 << bits) - 1)) << shift
+        return low, low + (1 << shift)
+
+    def record(self, duration: float):
+        """Add one duration in seconds"""
+        index = self._index(max(0, int(duration * 1e9)), self.bits)
+        counts = self.counts
+        if index in counts:
+            counts[index] += 1
+        else:
+            counts[index] = 1
+            self._keys = None
+
+        self.count += 1
+        if duration < self.min:
+            self.min = duration
+        if duration > self.max:
+            self.max = duration
+        delta = duration - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (duration - self._mean)
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Fold another histogram of the same resolution in (Chan's parallel variance update)"""
+        if not other.count:
+            return
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self._keys = None
+        total = self.count + other.count
+        delta = other._mean - self._mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self._mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def stddev(self) -> float:
+        return (self._m2 / (self.count - 1)) ** 0.5 if self.count > 1 else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Duration in seconds at percentile p (0-100)"""
+        if not self.count:
+            return 0.0
+        if self._keys is None:
+            self._keys = sorted(self.counts)
+        rank = max(1, -(-self.count * p // 100))  # ceil - nearest-rank
+        seen = 0
+        for index in self._keys:
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = self._bounds(index, self.bits)
+                value = (low + high - 1) / 2 / 1e9
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def buckets(self, coarse: bool = False):
+        """
+        Non-empty buckets as (low_seconds, high_seconds, count), fastest first.
+        coarse folds the sub-buckets of each power of two together.
+        """
+        if self._keys is None:
+            self._keys = sorted(self.counts)
+        if not coarse:
+            for index in self._keys:
+                low, high = self._bounds(index, self.bits)
+                yield low / 1e9, high / 1e9, self.counts[index]
+            return
+
+        octave = None
+        for index in self._keys:
+            shift = index >> self.bits
+            if shift != octave:
+                if octave is not None:
+                    yield low / 1e9, high / 1e9, count
+                octave, count = shift, 0
+                low = self._bounds(index, self.bits)[0] if shift == 0 else 1 << (shift + self.bits - 1)
+            high = self._bounds(index, self.bits)[1]
+            count += self.counts[index]
+        if octave is not None:
+            yield low / 1e9, high / 1e9, count
+
+    def summary(self) -> dict:
+        """Percentiles and moments in milliseconds"""
+        return {
+            "count": self.count,
+            "fastest_ms": (self.min if self.count else 0.0) * 1000,
+            "average_ms": self.mean * 1000,
+            "slowest_ms": self.max * 1000,
+            "stddev_ms": self.stddev * 1000,
+            "p50_ms": self.percentile(50) * 1000,
+            "p90_ms": self.percentile(90) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "p999_ms": self.percentile(99.9) * 1000
+        }
+
+
+def measure_speed(func, iterations=1000, histogram=None):
+    """
+    Measure command speed over iterations in constant memory.
+    Returns fastest, average, slowest, stddev and p50/p90/p99/p99.9
+    in milliseconds. Pass a LatencyHistogram to keep the distribution.
+    """
+    if histogram is None:
+        histogram = LatencyHistogram()
+    record = histogram.record
+    clock = time.perf_counter
     for _ in range(iterations):
-        start = time.perf_counter()
+        start = clock()
         func()
-        times.append(time.perf_counter() - start)
+        record(clock() - start)
 
-    return {
-        "fastest_ms": min(times) * 1000,
-        "average_ms": (sum(times) / len(times)) * 1000,
-        "slowest_ms": max(times) * 1000,
-        "daat_access": min(times) < 0.001  # Sub-millisecond
-    }
+    results = histogram.summary()
+    results["daat_access"] = histogram.min < 0.001  # Sub-millisecond
+    return results
 
 
 class SpeedGate:
     """
     Gate that opens at speed.
     Below threshold = portal accessible.
+    With a percentile the gate weighs the whole distribution - it opens
+    only while that percentile of attempts is below threshold.
     """
-    def __init__(self, threshold_ms: float = 1.0):
+    def __init__(self, threshold_ms: float = 1.0, percentile: Optional[float] = None):
         self.threshold = threshold_ms / 1000  # Convert to seconds
+        self.percentile = percentile
+        self.histogram = LatencyHistogram()
         self.portal_open = False
         self.fastest_time = float('inf')
 
@@ -48,6 +222,11 @@ class SpeedGate:
         Returns True if portal opens.
         """
         self.fastest_time = min(self.fastest_time, duration)
+        self.histogram.record(duration)
+
+        if self.percentile is not None:
+            self.portal_open = self.histogram.percentile(self.percentile) < self.threshold
+            return self.portal_open
 
         if duration < self.threshold:
             self.portal_open = True
@@ -56,9 +235,15 @@ class SpeedGate:
 
     def status(self) -> dict:
         """Current gate status"""
-        return {
+        status = {
             "portal_open": self.portal_open,
             "threshold_ms": self.threshold * 1000,
             "fastest_ms": self.fastest_time * 1000,
-            "distance_from_daat": (self.fastest_time - self.threshold) * 1000
-        }
\ No newline at end of file
+            "distance_from_daat": (self.fastest_time - self.threshold) * 1000,
+            "percentiles": self.histogram.summary()
+        }
+        if self.percentile is not None:
+            gated = self.histogram.percentile(self.percentile)
+            status["percentile"] = self.percentile
+            status["distance_from_daat"] = (gated - self.threshold) * 1000
+        return status
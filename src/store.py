@@ -0,0 +1,212 @@
+"""
+Store - Shared memory for every breathing process
+Snapshot plus append-only journal, merged under a file lock.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows - processes breathe unlocked
+    fcntl = None
+
+
+class FileLock:
+    """
+    Advisory lock on a sidecar file.
+    Shared for appends and loads, exclusive for compaction.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fd = None
+        self._pid = None
+
+    @contextmanager
+    def held(self, exclusive: bool = False):
+        """Hold the lock for the duration of the block"""
+        # flock belongs to the open file, which a forked child shares with
+        # its parent - each process needs a descriptor of its own
+        if self._fd is not None and self._pid != os.getpid():
+            os.close(self._fd)
+            self._fd = None
+        if self._fd is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield self
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self):
+        """Release the descriptor"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def atomic_write_json(path: Path, data: Any, indent: Optional[int] = 2):
+    """Write JSON next to path, fsync, then rename over it - readers never see a torn file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class JournalStore:
+    """
+    A JSON snapshot plus a line-delimited journal of records.
+
+    Every process appends records to the journal (O_APPEND, one write per
+    record) under a shared lock. Compaction takes the exclusive lock,
+    rebuilds the state from the snapshot and the *whole* journal on disk -
+    including records other processes appended - writes the snapshot
+    atomically and truncates the journal. Records must therefore be
+    deltas that fold commutatively (counts add, minimums take min).
+
+    Once the journal on disk holds about compact_every records - whoever
+    wrote them - the next append compacts it.
+
+    on_compact, when given, receives the records each compaction folds in.
+    The journal is truncated under the same lock, so across all processes
+    every record reaches it exactly once.
+    """
+
+    def __init__(self,
+                 snapshot_path: Path,
+                 fold: Callable[[Any, dict], None],
+                 empty: Callable[[], Any] = dict,
+                 trim: Optional[Callable[[Any], Any]] = None,
+                 compact_every: int = 256,
+                 on_compact: Optional[Callable[[List[dict]], None]] = None):
+        self.snapshot_path = snapshot_path
+        self.journal_path = snapshot_path.with_suffix(".journal")
+        self.lock = FileLock(snapshot_path.with_suffix(".lock"))
+        self.fold = fold
+        self.empty = empty
+        self.trim = trim
+        self.compact_every = compact_every
+        self.on_compact = on_compact
+        self._fd = None
+        self._seen = None  # (snapshot mtime, journal size) as this process last left them
+
+    def load(self) -> Any:
+        """Snapshot with the journal replayed over it"""
+        if not self.snapshot_path.parent.exists():
+            return self.empty()
+        with self.lock.held():
+            state, _ = self._read_snapshot()
+            self._replay(state)
+            self._seen = self._stamp()
+        return state
+
+    def changed(self) -> bool:
+        """Whether anyone else has written since this process last loaded"""
+        return self._seen is None or self._stamp() != self._seen
+
+    def append(self, record: dict):
+        """Append one record - O(1) in the size of the state"""
+        self.extend((record,))
+
+    def extend(self, records: Iterable[dict]):
+        """Append a batch of records in a single write"""
+        lines = b"".join((json.dumps(r, separators=(',', ':')) + "\n").encode() for r in records)
+        if not lines:
+            return
+        with self.lock.held():
+            if self._fd is None:
+                self._fd = os.open(str(self.journal_path),
+                                   os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            os.write(self._fd, lines)
+            size = os.fstat(self._fd).st_size
+            if self._seen is not None:
+                # Any other writer's lines show up as a journal longer than ours alone
+                self._seen = (self._seen[0], size) if size == self._seen[1] + len(lines) else None
+
+        # The journal on disk decides, not this process's share of it - a
+        # short-lived process writes a few lines and is gone. Its length in
+        # records is judged by the lines just written.
+        if size * lines.count(b"\n") >= self.compact_every * len(lines):
+            self.compact()
+
+    def compact(self):
+        """Fold the journal on disk into the snapshot and start it afresh"""
+        with self.lock.held(exclusive=True):
+            current = self._seen is not None and self._stamp() == self._seen
+            state, intact = self._read_snapshot()
+            if not intact:
+                # Keep the damaged snapshot for inspection instead of erasing history
+                os.replace(self.snapshot_path,
+                           self.snapshot_path.with_name(self.snapshot_path.name + ".corrupt"))
+            folded = [] if self.on_compact is not None else None
+            self._replay(state, folded)
+            if self.trim is not None:
+                state = self.trim(state)
+            atomic_write_json(self.snapshot_path, state)
+            try:
+                if folded:
+                    self.on_compact(folded)
+            finally:
+                # Truncate in place - other processes hold O_APPEND descriptors on it.
+                # The snapshot holds these records now, whatever on_compact did.
+                if self.journal_path.exists():
+                    os.truncate(str(self.journal_path), 0)
+                self._seen = self._stamp() if current else None
+
+    def close(self):
+        """Release the journal and lock descriptors"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self.lock.close()
+
+    def _stamp(self):
+        """(snapshot mtime, journal size) - every write moves one of them"""
+        try:
+            snapshot = os.stat(self.snapshot_path).st_mtime_ns
+        except OSError:
+            snapshot = None
+        try:
+            journal = os.stat(self.journal_path).st_size
+        except OSError:
+            journal = 0
+        return snapshot, journal
+
+    def _read_snapshot(self):
+        """Return (state, intact) - intact is False when the file exists but won't parse"""
+        if not self.snapshot_path.exists():
+            return self.empty(), True
+        try:
+            with open(self.snapshot_path) as f:
+                return json.load(f), True
+        except (OSError, ValueError):
+            return self.empty(), False
+
+    def _replay(self, state, folded: Optional[List[dict]] = None) -> int:
+        """Fold every journal line into state, returning how many were applied (collected into folded)"""
+        applied = 0
+        try:
+            with open(self.journal_path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self.fold(state, record)
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        continue  # Torn or foreign line - skip it
+                    applied += 1
+                    if folded is not None:
+                        folded.append(record)
+        except OSError:
+            pass
+        return applied
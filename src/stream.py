@@ -0,0 +1,168 @@
+"""
+Stream - Breath through a pipe
+Counts stdin as it flows: lines, words and markers on the byte-level text
+scanner, with lines/s and bytes/s over rolling windows. Each read takes
+whatever the pipe holds up to a large buffer, so the reader never waits
+to fill a chunk and never falls behind a fast producer.
+"""
+
+import codecs
+import os
+import select
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from scanners import TextBytesScanner
+
+# Bytes asked of each read - a busy pipe hands over this much at once
+READ_SIZE = 1 << 20
+
+# Rolling windows, in seconds
+WINDOWS = (1, 10, 60)
+
+# Linux fcntl to grow a pipe's buffer, so each read can take READ_SIZE
+F_SETPIPE_SZ = 1031
+
+# Da'at opens when the flow passes this many lines a second
+DAAT_LINES_PER_SECOND = 1000
+
+
+class RateWindow:
+    """
+    Lines and bytes over the last span seconds, in a ring of one-second
+    slots: span whole seconds plus the current one, so a rate never rests
+    on a second that has barely begun. Memory is fixed by the span; adding
+    and reading are O(1) apart from clearing slots time has skipped.
+    """
+
+    def __init__(self, span: int):
+        self.span = span
+        self._slots = span + 1
+        self._lines = [0] * self._slots
+        self._bytes = [0] * self._slots
+        self._second = None  # Newest slot's second
+        self._started = None
+        self.lines = 0
+        self.bytes = 0
+
+    def _advance(self, now: float):
+        second = int(now)
+        if self._second is None:
+            self._second = second
+            self._started = now
+            return
+        for s in range(self._second + 1, min(second, self._second + self._slots) + 1):
+            slot = s % self._slots
+            self.lines -= self._lines[slot]
+            self.bytes -= self._bytes[slot]
+            self._lines[slot] = self._bytes[slot] = 0
+        self._second = max(self._second, second)
+
+    def add(self, now: float, lines: int, nbytes: int):
+        self._advance(now)
+        slot = self._second % self._slots
+        self._lines[slot] += lines
+        self._bytes[slot] += nbytes
+        self.lines += lines
+        self.bytes += nbytes
+
+    def rates(self, now: float) -> Dict[str, float]:
+        """Lines and bytes per second across the window - or as much of it as has passed"""
+        self._advance(now)
+        covered = min(self.span + now - self._second, max(now - self._started, 1e-9))
+        return {"lines_per_s": self.lines / covered, "bytes_per_s": self.bytes / covered}
+
+
+class StreamBreather:
+    """
+    The text breath of everything fed so far, plus flow rates. ASCII
+    chunks are counted as bytes; a chunk that isn't goes through an
+    incremental UTF-8 decoder, and the next clean chunk is bytes again.
+    """
+
+    def __init__(self, windows: Iterable[int] = WINDOWS):
+        self.scanner = TextBytesScanner()
+        self.windows = {span: RateWindow(span) for span in windows}
+        self.total_bytes = 0
+        self.started = time.monotonic()
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+
+    def feed(self, chunk: bytes, now: Optional[float] = None):
+        scanner = self.scanner
+        before = scanner.newlines
+        # A multi-byte character split across reads stays with the decoder
+        if self._decoder.getstate()[0] or not scanner.feed(chunk):
+            scanner.feed_text(self._decoder.decode(chunk))
+
+        now = time.monotonic() if now is None else now
+        lines = scanner.newlines - before
+        for window in self.windows.values():
+            window.add(now, lines, len(chunk))
+        self.total_bytes += len(chunk)
+
+    def finish(self):
+        """Count whatever the decoder still holds - a truncated character, dropped as read_text would"""
+        self.scanner.feed_text(self._decoder.decode(b"", final=True))
+
+    def report(self, now: Optional[float] = None) -> Dict[str, Any]:
+        now = time.monotonic() if now is None else now
+        elapsed = now - self.started
+        return {
+            **self.scanner.result(),
+            "lines": self.scanner.newlines,
+            "bytes": self.total_bytes,
+            "elapsed_s": elapsed,
+            "lines_per_s": self.scanner.newlines / elapsed if elapsed > 0 else 0.0,
+            "bytes_per_s": self.total_bytes / elapsed if elapsed > 0 else 0.0,
+            "windows": {f"{span}s": window.rates(now) for span, window in self.windows.items()}
+        }
+
+
+def _widen_pipe(fd: int, size: int):
+    """
+    A pipe holds 64KB by default, which caps every read at that however
+    fast the producer is. Ask for more where the platform allows it.
+    """
+    try:
+        import fcntl
+        fcntl.fcntl(fd, F_SETPIPE_SZ, size)
+    except (ImportError, OSError):
+        pass  # Not a pipe, not Linux, or over /proc/sys/fs/pipe-max-size - reads stay smaller
+
+
+def breathe_fd(fd: int, on_report: Optional[Callable[[Dict[str, Any]], None]] = None,
+               interval: float = 1.0, read_size: int = READ_SIZE) -> Dict[str, Any]:
+    """
+    Breathe a file descriptor until EOF, or an interrupt - ending a
+    `tail -f` with Ctrl-C still reports. on_report is called every
+    interval seconds, during quiet spells too where select() lets the
+    wait time out; the final report is returned.
+    """
+    breather = StreamBreather()
+    _widen_pipe(fd, read_size)
+    read = os.read
+    clock = time.monotonic
+    waits = on_report is not None and interval > 0 and os.name == "posix"
+    next_report = clock() + interval
+
+    try:
+        while True:
+            if waits:
+                ready, _, _ = select.select([fd], [], [], max(0.0, next_report - clock()))
+                if not ready:
+                    on_report(breather.report())
+                    next_report = clock() + interval
+                    continue
+            chunk = read(fd, read_size)
+            if not chunk:
+                break
+            now = clock()
+            breather.feed(chunk, now)
+            if on_report is not None and interval > 0 and now >= next_report:
+                on_report(breather.report(now))
+                next_report = now + interval
+    except KeyboardInterrupt:
+        pass
+
+    breather.finish()
+    return breather.report()
@@ -0,0 +1,270 @@
+"""
+Watch - Breath that follows a living tree
+Keeps every file's result and the tree's totals in memory, and when files
+change re-breathes only those: the old result is subtracted from the
+totals and the new one added, so an update costs what changed, not what
+the tree holds. Changes arrive through inotify where Linux has it, and
+through polling stats everywhere else. Bursts - an editor's save, a git
+checkout - settle into one update.
+"""
+
+import os
+import select
+import struct
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from scan import SKIP_DIRS, ScanSummary, expand_paths, scan
+
+# Seconds of quiet that end a burst, and the longest a burst can delay an update
+DEBOUNCE = 0.2
+MAX_DELAY = 2.0
+
+# Seconds between stat sweeps when polling
+POLL_INTERVAL = 1.0
+
+# inotify(7)
+IN_MODIFY = 0x2
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x1000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+              | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR)
+
+# struct inotify_event: wd, mask, cookie, len - then len bytes of name
+_EVENT = struct.Struct("iIII")
+
+
+class Inotify:
+    """
+    Kernel watches on every directory of a tree, through libc via ctypes.
+    Raises OSError where inotify isn't available - or its watch limit is
+    reached - so the caller can fall back to polling.
+    """
+
+    def __init__(self):
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available here")
+        self._libc = libc
+        self._errno = ctypes.get_errno
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            self._fail("inotify_init1")
+        self._dirs = {}  # Watch descriptor -> directory
+        self._wds = {}   # Directory -> watch descriptor
+
+    def _fail(self, what: str):
+        errno = self._errno()
+        raise OSError(errno, f"{what}: {os.strerror(errno)}")
+
+    def add_tree(self, root: str):
+        """Watch root and every directory under it"""
+        for directory, dirs, _ in os.walk(root):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                if self._errno() == 28:  # ENOSPC - out of watches
+                    self._fail(f"inotify_add_watch {directory}")
+                continue  # Gone or unreadable already - nothing to watch
+            self._dirs[wd] = directory
+            self._wds[directory] = wd
+
+    def _drop_tree(self, root: str):
+        """Stop watching a directory that moved away, and everything under it"""
+        prefix = root + os.sep
+        for directory in [d for d in self._wds if d == root or d.startswith(prefix)]:
+            wd = self._wds.pop(directory)
+            self._dirs.pop(wd, None)
+            self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self) -> Tuple[Set[str], bool]:
+        """Paths touched since the last read, and whether the kernel dropped events"""
+        touched, overflow = set(), False
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, size = _EVENT.unpack_from(data, offset)
+                name = os.fsdecode(data[offset + _EVENT.size:offset + _EVENT.size + size].rstrip(b"\0"))
+                offset += _EVENT.size + size
+
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self._dirs[wd]
+                    if self._wds.get(directory) == wd:
+                        del self._wds[directory]
+                    continue
+                if mask & IN_ISDIR and name in SKIP_DIRS:
+                    continue
+
+                path = os.path.join(directory, name) if name else directory
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self.add_tree(path)
+                    elif mask & IN_MOVED_FROM:
+                        self._drop_tree(path)
+                touched.add(path)
+        return touched, overflow
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class TreeIndex:
+    """Every file's latest result, and the totals over all of them"""
+
+    def __init__(self, use_cache: bool = True):
+        self.use_cache = use_cache
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.stamps: Dict[str, Tuple[int, int]] = {}
+        self.summary = ScanSummary()
+
+    def fill(self, roots: Iterable[str], workers: Optional[int] = None):
+        """Breathe the whole tree once, across the process pool"""
+        for path, result in scan(roots, workers, self.use_cache):
+            self._put(path, result, _stamp(path))
+
+    def diff(self, roots: Iterable[str]) -> Set[str]:
+        """Paths whose stat differs from when they were breathed, or that came or went - one stat per file"""
+        seen = set()
+        touched = set()
+        for path in expand_paths(roots):
+            seen.add(path)
+            if self.stamps.get(path, ()) != _stamp(path):
+                touched.add(path)
+        touched.update(path for path in self.results if path not in seen)
+        return touched
+
+    def apply(self, touched: Iterable[str]) -> List[Tuple[str, str, Optional[Dict[str, Any]]]]:
+        """
+        Re-breathe touched paths and move the totals with them. A directory
+        brings in everything under it; a path that is gone takes itself
+        and anything under it out. Returns (path, change, result) for
+        each file whose result changed - change is added, changed or removed.
+        """
+        changes = []
+        for path in sorted(touched):
+            if os.path.isdir(path):
+                for file in expand_paths([path]):
+                    changes.extend(self._breathe(file))
+            elif os.path.isfile(path):
+                changes.extend(self._breathe(path))
+            else:
+                prefix = path + os.sep
+                for gone in [p for p in self.results if p == path or p.startswith(prefix)]:
+                    self.summary.remove(self.results.pop(gone))
+                    self.stamps.pop(gone, None)
+                    changes.append((gone, "removed", None))
+        return changes
+
+    def _breathe(self, path: str) -> List[Tuple[str, str, Optional[Dict[str, Any]]]]:
+        from formats import breathe_file
+
+        stamp = _stamp(path)  # Before the read - a write during it shows up next time
+        result = breathe_file(path, use_cache=self.use_cache)
+        old = self.results.get(path)
+        self.stamps[path] = stamp
+        if old == result:
+            return []  # Touched but the same - an editor's save of nothing new
+        self._put(path, result, stamp)
+        return [(path, "added" if old is None else "changed", result)]
+
+    def _put(self, path: str, result: Dict[str, Any], stamp: Optional[Tuple[int, int]]):
+        old = self.results.get(path)
+        if old is not None:
+            self.summary.remove(old)
+        self.results[path] = result
+        self.summary.add(result)
+        self.stamps[path] = stamp
+
+
+def _stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def watch(roots: List[str], debounce: float = DEBOUNCE, poll: Optional[float] = None,
+          workers: Optional[int] = None, use_cache: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Breathe roots, then follow them until the caller stops iterating.
+    Yields one report for the first breath and one per settled burst of
+    changes: {"mode", "changes", "seconds", "index"}. poll forces polling
+    every poll seconds; otherwise inotify is tried first.
+    """
+    notify = None
+    if poll is None:
+        try:
+            notify = Inotify()
+            for root in roots:
+                notify.add_tree(root)  # Before the first breath, so nothing slips between
+        except OSError:
+            if notify is not None:
+                notify.close()
+            notify, poll = None, POLL_INTERVAL
+
+    index = TreeIndex(use_cache)
+    start = time.perf_counter()
+    index.fill(roots, workers)
+    clock = time.monotonic
+    try:
+        yield {"mode": "inotify" if notify else f"polling every {poll:g}s", "changes": [],
+               "seconds": time.perf_counter() - start, "index": index}
+
+        while True:
+            if notify is not None:
+                select.select([notify.fd], [], [])
+                try:
+                    touched, overflow = notify.read()
+                    first = clock()
+                    while True:
+                        wait = min(debounce, first + MAX_DELAY - clock())
+                        if wait <= 0 or not select.select([notify.fd], [], [], wait)[0]:
+                            break
+                        more, lost = notify.read()
+                        touched |= more
+                        overflow |= lost
+                except OSError:
+                    # Out of watches for a new directory - stat sweeps from here on
+                    notify.close()
+                    notify, poll = None, POLL_INTERVAL
+                    touched, overflow = set(), True
+                if overflow:
+                    touched |= index.diff(roots)
+            else:
+                time.sleep(poll)
+                touched = index.diff(roots)
+
+            start = time.perf_counter()
+            changes = index.apply(touched)
+            if changes:
+                yield {"mode": "inotify" if notify else f"polling every {poll:g}s", "changes": changes,
+                       "seconds": time.perf_counter() - start, "index": index}
+    finally:
+        if notify is not None:
+            notify.close()